@@ -160,17 +160,27 @@ class AgentSuite:
                 project=self.project,
                 llm_client=self.primary_llm
             )
-            self._rag_system.rebuild_index()
+            # Index in the background; queries use whatever has been indexed
+            # so far. Embeddings are computed locally (or from the cache) when
+            # the client has no embedding endpoint, so this works offline.
+            self._rag_system.start_background_sync(compute_embeddings=True)
             self._rag_initialized = True
-            print("RAG system initialized successfully")
+            print("RAG system initialized, indexing in background")
         except Exception as e:
             print(f"Failed to initialize RAG system: {e}")
             self._rag_initialized = False
 
-    def refresh_rag_index(self):
-        """Refresh the RAG index when project data changes."""
+    def refresh_rag_index(self, *groups: str):
+        """Refresh the RAG index when project data changes.
+
+        Args:
+            groups: Index groups that changed (see enhanced_rag.INDEX_GROUPS);
+                none re-checks the whole project. Only changed chunks are
+                re-indexed either way.
+        """
         if self._rag_system:
-            self._rag_system.rebuild_index()
+            self._rag_system.mark_changed(*groups)
+            self._rag_system.start_background_sync(compute_embeddings=True)
 
     @property
     def rag_system(self) -> Optional[EnhancedRAGSystem]:
@@ -4,7 +4,7 @@ import hashlib
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 
 @dataclass
@@ -385,12 +385,9 @@ class ChapterMemoryManager:
             return
 
         chapters = self.project.manuscript.chapters
-        current_idx = next(
-            (i for i, c in enumerate(chapters) if c.id == current_chapter_id),
-            None
-        )
+        current_idx = self.project.manuscript.index_of(current_chapter_id)
 
-        if current_idx is None:
+        if current_idx < 0:
             return
 
         # Collect adjacent chapter IDs
@@ -409,10 +406,7 @@ class ChapterMemoryManager:
         """Find chapter by ID in project."""
         if not self.project:
             return None
-        return next(
-            (c for c in self.project.manuscript.chapters if c.id == chapter_id),
-            None
-        )
+        return self.project.manuscript.get_chapter(chapter_id)
 
     def _compute_content_hash(self, content: str) -> str:
         """Compute hash of content for change detection."""
@@ -427,14 +421,19 @@ class ChapterMemoryManager:
         if not chapter:
             return
 
-        content = chapter.content
-        content_hash = self._compute_content_hash(content)
-
-        # Extract information
-        key_points = self._extract_key_points(content, chapter_id)
-        characters = self._extract_characters_mentioned(content)
-        locations = self._extract_locations_mentioned(content)
-        plot_events = self._extract_plot_events(content)
+        # Stream the chapter file instead of loading the content into memory
+        characters: Set[str] = set()
+        locations: Set[str] = set()
+        plot_events: List[str] = []
+        with chapter.open_text_view() as text_view:
+            content_hash = text_view.content_hash()
+            key_points = self._extract_key_points(text_view.iter_lines(), chapter_id)
+            for paragraph in text_view.iter_paragraphs():
+                characters |= self._extract_characters_mentioned(paragraph)
+                locations |= self._extract_locations_mentioned(paragraph)
+                if len(plot_events) < 5:
+                    plot_events.extend(self._extract_plot_events(paragraph))
+        plot_events = plot_events[:5]  # Limit to 5 events per chapter
 
         # Create or update summary
         self._summaries[chapter_id] = ChapterSummary(
@@ -450,14 +449,13 @@ class ChapterMemoryManager:
             last_analyzed=datetime.now()
         )
 
-    def _extract_key_points(self, content: str, chapter_id: str) -> List[KeyPoint]:
-        """Extract key points from chapter content.
+    def _extract_key_points(self, lines: Iterable[str], chapter_id: str) -> List[KeyPoint]:
+        """Extract key points from the lines of chapter content.
 
         This is a simple heuristic-based extraction. For better results,
         this could be enhanced with LLM-based analysis.
         """
         key_points = []
-        lines = content.split('\n')
 
         # Keywords that indicate important points
         plot_keywords = ['but then', 'suddenly', 'realized', 'discovered', 'revealed', 'decided']
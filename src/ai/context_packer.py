@@ -0,0 +1,254 @@
+"""Context packer - Fits search results into a prompt token budget.
+
+Search results are packed into the context given to the AI so that the
+budget is spent on the most relevance per token: a large, moderately
+relevant chunk no longer blocks several small, highly relevant ones behind
+it. Each result is worth its score weighted by its rank, so short results far
+down the list cannot push out the top hits when scores are close. Packing is
+knapsack-style (the better of greedy by value per token and greedy by value),
+the leftover budget is filled with the best remaining result cut at a
+sentence boundary, and paragraphs already included by another result (e.g.
+the overlap between neighbouring chapter passages) are not repeated.
+
+Tokens are counted with the active provider's tokenizer where one is
+available locally (tiktoken for OpenAI models, the loaded tokenizer for local
+Hugging Face models) and otherwise with a fast approximation. Counts are
+cached, since the same chunks come back on every chat turn.
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+
+# Words, numbers and individual punctuation marks, roughly as BPE splits them
+_TOKEN_PIECE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]", re.UNICODE)
+
+# Sentence ends, or line breaks in structured entries
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Appended to content cut short to fit the budget
+TRUNCATION_MARK = " [...]"
+
+
+def approximate_tokens(text: str) -> int:
+    """Estimate the token count of text without a tokenizer.
+
+    Each word is one token plus one per further 8 letters, numbers one per
+    3 digits, and each punctuation mark one token. This is closer for prose
+    and structured entries alike than characters / 4.
+    """
+    count = 0
+    for piece in _TOKEN_PIECE.findall(text):
+        if piece[0].isdigit():
+            count += (len(piece) + 2) // 3
+        elif piece[0].isalpha():
+            count += 1 + (len(piece) - 1) // 8
+        else:
+            count += 1
+    return count
+
+
+class TokenCounter:
+    """Counts tokens with a tokenizer or the approximation, caching the counts."""
+
+    def __init__(self, encode: Optional[Callable[[str], Sequence[Any]]] = None,
+                 name: str = "approximate", cache_size: int = 4096):
+        """Initialize token counter.
+
+        Args:
+            encode: Tokenizer function returning the tokens of a text; None
+                to use approximate_tokens()
+            name: Description of the tokenizer, for display
+            cache_size: Maximum number of texts whose counts are kept
+        """
+        self.encode = encode
+        self.name = name
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, int] = OrderedDict()
+
+    @classmethod
+    def for_client(cls, llm_client: Optional[Any]) -> 'TokenCounter':
+        """Create a counter for an LLM client's provider and model.
+
+        OpenAI models use tiktoken if it is installed; local Hugging Face
+        models use their loaded tokenizer. Other providers only count tokens
+        through their APIs, which is too slow per chunk, so they use the
+        approximation.
+        """
+        if llm_client is None:
+            return cls()
+
+        provider = getattr(llm_client, 'provider', None)
+        provider = getattr(provider, 'value', provider)
+        model = getattr(llm_client, 'model', '') or ''
+
+        if provider == "chatgpt":
+            try:
+                import tiktoken
+            except ImportError:
+                return cls()
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("o200k_base")
+            return cls(encoding.encode_ordinary, name=f"tiktoken:{encoding.name}")
+
+        if provider == "huggingface_local":
+            tokenizer = getattr(llm_client, '_hf_tokenizer', None)
+            if tokenizer is not None:
+                return cls(lambda text: tokenizer.encode(text, add_special_tokens=False),
+                           name=f"huggingface:{model}")
+
+        return cls()
+
+    def count(self, text: str, cache: bool = True) -> int:
+        """Count the tokens of a text.
+
+        Args:
+            text: Text to count
+            cache: Whether to keep the count for next time
+        """
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+
+        count = approximate_tokens(text)
+        if self.encode is not None:
+            try:
+                count = len(self.encode(text))
+            except Exception as e:
+                print(f"Warning: Tokenizer failed, using approximate token counts: {e}")
+                self.encode = None
+                self.name = "approximate"
+
+        if not cache:
+            return count
+        self._cache[text] = count
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return count
+
+
+@dataclass
+class PackedItem:
+    """A search result chosen for the context, with the content to include."""
+    result: Any  # ContextResult
+    content: str
+    tokens: int  # Of the formatted block, including its separator
+    truncated: bool = False
+    rank: int = 0  # Position in the search results
+    value: float = 0.0  # Relevance score weighted by rank
+
+
+def format_block(result: Any, content: str) -> str:
+    """Format one result for the context."""
+    return f"[{result.source_type.upper()}: {result.source_name}]\n{content}\n"
+
+
+def pack_context(
+    results: Iterable[Any],
+    max_tokens: int,
+    counter: TokenCounter,
+    separator: str = "\n---\n",
+    min_fill_tokens: int = 24,
+    rank_k: int = 1
+) -> List[PackedItem]:
+    """Choose results and content to fit a token budget.
+
+    Args:
+        results: Search results (ContextResult), most relevant first
+        max_tokens: Token budget for the formatted blocks
+        counter: Token counter of the target model
+        separator: Text placed between blocks, counted against the budget
+        min_fill_tokens: Smallest remaining budget worth filling with a
+            truncated result
+        rank_k: Rank offset of the value weight score / (rank + rank_k);
+            smaller favours the top results more
+
+    Returns:
+        Packed items in order of relevance
+    """
+    separator_tokens = counter.count(separator)
+
+    # Drop paragraphs an earlier (more relevant) result already contains
+    candidates = []
+    seen_paragraphs = set()
+    for rank, result in enumerate(results):
+        if result.relevance_score <= 0:
+            continue
+        paragraphs = []
+        for paragraph in result.content.split("\n\n"):
+            key = " ".join(paragraph.split())
+            if key and key not in seen_paragraphs:
+                seen_paragraphs.add(key)
+                paragraphs.append(paragraph)
+        if not paragraphs:
+            continue
+        content = "\n\n".join(paragraphs)
+        tokens = counter.count(format_block(result, content)) + separator_tokens
+        value = result.relevance_score / (rank + rank_k)
+        candidates.append(PackedItem(result, content, tokens, rank=rank, value=value))
+
+    # Greedy knapsack: by value per token, or by value alone when that packs
+    # more (e.g. a long top hit that many short, low-ranked results outweigh
+    # per token)
+    chosen, remaining, leftovers = max(
+        (
+            _fill(sorted(candidates, key=lambda item: item.value / item.tokens, reverse=True), max_tokens),
+            _fill(candidates, max_tokens),
+        ),
+        key=lambda packing: sum(item.value for item in packing[0])
+    )
+
+    # Fill what is left with the best-ranked result that did not fit
+    if leftovers and remaining >= min_fill_tokens:
+        best = min(leftovers, key=lambda item: item.rank)
+        truncated = _truncate(best, remaining, counter, separator_tokens)
+        if truncated is not None:
+            chosen.append(truncated)
+
+    chosen.sort(key=lambda item: item.rank)
+    return chosen
+
+
+def _fill(items: Iterable[PackedItem], budget: int) -> Tuple[List[PackedItem], int, List[PackedItem]]:
+    """Take items in order while they fit; return (chosen, remaining budget, left over)."""
+    chosen = []
+    leftovers = []
+    for item in items:
+        if item.tokens <= budget:
+            chosen.append(item)
+            budget -= item.tokens
+        else:
+            leftovers.append(item)
+    return chosen, budget, leftovers
+
+
+def _truncate(item: PackedItem, budget: int, counter: TokenCounter,
+              separator_tokens: int) -> Optional[PackedItem]:
+    """Cut an item's content at the last sentence boundary that fits the budget."""
+    content = item.content
+    cuts = [match.start() for match in _SENTENCE_END.finditer(content) if match.start() > 0]
+
+    def cost(cut: int) -> int:
+        # Prefixes are one-off texts, so they are not cached
+        text = content[:cut].rstrip() + TRUNCATION_MARK
+        return counter.count(format_block(item.result, text), cache=False) + separator_tokens
+
+    # Token counts grow with the prefix, so binary search the longest that fits
+    low, high = 0, len(cuts)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if cost(cuts[middle - 1]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    if low == 0:
+        return None
+
+    cut = cuts[low - 1]
+    return PackedItem(item.result, content[:cut].rstrip() + TRUNCATION_MARK, cost(cut), truncated=True,
+                      rank=item.rank, value=item.value)
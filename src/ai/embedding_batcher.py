@@ -0,0 +1,151 @@
+"""Embedding batcher - Batched, concurrent embedding computation.
+
+Embedding providers answer one request per round trip, so embedding texts one
+at a time makes indexing a large project as slow as its latency times the
+chunk count. The batcher splits texts into batches, sends several batches at
+once on a small thread pool and spaces requests to stay under a provider rate
+limit. Backends that can embed a list of texts in one call (local models run
+one tensor batch) are given whole batches; single-text functions are called
+once per text inside each batch.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+
+# Maximum characters of a text sent for embedding
+MAX_EMBEDDING_CHARS = 2000
+
+# Called with (texts embedded so far, total texts)
+ProgressCallback = Callable[[int, int], None]
+
+
+class RateLimiter:
+    """Spaces calls so no more than a given number start per second."""
+
+    def __init__(self, max_per_second: Optional[float] = None):
+        """Initialize rate limiter.
+
+        Args:
+            max_per_second: Maximum calls started per second, None for no limit
+        """
+        self._interval = 1.0 / max_per_second if max_per_second else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next call may start."""
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class EmbeddingBatcher:
+    """Computes embeddings for many texts in concurrent, rate-limited batches."""
+
+    def __init__(
+        self,
+        embedding_fn: Optional[Callable[[str], List[float]]] = None,
+        batch_embedding_fn: Optional[Callable[[List[str]], Sequence[List[float]]]] = None,
+        batch_size: int = 32,
+        max_concurrency: int = 4,
+        max_requests_per_second: Optional[float] = None
+    ):
+        """Initialize batcher.
+
+        Args:
+            embedding_fn: Function that embeds one text
+            batch_embedding_fn: Function that embeds a list of texts in one call,
+                used instead of embedding_fn when set
+            batch_size: Texts per batch
+            max_concurrency: Batches in flight at once
+            max_requests_per_second: Provider rate limit, None for no limit. A
+                request is one batch call, or one text for embedding_fn.
+        """
+        self.embedding_fn = embedding_fn
+        self.batch_embedding_fn = batch_embedding_fn
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+
+    @property
+    def available(self) -> bool:
+        """Check whether an embedding function is configured."""
+        return bool(self.batch_embedding_fn or self.embedding_fn)
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[Optional[List[float]]]:
+        """Embed texts, returning one embedding (or None on failure) per text.
+
+        Args:
+            texts: Texts to embed
+            progress_callback: Optional callback(done, total) after each batch
+
+        Returns:
+            Embeddings in the same order as texts
+        """
+        total = len(texts)
+        results: List[Optional[List[float]]] = [None] * total
+        if not total or not self.available:
+            return results
+
+        batches = [
+            (start, [text[:MAX_EMBEDDING_CHARS] for text in texts[start:start + self.batch_size]])
+            for start in range(0, total, self.batch_size)
+        ]
+        done = 0
+        progress_lock = threading.Lock()
+
+        def run(batch):
+            nonlocal done
+            start, batch_texts = batch
+            for offset, embedding in enumerate(self._embed_batch(batch_texts)):
+                results[start + offset] = embedding
+            if progress_callback:
+                with progress_lock:
+                    done += len(batch_texts)
+                    progress_callback(done, total)
+
+        if len(batches) == 1 or self.max_concurrency == 1:
+            for batch in batches:
+                run(batch)
+        else:
+            workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embedding") as pool:
+                # list() re-raises errors from progress callbacks
+                list(pool.map(run, batches))
+
+        return results
+
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed one batch, returning None for texts that failed."""
+        if self.batch_embedding_fn:
+            self.rate_limiter.wait()
+            try:
+                embeddings = list(self.batch_embedding_fn(texts))
+                if len(embeddings) == len(texts):
+                    return embeddings
+                print(f"Failed to compute embeddings: expected {len(texts)}, got {len(embeddings)}")
+            except Exception as e:
+                print(f"Failed to compute embeddings: {e}")
+            return [None] * len(texts)
+
+        embeddings = []
+        for text in texts:
+            self.rate_limiter.wait()
+            try:
+                embeddings.append(self.embedding_fn(text))
+            except Exception as e:
+                print(f"Failed to compute embedding: {e}")
+                embeddings.append(None)
+        return embeddings
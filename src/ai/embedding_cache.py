@@ -0,0 +1,189 @@
+"""Embedding cache - Persistent embeddings keyed by model and content hash.
+
+Embeddings are stored next to the project in an embeddings directory, one
+pair of files per embedding model: a float32 .npy matrix (opened memory
+mapped, so only rows that are used get paged in) and a small JSON index of
+the content hash of each row. Rebuilding the search index then only calls
+the embedding provider for chunks whose content is new or changed.
+
+Each save writes the matrix under a new generation name and then the index
+naming that generation, so the index never pairs with a matrix from another
+save, even if a crash interrupts saving.
+"""
+
+import io
+import json
+import re
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from src.models.project_storage import atomic_write_bytes, write_json
+
+
+EMBEDDINGS_DIR = "embeddings"
+
+# Generation ids naming the matrix file of one save
+_GENERATION_RE = re.compile(r'[0-9a-f]{12}')
+
+
+def _model_slug(model_id: str) -> str:
+    """File-name-safe form of a model identifier."""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', model_id).strip('_') or "default"
+
+
+class EmbeddingCache:
+    """On-disk cache of embeddings for one embedding model."""
+
+    def __init__(self, cache_dir: Path, model_id: str):
+        """Initialize cache, loading any existing entries for the model.
+
+        Args:
+            cache_dir: Directory holding the cache files (e.g. <project>/embeddings)
+            model_id: Identifier of the model that produced the embeddings
+        """
+        self.cache_dir = Path(cache_dir)
+        self.model_id = model_id
+        self._slug = _model_slug(model_id)
+        self._index_path = self.cache_dir / f"{self._slug}.json"
+        self._generation: Optional[str] = None  # Names the matrix file the index belongs to
+
+        self._matrix: Optional[np.ndarray] = None  # Memory-mapped rows on disk
+        self._rows: Dict[str, int] = {}  # content hash -> row in _matrix
+        self._pending: Dict[str, np.ndarray] = {}  # Embeddings not yet written
+        self._used: set = set()  # Hashes looked up or added since the last save
+        self._dim: Optional[int] = None
+        self._load()
+
+    @property
+    def ann_path(self) -> Path:
+        """File for the model's trained ANN centroids."""
+        return self.cache_dir / f"{_model_slug(self.model_id)}.ivf.npz"
+
+    @classmethod
+    def for_project(cls, project_path: str, model_id: str) -> 'EmbeddingCache':
+        """Open the cache stored next to a project file."""
+        return cls(Path(project_path).parent / EMBEDDINGS_DIR, model_id)
+
+    def _matrix_path(self, generation: str) -> Path:
+        return self.cache_dir / f"{self._slug}.{generation}.npy"
+
+    def _load(self) -> None:
+        if not self._index_path.exists():
+            return
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            generation = index.get("generation")
+            if index.get("model") != self.model_id:
+                return
+            if not isinstance(generation, str) or not _GENERATION_RE.fullmatch(generation):
+                print("Warning: Embedding cache index has no valid generation, ignoring it")
+                return
+            matrix = np.load(self._matrix_path(generation), mmap_mode='r')
+            hashes = index.get("hashes", [])
+            if matrix.ndim != 2 or len(matrix) != len(hashes):
+                print("Warning: Embedding cache is inconsistent, ignoring it")
+                return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read embedding cache: {e}")
+            return
+
+        self._matrix = matrix
+        self._rows = {content_hash: row for row, content_hash in enumerate(hashes)}
+        self._dim = matrix.shape[1]
+        self._generation = generation
+
+    def get(self, content_hash: str) -> Optional[np.ndarray]:
+        """Get the cached embedding for content, or None."""
+        vector = self._pending.get(content_hash)
+        if vector is None:
+            row = self._rows.get(content_hash)
+            if row is None:
+                return None
+            vector = np.array(self._matrix[row], dtype=np.float32)
+        self._used.add(content_hash)
+        return vector
+
+    def put(self, content_hash: str, embedding: Iterable[float]) -> None:
+        """Add an embedding; it is written on the next save()."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.ndim != 1 or len(vector) == 0:
+            return
+        if self._dim is None:
+            self._dim = len(vector)
+        elif len(vector) != self._dim:
+            return
+        self._pending[content_hash] = vector
+        self._used.add(content_hash)
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._pending or content_hash in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows) + sum(1 for h in self._pending if h not in self._rows)
+
+    def save(self, prune: bool = False) -> bool:
+        """Write new embeddings to disk.
+
+        Args:
+            prune: Drop entries not looked up or added since the last save,
+                e.g. after a full rebuild, so content that no longer exists
+                does not accumulate
+
+        Returns:
+            True if the cache files were rewritten
+        """
+        if prune:
+            keep = [h for h in self._rows if h in self._used]
+        else:
+            keep = list(self._rows)
+        keep_set = set(keep)
+        new_hashes = [h for h in self._pending if h not in keep_set]
+
+        if not new_hashes and len(keep) == len(self._rows):
+            self._used.clear()
+            return False
+
+        hashes = keep + new_hashes
+        matrix = np.empty((len(hashes), self._dim or 0), dtype=np.float32)
+        if keep:
+            matrix[:len(keep)] = self._matrix[[self._rows[h] for h in keep]]
+        for row, content_hash in enumerate(new_hashes, len(keep)):
+            matrix[row] = self._pending[content_hash]
+
+        # Matrix first under a new name, then the index that points to it
+        generation = uuid.uuid4().hex[:12]
+        self._write_matrix(self._matrix_path(generation), matrix)
+        write_json(self._index_path, {
+            "model": self.model_id, "dim": self._dim, "generation": generation, "hashes": hashes
+        })
+
+        # Release the mapping so the old file can be deleted (required on Windows)
+        self._matrix = None
+        self._rows = {}
+        self._pending.clear()
+        self._used.clear()
+        self._load()
+        if self._generation == generation:
+            self._remove_stale_matrices()
+        return True
+
+    def _write_matrix(self, file_path: Path, matrix: np.ndarray) -> None:
+        """Atomically write the matrix as .npy."""
+        buffer = io.BytesIO()
+        np.save(buffer, matrix)
+        atomic_write_bytes(file_path, buffer.getvalue())
+
+    def _remove_stale_matrices(self) -> None:
+        """Delete matrix files of earlier (or interrupted) saves."""
+        prefix = f"{self._slug}."
+        for path in self.cache_dir.glob(f"{prefix}*.npy"):
+            generation = path.name[len(prefix):-len(".npy")]
+            if generation != self._generation and _GENERATION_RE.fullmatch(generation):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass  # Still mapped elsewhere; removed by a later save
@@ -1,19 +1,57 @@
 """Enhanced RAG system with semantic search and comprehensive worldbuilding support."""
 
-from typing import List, Dict, Optional, Any, TYPE_CHECKING
-from dataclasses import dataclass
-import uuid
-
+from typing import List, Dict, Optional, Any, Callable, Deque, Set, Tuple, TYPE_CHECKING
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import threading
+
+from src.models.chapter_storage import ChapterTextView
 from src.models.project import WriterProject
 from src.ai.semantic_search import (
     SemanticSearchEngine, SearchMethod, DocumentChunk, SearchResult
 )
+from src.ai.embedding_cache import EmbeddingCache
+from src.ai.embedding_batcher import ProgressCallback
+from src.ai.local_embeddings import HashingEmbedder
+from src.ai.ann_index import IVFIndex
+from src.ai.prose_chunker import ProseChunk, chunk_prose
+from src.ai.context_packer import TokenCounter, format_block, pack_context
 
 if TYPE_CHECKING:
     from src.ai.llm_client import LLMClient
     from src.ai.chapter_memory import ChapterMemoryManager
 
 
+# Index groups: each is built by _index_<group>() and produces chunks of these
+# source types. Change notifications and sync_index() work per group.
+INDEX_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "worldbuilding_text": ("worldbuilding",),
+    "factions": ("faction",),
+    "places": ("place",),
+    "technologies": ("technology",),
+    "cultures": ("culture",),
+    "historical_events": ("historical_event",),
+    "flora_fauna": ("flora", "fauna"),
+    "myths": ("myth",),
+    "star_systems": ("star_system",),
+    "armies": ("military",),
+    "economies": ("economy",),
+    "political_systems": ("political_system",),
+    "characters": ("character",),
+    "plot": ("plot", "plot_event", "subplot", "themes"),
+    "promises": ("promise",),
+    "chapter_data": ("chapter_key_point",),
+    "chapter_prose": ("chapter_prose",),
+}
+
+
+def _stable_key(text: str) -> str:
+    """Short deterministic key for text (unlike hash(), stable across runs)."""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()[:12]
+
+
 @dataclass
 class ContextResult:
     """A context search result with rich metadata."""
@@ -26,6 +64,112 @@ class ContextResult:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class ChapterSource:
+    """Where a sync reads one chapter's prose from, recorded without reading it."""
+    chapter_id: str
+    number: int
+    title: str
+    file_path: Optional[Path] = None  # File holding the content, for unloaded chapters
+    content: Optional[str] = None  # In-memory content of loaded chapters
+
+    def open_text_view(self) -> ChapterTextView:
+        if self.file_path is not None:
+            return ChapterTextView.from_file(self.file_path)
+        return ChapterTextView.from_text(self.content or "")
+
+
+@dataclass
+class IndexSnapshot:
+    """Chunks read from the project for one build or sync of the index.
+
+    Chapter prose is only located (see ChapterSource); apply_sync() reads and
+    chunks it, so taking a snapshot does not scale with manuscript size.
+    """
+    seq: int  # Order in which snapshots were taken
+    groups: List[str]  # Index groups taken from the changed set
+    compute_embeddings: bool
+    full: bool  # Build a new index instead of updating the current one
+    chapter_scope: Optional[Set[str]] = None  # Chapters re-chunked; None means all
+    project_path: Optional[str] = None  # Locates the embedding cache
+    kept_chapters: Set[str] = field(default_factory=set)  # Chapters whose prose is kept
+    indexed_groups: List[str] = field(default_factory=list)  # Groups read without error
+    chunks: List[DocumentChunk] = field(default_factory=list)
+    chunk_ids: Set[str] = field(default_factory=set)
+    chapters: List[ChapterSource] = field(default_factory=list)  # Prose to chunk when applied
+
+
+class QueryResultCache:
+    """LRU cache of search results, valid for one index version.
+
+    Results are keyed by normalized query, method and filters. Every entry
+    is dropped as soon as the index version changes, so a cached result is
+    always what a fresh search would return. Not thread-safe on its own;
+    EnhancedRAGSystem uses it under its lock.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum number of cached searches
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, List[ContextResult]] = OrderedDict()
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(kind: str, query: str, method: 'SearchMethod', top_k: int,
+                 source_types: Optional[List[str]] = None) -> tuple:
+        """Key for a search; queries differing only in case or spacing share one."""
+        return (
+            kind,
+            " ".join(query.lower().split()),
+            method,
+            top_k,
+            tuple(sorted(set(source_types))) if source_types else None
+        )
+
+    def get(self, key: tuple, version: int) -> Optional[List[ContextResult]]:
+        """Get cached results for the current index version, or None."""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        results = self._entries.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return list(results)
+
+    def put(self, key: tuple, version: int, results: List[ContextResult]) -> None:
+        """Store results computed against an index version."""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        self._entries[key] = list(results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
 class EnhancedRAGSystem:
     """Enhanced RAG system with semantic search for all project data."""
 
@@ -33,7 +177,9 @@ class EnhancedRAGSystem:
         self,
         project: WriterProject,
         llm_client: Optional['LLMClient'] = None,
-        memory_manager: Optional['ChapterMemoryManager'] = None
+        memory_manager: Optional['ChapterMemoryManager'] = None,
+        embedder: Optional[Any] = None,
+        query_cache_size: int = 256
     ):
         """Initialize enhanced RAG system.
 
@@ -41,61 +187,487 @@ class EnhancedRAGSystem:
             project: The writer project
             llm_client: Optional LLM client for embeddings and summarization
             memory_manager: Optional chapter memory manager
+            embedder: Optional local embedder (see local_embeddings), used when
+                the LLM client provides no embeddings. Defaults to the offline
+                hashing encoder.
+            query_cache_size: Maximum number of searches whose results are
+                kept until the index next changes
         """
         self.project = project
         self.llm_client = llm_client
         self.memory_manager = memory_manager
-        self.search_engine = SemanticSearchEngine()
+        self.embedder = embedder or HashingEmbedder()
+        # Large collections (e.g. many chapter paragraphs) use approximate search
+        self.search_engine = SemanticSearchEngine(ann_index=IVFIndex())
         self._indexed = False
-
-        # Set up embedding function if LLM client available
-        if llm_client and hasattr(llm_client, 'get_embedding'):
-            self.search_engine.set_embedding_function(llm_client.get_embedding)
+        self._pending_chunks: List[DocumentChunk] = []
+        self._pending_ids: Set[str] = set()
+        self._pending_chapters: List[ChapterSource] = []
+        self._changed_groups: Set[str] = set()
+        # Chapters to re-chunk on the next chapter_prose sync; None means all
+        self._changed_chapters: Optional[Set[str]] = set()
+        self._changes_lock = threading.Lock()  # Guards the two above
+        self._chapter_scope: Optional[Set[str]] = None
+        self._base_snapshot_taken = False  # A full snapshot was taken (and not lost to a failure)
+        self._compute_embeddings = False  # Setting of the last snapshot
+        self._snapshot_seq = 0
+        # Group -> seq of the snapshot the index holds it from, so a snapshot
+        # applied late never replaces newer data
+        self._applied_seqs: Dict[str, int] = {}
+        self._embedding_source: Optional[Any] = None
+
+        # Project data is read into snapshots on the project's thread; worker
+        # threads index them while searches use the last published engine.
+        # _lock guards the published engine; _build_lock allows one build or
+        # sync at a time.
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._building = False
+        self._progress = (0, 0)
+        self._last_error: Optional[str] = None
+        self.index_version = 0  # Bumped whenever searches may see new results
+        self.query_cache = QueryResultCache(query_cache_size)
+        self._token_counter: Optional[TokenCounter] = None  # Made for the LLM client on first use
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._queued_snapshots: Deque[IndexSnapshot] = deque()  # Waiting for the worker
+
+        # Set up embedding function from the LLM client or the local embedder
+        self._connect_embeddings()
 
     def set_llm_client(self, llm_client: 'LLMClient'):
         """Set LLM client for embeddings."""
         self.llm_client = llm_client
-        if hasattr(llm_client, 'get_embedding'):
-            self.search_engine.set_embedding_function(llm_client.get_embedding)
+        self._token_counter = None
+        self._connect_embeddings()
+        self._invalidate_results()
+
+    def set_embedder(self, embedder: Any):
+        """Set the local embedder used when the LLM client provides no embeddings."""
+        self.embedder = embedder
+        self._connect_embeddings()
+        self._invalidate_results()
+
+    def _invalidate_results(self):
+        """Bump the index version after a change that affects search results."""
+        with self._lock:
+            self.index_version += 1
+
+    def _connect_embeddings(self, engine: Optional[SemanticSearchEngine] = None):
+        """Use the client's embedding methods if it has any, else the local embedder.
+
+        Batch embedding (get_embeddings) is preferred for indexing.
+        """
+        source = self.embedder
+        if self.llm_client and (hasattr(self.llm_client, 'get_embedding')
+                                or hasattr(self.llm_client, 'get_embeddings')):
+            source = self.llm_client
+
+        self._embedding_source = source
+        engine = engine or self.search_engine
+        engine.set_embedding_function(getattr(source, 'get_embedding', None))
+        engine.set_batch_embedding_function(getattr(source, 'get_embeddings', None))
 
     def set_memory_manager(self, memory_manager: 'ChapterMemoryManager'):
         """Set memory manager for chapter data."""
         self.memory_manager = memory_manager
 
-    def rebuild_index(self, compute_embeddings: bool = False):
+    @property
+    def is_indexing(self) -> bool:
+        """Check whether a build or sync is running or about to start."""
+        return self._building or self._worker is not None
+
+    def start_background_sync(self, compute_embeddings: Optional[bool] = None) -> bool:
+        """Sync the index on a daemon thread.
+
+        The changed parts of the project are read into chunks right away, on
+        the calling thread, which must be the one that edits the project.
+        The thread reads and chunks chapter prose, computes embeddings and
+        applies the chunks; searches keep using the current index until that
+        completes. Changes synced while a thread is busy are queued for it.
+
+        Returns:
+            True if a thread was started, False if the changes were queued
+            for a running one or nothing had changed
+        """
+        snapshot = self.prepare_sync(compute_embeddings)
+        if not snapshot.groups:
+            return False
+        with self._worker_lock:
+            self._queued_snapshots.append(snapshot)
+            if self._worker is not None:
+                return False
+            self._worker = threading.Thread(
+                target=self._background_sync, name="rag-index", daemon=True
+            )
+            self._worker.start()
+            return True
+
+    def _background_sync(self):
+        while True:
+            # Exit under the lock, so a concurrent start sees either a
+            # running worker that will apply its snapshot, or none
+            with self._worker_lock:
+                if not self._queued_snapshots:
+                    self._worker = None
+                    return
+                snapshot = self._queued_snapshots.popleft()
+            try:
+                self.apply_sync(snapshot)
+            except Exception as e:
+                print(f"Background indexing failed: {e}")
+
+    def get_index_status(self) -> Dict[str, Any]:
+        """Get the state of the index for display.
+
+        Returns:
+            "state" ("empty", "indexing", "ready" or "failed"), "version",
+            "documents" in the searchable snapshot, embedding "progress" as
+            (done, total) and the last build "error", if any
+        """
+        if self.is_indexing:
+            state = "indexing"
+        elif self._last_error:
+            state = "failed"
+        else:
+            state = "ready" if self._indexed else "empty"
+        return {
+            "state": state,
+            "version": self.index_version,
+            "documents": self.search_engine.get_document_count(),
+            "progress": self._progress,
+            "error": self._last_error,
+        }
+
+    def rebuild_index(
+        self,
+        compute_embeddings: bool = False,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
         """Rebuild the search index from project data.
 
+        The new index is built separately and replaces the current one when
+        complete, so searches from other threads keep working meanwhile.
+
         Args:
             compute_embeddings: Whether to compute neural embeddings (slower but better)
+            progress_callback: Optional callback(done, total) while embeddings
+                are computed
+        """
+        return self.apply_sync(self.prepare_sync(compute_embeddings, full=True), progress_callback)
+
+    def mark_changed(self, *groups: str):
+        """Record that parts of the project changed, for the next sync_index().
+
+        Args:
+            groups: Keys of INDEX_GROUPS (e.g. "factions"); none marks everything
+        """
+        unknown = [group for group in groups if group not in INDEX_GROUPS]
+        if unknown:
+            print(f"Warning: Unknown index groups: {', '.join(unknown)}")
+        with self._changes_lock:
+            self._changed_groups.update(group for group in groups if group in INDEX_GROUPS)
+            if not groups:
+                self._changed_groups.update(INDEX_GROUPS)
+            if not groups or "chapter_prose" in groups:
+                self._changed_chapters = None
+
+    def mark_chapter_changed(self, chapter_id: str):
+        """Record that one chapter's text changed, so only its prose is re-chunked."""
+        with self._changes_lock:
+            if self._changed_chapters is not None:
+                self._changed_chapters.add(chapter_id)
+            self._changed_groups.add("chapter_prose")
+
+    def has_pending_changes(self) -> bool:
+        """Check whether changes were marked that no sync has read yet."""
+        return bool(self._changed_groups)
+
+    def sync_index(
+        self,
+        compute_embeddings: Optional[bool] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Dict[str, int]:
+        """Bring the index up to date, re-indexing only what changed.
+
+        Chunks are rebuilt for the groups marked with mark_changed() and
+        diffed against the index: chunks whose content is unchanged are
+        skipped, changed and new ones are re-indexed, and chunks of entities
+        that no longer exist are removed. Builds the full index on first use.
+        Reads the project, so call it on the thread that edits the project;
+        to do the slow part elsewhere, call prepare_sync() there and
+        apply_sync() on a worker thread.
+
+        Args:
+            compute_embeddings: Whether to compute neural embeddings; defaults
+                to the setting of the last build
+            progress_callback: Optional callback(done, total) while embeddings
+                are computed
+
+        Returns:
+            Counts of chunks "indexed" (new or changed), "removed" and "unchanged"
+        """
+        return self.apply_sync(self.prepare_sync(compute_embeddings), progress_callback)
+
+    def prepare_sync(self, compute_embeddings: Optional[bool] = None, full: bool = False) -> IndexSnapshot:
+        """Read the changed parts of the project into chunks.
+
+        Call on the thread that edits the project; the snapshot holds only
+        copies of project text, so apply_sync() may run on any thread.
+        Chapter prose is only located here, not read.
+
+        Args:
+            compute_embeddings: Whether to compute neural embeddings; defaults
+                to the setting of the last snapshot
+            full: Read every group and build a new index, rather than only
+                the changed groups
+        """
+        if compute_embeddings is None:
+            compute_embeddings = self._compute_embeddings
+        # Switching embeddings on needs the chunks indexed without them redone
+        full = full or not self._base_snapshot_taken or compute_embeddings != self._compute_embeddings
+        self._compute_embeddings = compute_embeddings
+
+        with self._changes_lock:
+            self._snapshot_seq += 1
+            seq = self._snapshot_seq
+            if full:
+                groups = list(INDEX_GROUPS)
+                self._base_snapshot_taken = True
+            else:
+                groups = [group for group in INDEX_GROUPS if group in self._changed_groups]
+            self._changed_groups.difference_update(groups)
+            chapter_scope = None
+            if "chapter_prose" in groups:
+                # A partial sync re-chunks only the chapters whose text changed
+                if not full:
+                    chapter_scope = self._changed_chapters
+                self._changed_chapters = set()
+
+        snapshot = IndexSnapshot(
+            seq=seq,
+            groups=groups,
+            compute_embeddings=compute_embeddings,
+            full=full,
+            chapter_scope=chapter_scope,
+            project_path=self.project.project_path,
+        )
+        if chapter_scope is not None:
+            # Prose of chapters that are not re-chunked is kept
+            snapshot.kept_chapters = {chapter.id for chapter in self.project.manuscript.chapters} - chapter_scope
+
+        self._pending_chunks = []
+        self._pending_ids = set()
+        self._pending_chapters = []
+        self._chapter_scope = chapter_scope
+        for group in groups:
+            queued = len(self._pending_chunks)
+            located = len(self._pending_chapters)
+            try:
+                getattr(self, f"_index_{group}")()
+            except Exception as e:
+                # Keep the group's existing chunks rather than losing the whole build
+                print(f"Warning: Could not index {group}: {e}")
+                for chunk in self._pending_chunks[queued:]:
+                    self._pending_ids.discard(chunk.id)
+                del self._pending_chunks[queued:]
+                del self._pending_chapters[located:]
+                continue
+            snapshot.indexed_groups.append(group)
+        snapshot.chunks, self._pending_chunks = self._pending_chunks, []
+        snapshot.chunk_ids, self._pending_ids = self._pending_ids, set()
+        snapshot.chapters, self._pending_chapters = self._pending_chapters, []
+        return snapshot
+
+    def apply_sync(
+        self,
+        snapshot: IndexSnapshot,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Dict[str, int]:
+        """Index the chunks of a snapshot from prepare_sync().
+
+        Does not touch the project, so it may run on a worker thread. If it
+        fails, the snapshot's groups are marked as changed again.
+
+        Returns:
+            Counts of chunks "indexed" (new or changed), "removed" and "unchanged"
+        """
+        def on_progress(done: int, total: int):
+            self._progress = (done, total)
+            if progress_callback:
+                progress_callback(done, total)
+
+        with self._build_lock:
+            self._building = True
+            self._progress = (0, 0)
+            try:
+                if snapshot.full:
+                    result = self._apply_full(snapshot, on_progress)
+                elif snapshot.groups:
+                    result = self._apply_chunks(self.search_engine, snapshot, on_progress)
+                else:
+                    result = {"indexed": 0, "removed": 0, "unchanged": self.search_engine.get_document_count()}
+                self._last_error = None
+                return result
+            except Exception as e:
+                self._last_error = str(e)
+                self._restore_changes(snapshot)
+                raise
+            finally:
+                self._building = False
+
+    def _restore_changes(self, snapshot: IndexSnapshot):
+        """Mark the groups of a snapshot that failed to apply as changed again."""
+        with self._changes_lock:
+            self._changed_groups.update(snapshot.groups)
+            if "chapter_prose" in snapshot.groups:
+                if snapshot.chapter_scope is None:
+                    self._changed_chapters = None
+                elif self._changed_chapters is not None:
+                    self._changed_chapters.update(snapshot.chapter_scope)
+            if snapshot.full:
+                self._base_snapshot_taken = False
+
+    def _apply_full(self, snapshot: IndexSnapshot, progress_callback: ProgressCallback) -> Dict[str, int]:
+        """Index a full snapshot into a new engine and publish it."""
+        current = self.search_engine
+        ann = current.embedding_index.ann_index
+        engine = SemanticSearchEngine(
+            embedding_quantization=current.embedding_index.quantization,
+            ann_index=ann.empty_copy() if ann else None
+        )
+        engine.embedding_batcher = current.embedding_batcher
+        self._connect_embeddings(engine)
+
+        stats = self._apply_chunks(engine, snapshot, progress_callback)
+        with self._lock:
+            self.search_engine = engine
+            self._indexed = True
+            self.index_version += 1
+
+        # Groups synced from newer snapshots into the replaced engine are
+        # older here; read them again on the next sync
+        newer = [group for group, seq in self._applied_seqs.items() if seq > snapshot.seq]
+        if newer:
+            self._restore_changes(IndexSnapshot(seq=snapshot.seq, groups=newer,
+                                                compute_embeddings=snapshot.compute_embeddings, full=False))
+        self._applied_seqs = dict.fromkeys(INDEX_GROUPS, snapshot.seq)
+        return stats
+
+    def _apply_chunks(
+        self,
+        engine: SemanticSearchEngine,
+        snapshot: IndexSnapshot,
+        progress_callback: Optional[ProgressCallback]
+    ) -> Dict[str, int]:
+        """Apply the differences between a snapshot and an engine's contents."""
+        engine.compute_embeddings = snapshot.compute_embeddings
+        if snapshot.full:
+            indexed_groups = snapshot.indexed_groups
+            chunks = snapshot.chunks
+        else:
+            # Skip groups the index already holds from a newer snapshot
+            indexed_groups = [
+                group for group in snapshot.indexed_groups
+                if self._applied_seqs.get(group, 0) < snapshot.seq
+            ]
+            wanted = {source_type for group in indexed_groups for source_type in INDEX_GROUPS[group]}
+            chunks = [chunk for chunk in snapshot.chunks if chunk.source_type in wanted]
+            for group in indexed_groups:
+                self._applied_seqs[group] = snapshot.seq
+        if "chapter_prose" in indexed_groups:
+            chunks = chunks + self._chunk_chapters(snapshot)
+
+        # Unchanged chunks reuse embeddings saved by earlier builds
+        cache = self._open_embedding_cache(engine, snapshot.project_path) if snapshot.compute_embeddings else None
+        engine.set_embedding_cache(cache)
+        ann = engine.embedding_index.ann_index
+        if cache is not None and ann and not ann.trained:
+            ann.load(cache.ann_path)
+
+        # Compute embeddings for everything at once, in batches, while
+        # searches continue against the current contents
+        prepared = engine.prepare_documents(chunks, progress_callback=progress_callback)
+
+        source_types = [source_type for group in indexed_groups for source_type in INDEX_GROUPS[group]]
+        with self._lock:
+            # Drop chunks of entities that were deleted
+            stale = set(engine.get_document_ids(source_types)) - snapshot.chunk_ids
+            if snapshot.kept_chapters:
+                stale = {
+                    doc_id for doc_id in stale
+                    if engine.get_document(doc_id).source_type != "chapter_prose"
+                    or engine.get_document(doc_id).metadata.get("chapter_id") not in snapshot.kept_chapters
+                }
+            for doc_id in stale:
+                engine.remove_document(doc_id)
+            # Unchanged passages may have moved within their chapter
+            engine.refresh_documents(chunks)
+            engine.apply_documents(prepared)
+            # Train now rather than on the first search, so the centroids are saved
+            ann_ready = bool(ann) and cache is not None and engine.embedding_index.prepare_ann()
+            if not snapshot.full:
+                self.index_version += 1
+
+        if cache is not None:
+            try:
+                cache.save(prune=snapshot.full)
+                if ann_ready:
+                    ann.save(cache.ann_path)
+            except OSError as e:
+                print(f"Warning: Could not save embedding cache: {e}")
+
+        return {"indexed": len(prepared), "removed": len(stale), "unchanged": len(chunks) - len(prepared)}
+
+    def _ensure_indexed(self):
+        """Start building the index in the background before the first search.
+
+        Searches never wait for a build: while one is queued or running,
+        they use the current (possibly empty) index.
         """
-        self.search_engine.clear()
-
-        # Index all worldbuilding elements
-        self._index_worldbuilding_text()
-        self._index_factions()
-        self._index_places()
-        self._index_technologies()
-        self._index_cultures()
-        self._index_historical_events()
-        self._index_flora_fauna()
-        self._index_myths()
-        self._index_star_systems()
-        self._index_armies()
-        self._index_economies()
-        self._index_political_systems()
-
-        # Index characters
-        self._index_characters()
-
-        # Index plot elements
-        self._index_plot()
-        self._index_promises()
-
-        # Index chapter content if memory manager available
-        if self.memory_manager:
-            self._index_chapter_data()
-
-        self._indexed = True
+        if not self._base_snapshot_taken and not self.is_indexing:
+            self.start_background_sync()
+
+    def _queue_chunk(self, chunk: DocumentChunk):
+        """Queue a chunk to be indexed at the end of a build or sync."""
+        self._add_unique(chunk, self._pending_chunks, self._pending_ids)
+
+    @staticmethod
+    def _add_unique(chunk: DocumentChunk, chunks: List[DocumentChunk], chunk_ids: Set[str]):
+        """Add a chunk to a list, renaming it if its id is already taken."""
+        # Entities sharing an id (or a name, without one) still get distinct chunks
+        if chunk.id in chunk_ids:
+            base_id = chunk.id
+            n = 2
+            while f"{base_id}_{n}" in chunk_ids:
+                n += 1
+            chunk.id = f"{base_id}_{n}"
+        chunk_ids.add(chunk.id)
+        chunks.append(chunk)
+
+    def _embedding_model_id(self) -> Optional[str]:
+        """Identify the model behind the embedding function, for caching."""
+        source = self._embedding_source
+        if source is None:
+            return None
+        model_id = getattr(source, 'embedding_model', None)
+        if model_id:
+            return model_id
+        provider = getattr(source, 'provider', None)
+        if provider is None:
+            return None
+        provider = getattr(provider, 'value', provider)
+        return f"{provider}:{getattr(source, 'model', '')}"
+
+    def _open_embedding_cache(self, engine: SemanticSearchEngine,
+                              project_path: Optional[str]) -> Optional[EmbeddingCache]:
+        """Open the embedding cache next to a project file for the current model, if possible."""
+        if not engine.embedding_index.embedding_fn or not project_path:
+            return None
+        model_id = self._embedding_model_id()
+        if not model_id:
+            return None
+        return EmbeddingCache.for_project(project_path, model_id)
 
     def _make_chunk(
         self,
@@ -103,19 +675,47 @@ class EnhancedRAGSystem:
         source_type: str,
         source_name: str,
         source_id: str = "",
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        fields: Optional[Dict[str, str]] = None
     ) -> DocumentChunk:
-        """Create a document chunk with a unique ID."""
-        chunk_id = f"{source_type}_{source_id or str(uuid.uuid4())[:8]}"
+        """Create a document chunk with an ID that is stable across builds.
+
+        The name, source type and any extra fields are stored in
+        metadata["fields"] for BM25 field boosting; extra "name" or "type"
+        text is appended to the defaults.
+        """
+        # Without an entity id, key on the name so edits keep the same chunk
+        chunk_id = f"{source_type}_{source_id or _stable_key(source_name)}"
+        metadata = dict(metadata or {})
+        field_texts = {"name": source_name, "type": source_type.replace("_", " ")}
+        for name, text in (fields or {}).items():
+            field_texts[name] = f"{field_texts[name]} {text}" if name in field_texts else text
+        metadata["fields"] = field_texts
         return DocumentChunk(
             id=chunk_id,
             content=content,
             source_type=source_type,
             source_name=source_name,
             source_id=source_id,
-            metadata=metadata or {}
+            metadata=metadata
         )
 
+    @staticmethod
+    def _entity_fields(entity: Any) -> Dict[str, str]:
+        """BM25 fields of a worldbuilding or story entity: its type, description and notes."""
+        fields = {
+            "description": getattr(entity, 'description', None) or "",
+            "notes": getattr(entity, 'notes', None) or "",
+        }
+        # e.g. faction_type, place_type; appended to the generic source type
+        for field_name in type(entity).model_fields:
+            if field_name.endswith("_type"):
+                kind = getattr(entity, field_name)
+                if kind:
+                    fields["type"] = str(getattr(kind, 'value', kind)).replace("_", " ")
+                break
+        return fields
+
     def _index_worldbuilding_text(self):
         """Index basic worldbuilding text sections."""
         wb = self.project.worldbuilding
@@ -140,7 +740,7 @@ class EnhancedRAGSystem:
                     source_name=name.replace("_", " ").title(),
                     source_id=name
                 )
-                self.search_engine.index_document(chunk)
+                self._queue_chunk(chunk)
 
     def _index_factions(self):
         """Index faction data."""
@@ -154,16 +754,14 @@ Faction: {faction.name}
 Type: {faction.faction_type}
 Government: {faction.government_type or 'Unknown'}
 Leader: {faction.leader or 'Unknown'}
-Population: {faction.population or 'Unknown'}
-Territory: {faction.territory or 'Unknown'}
+Capital: {faction.capital or 'Unknown'}
+Founded: {faction.founded_date or 'Unknown'}
+Territory: {', '.join(faction.territory) if faction.territory else 'Unknown'}
 Description: {faction.description}
-Ideology: {faction.ideology or ''}
-Military Strength: {faction.military_strength or 'Unknown'}
-Economic Strength: {faction.economic_strength or 'Unknown'}
+Military Strength: {faction.military_strength}/100
+Economic Power: {faction.economic_power}/100
 Allies: {', '.join(faction.allies) if faction.allies else 'None'}
 Enemies: {', '.join(faction.enemies) if faction.enemies else 'None'}
-Notable Members: {', '.join(faction.notable_members) if faction.notable_members else 'None'}
-History: {faction.history or ''}
 Notes: {faction.notes or ''}
             """.strip()
 
@@ -171,6 +769,7 @@ Notes: {faction.notes or ''}
                 content=content,
                 source_type="faction",
                 source_name=faction.name,
+                fields=self._entity_fields(faction),
                 source_id=faction.id,
                 metadata={
                     "faction_type": faction.faction_type,
@@ -179,7 +778,7 @@ Notes: {faction.notes or ''}
                     "enemies": faction.enemies
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_places(self):
         """Index place/location data."""
@@ -205,7 +804,7 @@ Atmosphere: {place.atmosphere or ''}
 Cultural Significance: {place.cultural_significance or ''}
 Story Relevance: {place.story_relevance or ''}
 Notable Inhabitants: {inhabitants}
-History: {place.history or ''}
+Founded: {place.founded or 'Unknown'}
 Notes: {place.notes or ''}
             """.strip()
 
@@ -213,6 +812,7 @@ Notes: {place.notes or ''}
                 content=content,
                 source_type="place",
                 source_name=place.name,
+                fields=self._entity_fields(place),
                 source_id=place.id,
                 metadata={
                     "place_type": place.place_type,
@@ -220,7 +820,7 @@ Notes: {place.notes or ''}
                     "controlling_faction": place.controlling_faction
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_technologies(self):
         """Index technology data."""
@@ -252,6 +852,7 @@ Notes: {tech.notes or ''}
                 content=content,
                 source_type="technology",
                 source_name=tech.name,
+                fields=self._entity_fields(tech),
                 source_id=tech.id,
                 metadata={
                     "tech_type": str(tech.technology_type),
@@ -259,7 +860,7 @@ Notes: {tech.notes or ''}
                     "factions": tech.factions_with_access
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_cultures(self):
         """Index culture data."""
@@ -285,17 +886,17 @@ Notes: {tech.notes or ''}
 Culture: {culture.name}
 Associated Factions: {', '.join(culture.associated_factions) if culture.associated_factions else 'None'}
 Description: {culture.description or ''}
-Values: {culture.values or ''}
+Values: {', '.join(culture.core_values) if culture.core_values else ''}
 Social Structure: {culture.social_structure or ''}
-Religion: {culture.religion or ''}
+Family Structure: {culture.family_structure or ''}
 Languages: {languages or 'Unknown'}
-Taboos: {culture.taboos or 'None specified'}
+Taboos: {', '.join(culture.taboos) if culture.taboos else 'None specified'}
 Rituals:
 {rituals or '  None documented'}
 Traditions:
 {traditions or '  None documented'}
-Clothing Style: {culture.clothing_style or ''}
-Architecture Style: {culture.architecture_style or ''}
+Coming of Age: {culture.coming_of_age or ''}
+Historical Influences: {culture.historical_influences or ''}
 Notes: {culture.notes or ''}
             """.strip()
 
@@ -303,12 +904,13 @@ Notes: {culture.notes or ''}
                 content=content,
                 source_type="culture",
                 source_name=culture.name,
+                fields=self._entity_fields(culture),
                 source_id=culture.id,
                 metadata={
                     "factions": culture.associated_factions
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_historical_events(self):
         """Index historical events."""
@@ -341,6 +943,7 @@ Notes: {event.notes or ''}
                 content=content,
                 source_type="historical_event",
                 source_name=event.name,
+                fields=self._entity_fields(event),
                 source_id=event.id,
                 metadata={
                     "year": event.year,
@@ -348,7 +951,7 @@ Notes: {event.notes or ''}
                     "factions": event.factions_involved
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_flora_fauna(self):
         """Index flora and fauna."""
@@ -384,10 +987,11 @@ Notes: {flora.notes or ''}
                     content=content,
                     source_type="flora",
                     source_name=flora.name,
+                    fields=self._entity_fields(flora),
                     source_id=flora.id,
                     metadata={"flora_type": str(flora.flora_type)}
                 )
-                self.search_engine.index_document(chunk)
+                self._queue_chunk(chunk)
 
         # Fauna
         if hasattr(wb, 'fauna'):
@@ -414,13 +1018,14 @@ Notes: {fauna.notes or ''}
                     content=content,
                     source_type="fauna",
                     source_name=fauna.name,
+                    fields=self._entity_fields(fauna),
                     source_id=fauna.id,
                     metadata={
                         "fauna_type": str(fauna.fauna_type),
                         "danger_level": fauna.danger_level
                     }
                 )
-                self.search_engine.index_document(chunk)
+                self._queue_chunk(chunk)
 
     def _index_myths(self):
         """Index mythology entries."""
@@ -449,13 +1054,14 @@ Notes: {myth.notes or ''}
                 content=content,
                 source_type="myth",
                 source_name=myth.name,
+                fields=self._entity_fields(myth),
                 source_id=myth.id,
                 metadata={
                     "myth_type": myth.myth_type,
                     "factions": myth.associated_factions
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_star_systems(self):
         """Index star systems and celestial bodies."""
@@ -491,13 +1097,14 @@ Notes: {system.notes or ''}
                 content=content,
                 source_type="star_system",
                 source_name=system.name,
+                fields=self._entity_fields(system),
                 source_id=system.id,
                 metadata={
                     "system_type": system.system_type,
                     "controlling_faction": system.controlling_faction
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_armies(self):
         """Index military/army data."""
@@ -532,10 +1139,11 @@ Notes: {army.notes or ''}
                 content=content,
                 source_type="military",
                 source_name=army.name,
+                fields=self._entity_fields(army),
                 source_id=army.id,
                 metadata={"faction": army.faction}
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_economies(self):
         """Index economy data."""
@@ -561,10 +1169,11 @@ Notes: {economy.notes or ''}
                 content=content,
                 source_type="economy",
                 source_name=economy.name,
+                fields=self._entity_fields(economy),
                 source_id=economy.id,
                 metadata={"economy_type": str(economy.economy_type)}
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_political_systems(self):
         """Index political system data."""
@@ -596,10 +1205,11 @@ Notes: {system.notes or ''}
                 content=content,
                 source_type="political_system",
                 source_name=system.name,
+                fields=self._entity_fields(system),
                 source_id=system.id,
                 metadata={"government_type": system.government_type}
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_characters(self):
         """Index character data."""
@@ -624,10 +1234,11 @@ Notes: {char.notes}
                 content=content,
                 source_type="character",
                 source_name=char.name,
+                fields=self._entity_fields(char),
                 source_id=char.id,
                 metadata={"character_type": char.character_type}
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_plot(self):
         """Index plot and story planning data."""
@@ -641,7 +1252,7 @@ Notes: {char.notes}
                 source_name="Main Plot",
                 source_id="main_plot"
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
         # Plot events
         if hasattr(sp.freytag_pyramid, 'events'):
@@ -660,13 +1271,14 @@ Notes: {event.notes}
                     content=content,
                     source_type="plot_event",
                     source_name=event.title,
+                    fields=self._entity_fields(event),
                     source_id=event.id,
                     metadata={
                         "stage": event.stage,
                         "act": event.act
                     }
                 )
-                self.search_engine.index_document(chunk)
+                self._queue_chunk(chunk)
 
         # Subplots
         for subplot in sp.subplots:
@@ -682,10 +1294,11 @@ Characters Involved: {', '.join(subplot.characters_involved) if subplot.characte
                 content=content,
                 source_type="subplot",
                 source_name=subplot.title,
+                fields=self._entity_fields(subplot),
                 source_id=subplot.id,
                 metadata={"status": subplot.status}
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
         # Themes
         if sp.themes:
@@ -696,7 +1309,7 @@ Characters Involved: {', '.join(subplot.characters_involved) if subplot.characte
                 source_name="Story Themes",
                 source_id="themes"
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_promises(self):
         """Index story promises."""
@@ -716,10 +1329,11 @@ Related Characters: {', '.join(promise.related_characters) if promise.related_ch
                 content=content,
                 source_type="promise",
                 source_name=promise.title,
+                fields=self._entity_fields(promise),
                 source_id=promise.id,
                 metadata={"promise_type": promise.promise_type}
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
 
     def _index_chapter_data(self):
         """Index chapter key points from memory manager."""
@@ -734,14 +1348,73 @@ Related Characters: {', '.join(promise.related_characters) if promise.related_ch
                 content=f"Chapter Key Point ({kp.point_type}): {kp.content}",
                 source_type="chapter_key_point",
                 source_name=f"Chapter Key Point - {kp.point_type.title()}",
-                source_id=f"kp_{kp.chapter_id}_{hash(kp.content) % 10000}",
+                source_id=f"kp_{kp.chapter_id}_{_stable_key(kp.content)}",
                 metadata={
                     "point_type": kp.point_type,
                     "importance": kp.importance,
                     "chapter_id": kp.chapter_id
                 }
             )
-            self.search_engine.index_document(chunk)
+            self._queue_chunk(chunk)
+
+    def _index_chapter_prose(self):
+        """Locate chapter text to be chunked when the snapshot is applied.
+
+        Only paths of unloaded chapters, and the content of loaded ones, are
+        taken here, so nothing is read from disk on the project's thread.
+        """
+        for chapter in self.project.manuscript.chapters:
+            if self._chapter_scope is not None and chapter.id not in self._chapter_scope:
+                continue
+
+            file_path = chapter.deferred_file_path()
+            self._pending_chapters.append(ChapterSource(
+                chapter_id=chapter.id,
+                number=chapter.number,
+                title=chapter.title,
+                file_path=file_path,
+                content=None if file_path is not None else chapter.content
+            ))
+
+    def _chunk_chapters(self, snapshot: IndexSnapshot) -> List[DocumentChunk]:
+        """Read the chapters of a snapshot and split them into overlapping windows of paragraphs.
+
+        A chapter that cannot be read keeps the chunks the index has for it.
+        """
+        chunks: List[DocumentChunk] = []
+        for source in snapshot.chapters:
+            chapter_chunks: List[DocumentChunk] = []
+            try:
+                # Streams the chapter file rather than loading it
+                with source.open_text_view() as view:
+                    for passage in chunk_prose(view.iter_lines()):
+                        chapter_chunks.append(self._make_prose_chunk(source, passage))
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Warning: Could not index chapter {source.number}: {e}")
+                snapshot.kept_chapters.add(source.chapter_id)
+                continue
+            for chunk in chapter_chunks:
+                self._add_unique(chunk, chunks, snapshot.chunk_ids)
+        return chunks
+
+    def _make_prose_chunk(self, source: ChapterSource, passage: ProseChunk) -> DocumentChunk:
+        """Create the chunk of one passage of chapter prose."""
+        return self._make_chunk(
+            content=passage.text,
+            source_type="chapter_prose",
+            source_name=(f"Chapter {source.number}: {source.title} "
+                         f"(lines {passage.start_line}-{passage.end_line})"),
+            source_id=f"{source.chapter_id}_{_stable_key(passage.text)}",
+            metadata={
+                "chapter_id": source.chapter_id,
+                "chapter_number": source.number,
+                "chapter_title": source.title,
+                "start_line": passage.start_line,
+                "end_line": passage.end_line,
+                "start_offset": passage.start_offset,
+                "end_offset": passage.end_offset
+            }
+        )
 
     def search(
         self,
@@ -761,23 +1434,12 @@ Related Characters: {', '.join(promise.related_characters) if promise.related_ch
         Returns:
             List of ContextResult objects
         """
-        if not self._indexed:
-            self.rebuild_index()
-
-        results = self.search_engine.search(query, method, top_k, source_types)
-
-        return [
-            ContextResult(
-                content=r.chunk.content,
-                source_type=r.chunk.source_type,
-                source_name=r.chunk.source_name,
-                relevance_score=r.score,
-                matched_terms=r.matched_terms,
-                match_type=r.match_type,
-                metadata=r.chunk.metadata
-            )
-            for r in results
-        ]
+        key = QueryResultCache.make_key("search", query, method, top_k, source_types)
+        return self._cached_search(
+            key, query, method,
+            lambda engine, embedding: engine.search(query, method, top_k, source_types,
+                                                    query_embedding=embedding)
+        )
 
     def find_similar(
         self,
@@ -797,11 +1459,47 @@ Related Characters: {', '.join(promise.related_characters) if promise.related_ch
         Returns:
             List of similar content
         """
-        if not self._indexed:
-            self.rebuild_index()
+        key = QueryResultCache.make_key("similar", text, method, top_k)
+        return self._cached_search(
+            key, text, method,
+            lambda engine, embedding: engine.find_similar(text, top_k=top_k, method=method,
+                                                          query_embedding=embedding)
+        )
 
-        results = self.search_engine.find_similar(text, top_k=top_k, method=method)
+    def _cached_search(
+        self,
+        key: tuple,
+        query: str,
+        method: SearchMethod,
+        run: Callable[[SemanticSearchEngine, Optional[List[float]]], List[SearchResult]]
+    ) -> List[ContextResult]:
+        """Answer a search from the query cache, or run it on the published engine.
 
+        The query embedding, which may be a network call, is computed without
+        the lock, so it holds up neither other searches nor a sync publishing
+        its changes. Scoring takes the lock, as syncs update the engine in place.
+        """
+        self._ensure_indexed()
+        with self._lock:
+            cached = self.query_cache.get(key, self.index_version)
+            if cached is not None:
+                return cached
+            engine = self.search_engine
+            version = self.index_version
+
+        embedding = engine.embed_query(query, method)
+
+        with self._lock:
+            if engine is self.search_engine:
+                # Score against the current contents
+                version = self.index_version
+            results = self._to_context_results(run(engine, embedding))
+            if version == self.index_version:
+                self.query_cache.put(key, version, results)
+        return results
+
+    @staticmethod
+    def _to_context_results(results: List[SearchResult]) -> List[ContextResult]:
         return [
             ContextResult(
                 content=r.chunk.content,
@@ -819,45 +1517,56 @@ Related Characters: {', '.join(promise.related_characters) if promise.related_ch
         self,
         query: str,
         max_tokens: int = 2000,
-        method: SearchMethod = SearchMethod.HYBRID
+        method: SearchMethod = SearchMethod.HYBRID,
+        candidates: int = 20
     ) -> str:
         """Get formatted context for AI chat.
 
+        Results are packed to make the most of the budget (see
+        context_packer): tokens are counted for the LLM client's model,
+        results are chosen by rank-weighted relevance per token, the rest of
+        the budget is filled with a result cut at a sentence boundary, and
+        text repeated across results is included once.
+
         Args:
             query: User's query
-            max_tokens: Approximate max tokens for context
+            max_tokens: Max tokens for context
             method: Search method
+            candidates: Search results considered for packing
 
         Returns:
             Formatted context string for AI prompt
         """
-        results = self.search(query, method, top_k=10)
+        results = self.search(query, method, top_k=candidates)
 
         if not results:
             return ""
 
-        context_parts = []
-        current_tokens = 0
-        chars_per_token = 4  # Rough estimate
-
-        for result in results:
-            content_tokens = len(result.content) // chars_per_token
-            if current_tokens + content_tokens > max_tokens:
-                break
-
-            context_parts.append(
-                f"[{result.source_type.upper()}: {result.source_name}]\n{result.content}\n"
-            )
-            current_tokens += content_tokens
+        counter = self.get_token_counter()
+        header = "RELEVANT CONTEXT FROM PROJECT:\n\n"
+        separator = "\n---\n"
+        # Blocks are each counted with a separator, one more than are joined
+        budget = max_tokens - counter.count(header) + counter.count(separator)
+        packed = pack_context(results, budget, counter, separator=separator)
 
-        if not context_parts:
+        if not packed:
             return ""
 
-        return "RELEVANT CONTEXT FROM PROJECT:\n\n" + "\n---\n".join(context_parts)
+        return header + separator.join(format_block(item.result, item.content) for item in packed)
+
+    def get_token_counter(self) -> TokenCounter:
+        """Get the token counter for the LLM client's model."""
+        if self._token_counter is None:
+            self._token_counter = TokenCounter.for_client(self.llm_client)
+        return self._token_counter
 
     def get_stats(self) -> Dict[str, Any]:
         """Get index statistics."""
-        return self.search_engine.get_stats()
+        with self._lock:
+            stats = self.search_engine.get_stats()
+            stats["query_cache"] = self.query_cache.get_stats()
+        stats["index_version"] = self.index_version
+        return stats
 
     def get_all_source_types(self) -> List[str]:
         """Get all available source types in the index."""
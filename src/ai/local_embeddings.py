@@ -0,0 +1,163 @@
+"""Local embeddings - Offline CPU embedding backends for semantic search.
+
+None of the LLM providers expose an embedding endpoint through LLMClient, so
+without a local backend the EMBEDDING and HYBRID search modes have nothing to
+work with. Two backends are provided, both with the get_embedding /
+get_embeddings interface EnhancedRAGSystem connects to:
+
+- HashingEmbedder: words and character n-grams are hashed into a fixed number
+  of signed buckets (a sparse random projection). It needs only NumPy, runs in
+  a few milliseconds per chunk and catches shared names, word forms and
+  misspellings rather than meaning.
+- SentenceTransformerEmbedder: a small sentence-transformer model run on CPU,
+  if the sentence-transformers package is installed.
+"""
+
+import math
+import re
+import zlib
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """Deterministic hashed n-gram encoder; needs no model and no network."""
+
+    # Bumped when the features change, so cached embeddings are not reused
+    VERSION = 1
+
+    def __init__(self, dim: int = 384, char_ngrams: Tuple[int, int] = (3, 5)):
+        """Initialize embedder.
+
+        Args:
+            dim: Embedding dimension (number of hash buckets)
+            char_ngrams: Smallest and largest character n-gram taken from each word
+        """
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+
+    @property
+    def embedding_model(self) -> str:
+        """Identifier of the encoder configuration, used to key cached embeddings."""
+        low, high = self.char_ngrams
+        return f"local-hashing-v{self.VERSION}-{self.dim}-{low}{high}"
+
+    def get_embedding(self, text: str) -> List[float]:
+        """Embed one text."""
+        return self.get_embeddings([text])[0].tolist()
+
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as one (len(texts), dim) float32 batch with unit-length rows."""
+        buckets = []
+        weights = []
+        for row, text in enumerate(texts):
+            row_buckets, row_weights = self._features(text)
+            buckets.append(row_buckets + row * self.dim)
+            weights.append(row_weights)
+
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        # One bincount over the flattened batch fills every row at once
+        matrix = np.bincount(
+            np.concatenate(buckets), weights=np.concatenate(weights),
+            minlength=len(texts) * self.dim
+        ).reshape(len(texts), self.dim).astype(np.float32)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hash the features of a text into bucket indices and signed weights."""
+        low, high = self.char_ngrams
+        counts = Counter()
+        # N-grams are taken once per distinct word and weighted by its count
+        for word, word_count in Counter(_WORD_PATTERN.findall(text.lower())).items():
+            counts["w:" + word] += word_count
+            padded = f"<{word}>"
+            for n in range(low, min(high, len(padded)) + 1):
+                for i in range(len(padded) - n + 1):
+                    counts[padded[i:i + n]] += word_count
+
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode('utf-8')) for feature in counts),
+            dtype=np.int64, count=len(counts)
+        )
+        # Sublinear term frequency, so repeated words do not dominate
+        weights = np.fromiter(
+            (1.0 + math.log(count) for count in counts.values()),
+            dtype=np.float64, count=len(counts)
+        )
+        # The top hash bit picks the sign, so collisions tend to cancel out
+        signs = np.where(hashes >> 31, -1.0, 1.0)
+        return hashes % self.dim, weights * signs
+
+
+class SentenceTransformerEmbedder:
+    """Small sentence-transformer model run locally (CPU by default)."""
+
+    DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, device: str = "cpu", batch_size: int = 32):
+        """Initialize embedder, loading the model.
+
+        Args:
+            model_name: Sentence-transformers model name or local path
+            device: Torch device to run on
+            batch_size: Texts encoded per forward pass
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers is required for local model embeddings. "
+                "Install with: pip install sentence-transformers"
+            )
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_name, device=device)
+
+    @property
+    def embedding_model(self) -> str:
+        """Identifier of the model, used to key cached embeddings."""
+        return f"sentence-transformers:{self.model_name}"
+
+    def get_embedding(self, text: str) -> List[float]:
+        """Embed one text."""
+        return self.get_embeddings([text])[0].tolist()
+
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batched forward passes."""
+        return self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+
+
+def create_local_embedder(model_name: Optional[str] = None):
+    """Create a local embedder.
+
+    Args:
+        model_name: Sentence-transformers model to load, or None for the
+            hashing encoder. Falls back to the hashing encoder if the model
+            cannot be loaded.
+    """
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            print(f"Warning: Could not load embedding model {model_name}, using hashing encoder: {e}")
+    return HashingEmbedder()
@@ -0,0 +1,136 @@
+"""Prose chunker - Splits chapter text into overlapping passage windows.
+
+Chapters are read line by line (from a ChapterTextView, so nothing beyond the
+current window is held in memory) and grouped into paragraphs, then into
+windows of a few paragraphs for search indexing. Each window records the
+1-based line range and character offsets it covers, so a search result can
+be opened at the right place in the editor.
+
+Window boundaries are content-defined: a window may end after any paragraph
+whose hash hits a fixed pattern once it has reached the minimum size, and
+must end at the maximum size or a scene break. An edit therefore only changes
+the windows around it, instead of shifting every boundary after it, and
+windows whose text is unchanged are not re-indexed.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+
+# Lines that mark a scene break, e.g. "***", "* * *", "#", "---"
+_SCENE_BREAK = re.compile(r"^\s*(?:[*#~-]\s*){1,5}$")
+
+
+@dataclass
+class ProseChunk:
+    """A window of consecutive paragraphs from one chapter."""
+    text: str
+    start_line: int  # 1-based, inclusive
+    end_line: int  # 1-based, inclusive
+    start_offset: int  # Character offset of the first paragraph in the chapter
+    end_offset: int  # Character offset just past the last paragraph
+
+
+@dataclass
+class _Paragraph:
+    text: str
+    start_line: int
+    end_line: int
+    start_offset: int
+    end_offset: int
+
+
+def iter_paragraphs(lines: Iterable[str]) -> Iterator[Optional[_Paragraph]]:
+    """Group lines into paragraphs, yielding None for each scene break.
+
+    Offsets count characters of the text joined with "\\n", matching
+    Chapter.content.
+    """
+    current: List[str] = []
+    start_line = start_offset = end_line = end_offset = 0
+    offset = 0
+
+    for line_number, line in enumerate(lines, 1):
+        is_break = bool(_SCENE_BREAK.match(line))
+        if line.strip() and not is_break:
+            if not current:
+                start_line, start_offset = line_number, offset
+            current.append(line)
+            end_line, end_offset = line_number, offset + len(line)
+        elif current:
+            yield _Paragraph("\n".join(current), start_line, end_line, start_offset, end_offset)
+            current = []
+        if is_break:
+            yield None
+        offset += len(line) + 1
+
+    if current:
+        yield _Paragraph("\n".join(current), start_line, end_line, start_offset, end_offset)
+
+
+def chunk_prose(
+    lines: Iterable[str],
+    min_chars: int = 600,
+    max_chars: int = 2000,
+    overlap_paragraphs: int = 1,
+    boundary_modulus: int = 4
+) -> Iterator[ProseChunk]:
+    """Split chapter lines into overlapping windows of paragraphs.
+
+    Args:
+        lines: Chapter lines without line endings (e.g. view.iter_lines())
+        min_chars: A window ends only at a scene break or the maximum size
+            before reaching this many characters
+        max_chars: A window ends once it reaches this many characters
+        overlap_paragraphs: Paragraphs repeated at the start of the next
+            window, so passages spanning a boundary are still found; windows
+            never overlap across a scene break
+        boundary_modulus: On average a window may end after one in this
+            many paragraphs once past min_chars
+
+    Yields:
+        ProseChunk windows in chapter order
+    """
+    window: List[_Paragraph] = []
+    size = 0
+    fresh = 0  # Paragraphs in the window not carried over from the last one
+
+    for paragraph in iter_paragraphs(lines):
+        if paragraph is None:
+            # Scene break: close the window and start the next one clean
+            if fresh:
+                yield _make_chunk(window)
+            window, size, fresh = [], 0, 0
+            continue
+
+        window.append(paragraph)
+        size += len(paragraph.text)
+        fresh += 1
+        if size < max_chars and not (size >= min_chars and _is_boundary(paragraph.text, boundary_modulus)):
+            continue
+
+        yield _make_chunk(window)
+        window = window[-overlap_paragraphs:] if 0 < overlap_paragraphs < fresh else []
+        size = sum(len(p.text) for p in window)
+        fresh = 0
+
+    if fresh:
+        yield _make_chunk(window)
+
+
+def _is_boundary(text: str, modulus: int) -> bool:
+    """Content-defined boundary test, stable across runs and edits elsewhere."""
+    digest = hashlib.md5(text.encode('utf-8')).digest()
+    return digest[0] % modulus == 0
+
+
+def _make_chunk(window: List[_Paragraph]) -> ProseChunk:
+    return ProseChunk(
+        text="\n\n".join(p.text for p in window),
+        start_line=window[0].start_line,
+        end_line=window[-1].end_line,
+        start_offset=window[0].start_offset,
+        end_offset=window[-1].end_offset,
+    )
@@ -1,11 +1,13 @@
 """RAG (Retrieval-Augmented Generation) system for context lookup."""
 
-from typing import List, Dict, Optional, TYPE_CHECKING
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 from src.models.project import WriterProject
-from src.ai.llm_client import LLMClient
+from src.ai.enhanced_rag import EnhancedRAGSystem
 
 if TYPE_CHECKING:
+    from src.ai.llm_client import LLMClient
     from src.ai.chapter_memory import ChapterMemoryManager
 
 
@@ -18,348 +20,119 @@ class ContextChunk:
     relevance_score: float = 0.0
 
 
-class RAGSystem:
-    """RAG system for retrieving relevant context from project data."""
+# Source types searched for each group of get_relevant_context()
+_WORLDBUILDING_TYPES = ["worldbuilding", "place"]
+_PLACE_TYPES = ["place"]
+_CHARACTER_TYPES = ["character"]
+_PLOT_TYPES = ["plot", "subplot"]
+_KEY_POINT_TYPES = ["chapter_key_point"]
+
 
-    def __init__(self, project: WriterProject, llm_client: Optional[LLMClient] = None,
-                 memory_manager: Optional['ChapterMemoryManager'] = None):
+class RAGSystem:
+    """RAG system for retrieving relevant context from project data.
+
+    A thin adapter over EnhancedRAGSystem: searches go to its index, where
+    every entity's text block is built once per sync rather than per query.
+    Lookups never wait for indexing: changes marked on the index are handed
+    to a background sync, and searches answer from the last completed index
+    meanwhile. Results are kept in a bounded LRU cache that is dropped
+    whenever the index is updated or the project changes.
+    """
+
+    def __init__(self, project: WriterProject, llm_client: Optional['LLMClient'] = None,
+                 memory_manager: Optional['ChapterMemoryManager'] = None,
+                 engine: Optional[EnhancedRAGSystem] = None, cache_size: int = 128):
         """Initialize RAG system with project data.
 
         Args:
             project: The WriterProject instance
             llm_client: Optional LLM client for summarization
             memory_manager: Optional ChapterMemoryManager for cached chapter data
+            engine: Search index to use, e.g. one shared with the search
+                dialogs; by default one is built for the project on first use
+            cache_size: Maximum number of query results kept
         """
         self.project = project
         self.llm_client = llm_client
         self.memory_manager = memory_manager
-        self._context_cache: Dict[str, List[ContextChunk]] = {}
-        self._cache_ttl = 300  # Cache results for 5 minutes
-        self._cache_timestamps: Dict[str, float] = {}
+        self.engine = engine or EnhancedRAGSystem(project, memory_manager=memory_manager)
+        self.cache_size = cache_size
+        self._context_cache: OrderedDict[tuple, List[ContextChunk]] = OrderedDict()
+        self._reference_blocks: Dict[Tuple[str, str], str] = {}
+        self._cache_version: Optional[int] = None
 
     def set_memory_manager(self, memory_manager: 'ChapterMemoryManager') -> None:
         """Set or update the memory manager reference."""
         self.memory_manager = memory_manager
+        self.engine.set_memory_manager(memory_manager)
+        self.engine.mark_changed("chapter_data")
         # Clear cache when memory manager changes
-        self._context_cache.clear()
-        self._cache_timestamps.clear()
+        self.clear_cache()
 
-    def search_worldbuilding(self, query: str) -> List[ContextChunk]:
-        """Search worldbuilding sections for relevant content."""
-        chunks = []
+    def set_project(self, project: WriterProject, engine: Optional[EnhancedRAGSystem] = None) -> None:
+        """Switch to another project, with its own search index."""
+        self.project = project
+        self.engine = engine or EnhancedRAGSystem(project, memory_manager=self.memory_manager)
+        self.clear_cache()
 
-        wb = self.project.worldbuilding
+    def mark_changed(self, *groups: str) -> None:
+        """Record project changes; the next lookup re-indexes them.
 
-        # Search all worldbuilding sections
-        sections = {
-            "Mythology": wb.mythology,
-            "Planets": wb.planets,
-            "Climate": wb.climate,
-            "History": wb.history,
-            "Politics": wb.politics,
-            "Military": wb.military,
-            "Economy": wb.economy,
-            "Power Hierarchy": wb.power_hierarchy
-        }
+        Args:
+            groups: Index groups that changed (see enhanced_rag.INDEX_GROUPS);
+                none marks the whole project
+        """
+        self.engine.mark_changed(*groups)
+        self.clear_cache()
 
-        # Add custom sections
-        sections.update(wb.custom_sections)
+    def _sync(self) -> None:
+        """Start indexing changes marked since the last lookup and drop data built before them.
 
-        # Simple keyword matching (can be enhanced with embeddings)
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
+        Quick references are formatted from the project itself, so they are
+        rebuilt straight away; search results follow once the sync completes.
+        """
+        if self.engine.has_pending_changes():
+            self.engine.start_background_sync()
+            self._reference_blocks.clear()
+        self._check_cache_version()
+
+    def _search(self, query: str, source_types: List[str], top_k: int = 10) -> List[ContextChunk]:
+        """Search the index, converting results to context chunks."""
+        if not query.strip():
+            return []
+        self._sync()
+        results = self.engine.search(query, top_k=top_k, source_types=source_types)
+        return [
+            ContextChunk(
+                content=result.content,
+                source_type=result.source_type,
+                source_name=result.source_name,
+                relevance_score=result.relevance_score
+            )
+            for result in results
+        ]
 
-        for section_name, content in sections.items():
-            if not content:
-                continue
-
-            content_lower = content.lower()
-
-            # Check for exact phrase match
-            if query_lower in content_lower:
-                relevance = 0.9
-            else:
-                # Check word overlap
-                content_words = set(content_lower.split())
-                overlap = query_words & content_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:  # Threshold
-                chunks.append(ContextChunk(
-                    content=content,
-                    source_type="worldbuilding",
-                    source_name=section_name,
-                    relevance_score=relevance
-                ))
-
-        # Search places/landmarks
-        for place in wb.places:
-            place_text = f"""
-Place: {place.name}
-Type: {place.place_type}
-Planet: {place.planet or 'Unknown'}
-Region: {place.region or 'Unknown'}
-Controlling Faction: {place.controlling_faction or 'None'}
-Description: {place.description}
-Key Features: {', '.join(place.key_features) if place.key_features else 'None'}
-Atmosphere: {place.atmosphere}
-Story Relevance: {place.story_relevance}
-            """.strip()
-
-            place_lower = place_text.lower()
-
-            # Check for name match (highest relevance)
-            if place.name.lower() in query_lower:
-                relevance = 1.0
-            elif query_lower in place_lower:
-                relevance = 0.85
-            else:
-                place_words = set(place_lower.split())
-                overlap = query_words & place_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:
-                chunks.append(ContextChunk(
-                    content=place_text,
-                    source_type="place",
-                    source_name=place.name,
-                    relevance_score=relevance
-                ))
-
-        # Sort by relevance
-        chunks.sort(key=lambda x: x.relevance_score, reverse=True)
-        return chunks
+    def search_worldbuilding(self, query: str) -> List[ContextChunk]:
+        """Search worldbuilding sections and places for relevant content."""
+        return self._search(query, _WORLDBUILDING_TYPES)
 
     def search_places(self, query: str) -> List[ContextChunk]:
         """Search places and landmarks for relevant content."""
-        chunks = []
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        wb = self.project.worldbuilding
-
-        for place in wb.places:
-            # Build comprehensive place text for searching
-            place_text = f"""
-**{place.name}** ({place.place_type})
-
-**Location:**
-- Planet: {place.planet or 'Unknown'}
-- Continent: {place.continent or 'Unknown'}
-- Region: {place.region or 'Unknown'}
-
-**Control:**
-- Controlling Faction: {place.controlling_faction or 'None'}
-- Contested By: {', '.join(place.contested_by) if place.contested_by else 'None'}
-
-**Description:**
-{place.description}
-
-**Key Features:**
-{chr(10).join('- ' + f for f in place.key_features) if place.key_features else 'None listed'}
-
-**Atmosphere:**
-{place.atmosphere}
-
-**Cultural Significance:**
-{place.cultural_significance}
-
-**Story Relevance:**
-{place.story_relevance}
-
-**Notable Inhabitants:**
-{', '.join(place.notable_inhabitants) if place.notable_inhabitants else 'None listed'}
-
-**Notes:**
-{place.notes}
-            """.strip()
-
-            place_lower = place_text.lower()
-
-            # Check for name match (highest relevance)
-            if place.name.lower() in query_lower:
-                relevance = 1.0
-            elif query_lower in place_lower:
-                relevance = 0.85
-            else:
-                place_words = set(place_lower.split())
-                overlap = query_words & place_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:
-                chunks.append(ContextChunk(
-                    content=place_text,
-                    source_type="place",
-                    source_name=place.name,
-                    relevance_score=relevance
-                ))
-
-        chunks.sort(key=lambda x: x.relevance_score, reverse=True)
-        return chunks
+        return self._search(query, _PLACE_TYPES)
 
     def search_characters(self, query: str) -> List[ContextChunk]:
         """Search characters for relevant content."""
-        chunks = []
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        for character in self.project.characters:
-            # Combine all character text
-            char_text = f"""
-            Name: {character.name}
-            Type: {character.character_type}
-            Personality: {character.personality}
-            Backstory: {character.backstory}
-            Notes: {character.notes}
-            """
-
-            char_lower = char_text.lower()
-
-            # Check for name match
-            if character.name.lower() in query_lower:
-                relevance = 1.0
-            elif query_lower in char_lower:
-                relevance = 0.8
-            else:
-                # Word overlap
-                char_words = set(char_lower.split())
-                overlap = query_words & char_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:
-                chunks.append(ContextChunk(
-                    content=char_text.strip(),
-                    source_type="character",
-                    source_name=character.name,
-                    relevance_score=relevance
-                ))
-
-        chunks.sort(key=lambda x: x.relevance_score, reverse=True)
-        return chunks
+        return self._search(query, _CHARACTER_TYPES)
 
     def search_plot(self, query: str) -> List[ContextChunk]:
         """Search plot and story planning for relevant content."""
-        chunks = []
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        sp = self.project.story_planning
-
-        # Main plot
-        if sp.main_plot:
-            plot_lower = sp.main_plot.lower()
-            if query_lower in plot_lower:
-                relevance = 0.9
-            else:
-                plot_words = set(plot_lower.split())
-                overlap = query_words & plot_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:
-                chunks.append(ContextChunk(
-                    content=sp.main_plot,
-                    source_type="plot",
-                    source_name="Main Plot",
-                    relevance_score=relevance
-                ))
-
-        # Freytag pyramid
-        pyramid_sections = {
-            "Exposition": sp.freytag_pyramid.exposition,
-            "Rising Action": sp.freytag_pyramid.rising_action,
-            "Climax": sp.freytag_pyramid.climax,
-            "Falling Action": sp.freytag_pyramid.falling_action,
-            "Resolution": sp.freytag_pyramid.resolution
-        }
-
-        for section_name, content in pyramid_sections.items():
-            if not content:
-                continue
-
-            content_lower = content.lower()
-            if query_lower in content_lower:
-                relevance = 0.8
-            else:
-                content_words = set(content_lower.split())
-                overlap = query_words & content_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:
-                chunks.append(ContextChunk(
-                    content=content,
-                    source_type="plot",
-                    source_name=section_name,
-                    relevance_score=relevance
-                ))
-
-        # Subplots
-        for subplot in sp.subplots:
-            subplot_text = f"""
-            Title: {subplot.title}
-            Description: {subplot.description}
-            Connection to Main Plot: {subplot.connection_to_main}
-            """
-
-            subplot_lower = subplot_text.lower()
-            if query_lower in subplot_lower:
-                relevance = 0.7
-            else:
-                subplot_words = set(subplot_lower.split())
-                overlap = query_words & subplot_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:
-                chunks.append(ContextChunk(
-                    content=subplot_text.strip(),
-                    source_type="subplot",
-                    source_name=subplot.title,
-                    relevance_score=relevance
-                ))
-
-        chunks.sort(key=lambda x: x.relevance_score, reverse=True)
-        return chunks
+        return self._search(query, _PLOT_TYPES)
 
     def search_chapter_key_points(self, query: str) -> List[ContextChunk]:
-        """Search chapter key points from memory manager.
-
-        Uses the cached chapter summaries for fast lookup without
-        loading full chapter content.
-        """
-        chunks = []
-
+        """Search chapter key points from the memory manager's summaries."""
         if not self.memory_manager:
-            return chunks
-
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        # Search through key points from all chapter summaries
-        key_points = self.memory_manager.search_key_points(query)
-
-        for kp in key_points:
-            # Calculate relevance based on content match
-            kp_lower = kp.content.lower()
-
-            if query_lower in kp_lower:
-                relevance = 0.9
-            else:
-                kp_words = set(kp_lower.split())
-                overlap = query_words & kp_words
-                relevance = len(overlap) / len(query_words) if query_words else 0
-
-            if relevance > 0.1:
-                # Include importance in relevance score
-                adjusted_relevance = relevance * (0.5 + kp.importance * 0.1)
-
-                chunks.append(ContextChunk(
-                    content=kp.content,
-                    source_type="chapter_key_point",
-                    source_name=f"{kp.point_type.title()} (Chapter Key Point)",
-                    relevance_score=adjusted_relevance
-                ))
-
-        chunks.sort(key=lambda x: x.relevance_score, reverse=True)
-        return chunks[:10]  # Limit to top 10 key points
+            return []
+        return self._search(query, _KEY_POINT_TYPES)
 
     def search_chapter_characters(self, query: str) -> List[ContextChunk]:
         """Search for characters mentioned in chapters.
@@ -413,46 +186,54 @@ Story Relevance: {place.story_relevance}
         Returns:
             List of relevant context chunks sorted by relevance
         """
-        import time
-
-        # Check cache first
-        cache_key = f"{query}_{include_worldbuilding}_{include_characters}_{include_plot}_{include_places}_{include_chapter_memory}"
-        if cache_key in self._context_cache:
-            cached_time = self._cache_timestamps.get(cache_key, 0)
-            if time.time() - cached_time < self._cache_ttl:
-                return self._context_cache[cache_key][:max_results]
-
-        all_chunks = []
-
+        self._sync()
+        cache_key = (query, max_results, include_worldbuilding, include_characters,
+                     include_plot, include_places, include_chapter_memory)
+        cached = self._context_cache.get(cache_key)
+        if cached is not None:
+            self._context_cache.move_to_end(cache_key)
+            return list(cached)
+
+        # One search over all requested types ranks them against each other
+        source_types = []
         if include_worldbuilding:
-            all_chunks.extend(self.search_worldbuilding(query))
-
+            source_types.extend(_WORLDBUILDING_TYPES)
         if include_characters:
-            all_chunks.extend(self.search_characters(query))
-
+            source_types.extend(_CHARACTER_TYPES)
         if include_plot:
-            all_chunks.extend(self.search_plot(query))
-
+            source_types.extend(_PLOT_TYPES)
         if include_places:
-            all_chunks.extend(self.search_places(query))
+            source_types.extend(_PLACE_TYPES)
+        if include_chapter_memory and self.memory_manager:
+            source_types.extend(_KEY_POINT_TYPES)
 
+        all_chunks = self._search(query, sorted(set(source_types)), max_results) if source_types else []
         if include_chapter_memory:
-            all_chunks.extend(self.search_chapter_key_points(query))
             all_chunks.extend(self.search_chapter_characters(query))
 
-        # Sort by relevance and cache results
         all_chunks.sort(key=lambda x: x.relevance_score, reverse=True)
+        all_chunks = all_chunks[:max_results]
 
-        # Cache the results
+        # The first search may have built the index
+        self._check_cache_version()
         self._context_cache[cache_key] = all_chunks
-        self._cache_timestamps[cache_key] = time.time()
+        if len(self._context_cache) > self.cache_size:
+            self._context_cache.popitem(last=False)
 
-        return all_chunks[:max_results]
+        return list(all_chunks)
 
     def clear_cache(self) -> None:
-        """Clear the context cache."""
+        """Clear cached results and reference blocks."""
         self._context_cache.clear()
-        self._cache_timestamps.clear()
+        self._reference_blocks.clear()
+        self._cache_version = None
+
+    def _check_cache_version(self) -> None:
+        """Drop cached data built from an older state of the index."""
+        version = self.engine.index_version
+        if version != self._cache_version:
+            self.clear_cache()
+            self._cache_version = version
 
     def summarize_context(self, query: str, max_results: int = 5) -> str:
         """Get relevant context and summarize it using LLM."""
@@ -499,10 +280,17 @@ Story Relevance: {place.story_relevance}
 
     def get_quick_reference(self, context_type: str, name: str) -> Optional[str]:
         """Get quick reference for specific item by name."""
-        if context_type == "character":
-            char = next((c for c in self.project.characters if c.name.lower() == name.lower()), None)
-            if char:
-                return f"""
+        self._sync()
+        if not self._reference_blocks:
+            self._reference_blocks = self._build_reference_blocks()
+        return self._reference_blocks.get((context_type, name.lower()))
+
+    def _build_reference_blocks(self) -> Dict[Tuple[str, str], str]:
+        """Format the quick reference of every named item, keyed by (type, lowercase name)."""
+        blocks: Dict[Tuple[str, str], str] = {}
+
+        for char in self.project.characters:
+            blocks.setdefault(("character", char.name.lower()), f"""
 **{char.name}** ({char.character_type})
 
 **Personality:**
@@ -513,30 +301,26 @@ Story Relevance: {place.story_relevance}
 
 **Notes:**
 {char.notes}
-                """.strip()
-
-        elif context_type == "worldbuilding":
-            wb = self.project.worldbuilding
-            sections = {
-                "mythology": wb.mythology,
-                "planets": wb.planets,
-                "climate": wb.climate,
-                "history": wb.history,
-                "politics": wb.politics,
-                "military": wb.military,
-                "economy": wb.economy,
-                "power_hierarchy": wb.power_hierarchy
-            }
-            sections.update({k.lower(): v for k, v in wb.custom_sections.items()})
-
-            content = sections.get(name.lower())
+            """.strip())
+
+        wb = self.project.worldbuilding
+        sections = {
+            "mythology": wb.mythology,
+            "planets": wb.planets,
+            "climate": wb.climate,
+            "history": wb.history,
+            "politics": wb.politics,
+            "military": wb.military,
+            "economy": wb.economy,
+            "power_hierarchy": wb.power_hierarchy
+        }
+        sections.update({k.lower(): v for k, v in wb.custom_sections.items()})
+        for section_name, content in sections.items():
             if content:
-                return f"**{name.title()}**\n\n{content}"
+                blocks[("worldbuilding", section_name)] = f"**{section_name.title()}**\n\n{content}"
 
-        elif context_type == "subplot":
-            subplot = next((s for s in self.project.story_planning.subplots if s.title.lower() == name.lower()), None)
-            if subplot:
-                return f"""
+        for subplot in self.project.story_planning.subplots:
+            blocks.setdefault(("subplot", subplot.title.lower()), f"""
 **{subplot.title}**
 
 **Description:**
@@ -544,13 +328,11 @@ Story Relevance: {place.story_relevance}
 
 **Connection to Main Plot:**
 {subplot.connection_to_main}
-                """.strip()
+            """.strip())
 
-        elif context_type == "place":
-            place = next((p for p in self.project.worldbuilding.places if p.name.lower() == name.lower()), None)
-            if place:
-                features_text = "\n".join(f"- {f}" for f in place.key_features) if place.key_features else "None listed"
-                return f"""
+        for place in wb.places:
+            features_text = "\n".join(f"- {f}" for f in place.key_features) if place.key_features else "None listed"
+            blocks.setdefault(("place", place.name.lower()), f"""
 **{place.name}** ({place.place_type})
 
 **Location:**
@@ -575,9 +357,9 @@ Story Relevance: {place.story_relevance}
 
 **Notes:**
 {place.notes}
-                """.strip()
+            """.strip())
 
-        return None
+        return blocks
 
     def get_place_list(self) -> List[str]:
         """Get list of all place names for quick reference lookups."""
@@ -1,21 +1,53 @@
 """Semantic search system using embeddings, TF-IDF, and cosine similarity."""
 
-from typing import List, Dict, Optional, Tuple, Any, Callable
+from typing import List, Dict, Optional, Sequence, Tuple, Any, Callable, TYPE_CHECKING
 from dataclasses import dataclass, field
 from enum import Enum
 import math
 import re
 from collections import Counter
 import hashlib
+import heapq
 import json
 
+import numpy as np
+
+from src.ai.ann_index import IVFIndex
+from src.ai.embedding_batcher import EmbeddingBatcher, ProgressCallback
+
+if TYPE_CHECKING:
+    from src.ai.embedding_cache import EmbeddingCache
+
+
+# Words too common to be useful search terms
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'must', 'shall',
+    'can', 'need', 'dare', 'ought', 'used', 'to', 'of', 'in',
+    'for', 'on', 'with', 'at', 'by', 'from', 'as', 'into',
+    'through', 'during', 'before', 'after', 'above', 'below',
+    'between', 'under', 'again', 'further', 'then', 'once',
+    'here', 'there', 'when', 'where', 'why', 'how', 'all',
+    'each', 'few', 'more', 'most', 'other', 'some', 'such',
+    'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+    'too', 'very', 'just', 'and', 'but', 'if', 'or', 'because',
+    'until', 'while', 'this', 'that', 'these', 'those', 'it', 'its',
+})
+
+
+def _has_vector(vector) -> bool:
+    """Check that an embedding (list or array) is present and non-empty."""
+    return vector is not None and len(vector) > 0
+
 
 class SearchMethod(Enum):
     """Available search methods."""
     KEYWORD = "keyword"  # Basic keyword matching
     TFIDF = "tfidf"  # TF-IDF with cosine similarity
     EMBEDDING = "embedding"  # Neural embeddings (requires API or local model)
-    HYBRID = "hybrid"  # Combination of methods
+    BM25 = "bm25"  # BM25 over chunk text plus boosted metadata fields
+    HYBRID = "hybrid"  # Calibrated score fusion of BM25 and embeddings
 
 
 @dataclass
@@ -41,31 +73,67 @@ class SearchResult:
 
 
 class TFIDFIndex:
-    """TF-IDF index for text search with cosine similarity."""
+    """TF-IDF index for text search with cosine similarity.
+
+    Documents are tokenized once when added. The index keeps an inverted
+    index of raw term frequencies; document frequencies follow directly from
+    posting list lengths, so adding or removing a document only touches
+    that document's terms. IDF is applied at query time, and document norms
+    are cached per index version and recomputed only for documents a query
+    actually matches.
+    """
 
     def __init__(self):
         self.documents: Dict[str, DocumentChunk] = {}
-        self.idf_cache: Dict[str, float] = {}
-        self.vocab: set = set()
-        self._dirty = True
+        self._doc_tf: Dict[str, Dict[str, float]] = {}  # doc_id -> normalized term frequencies
+        self._postings: Dict[str, Dict[str, float]] = {}  # term -> {doc_id: term frequency}
+        self._norms: Dict[str, Tuple[int, float]] = {}  # doc_id -> (version, tf-idf magnitude)
+        self._version = 0  # Bumped on every change; IDF depends on the whole corpus
+
+    @property
+    def vocab(self):
+        """Terms present in at least one document."""
+        return self._postings.keys()
 
     def add_document(self, chunk: DocumentChunk):
-        """Add a document to the index."""
+        """Add (or replace) a document in the index."""
+        self.remove_document(chunk.id)
+
+        tf = self._compute_tf(self._tokenize(chunk.content))
         self.documents[chunk.id] = chunk
-        self._dirty = True
+        self._doc_tf[chunk.id] = tf
+        for term, tf_val in tf.items():
+            self._postings.setdefault(term, {})[chunk.id] = tf_val
+        self._version += 1
 
     def remove_document(self, doc_id: str):
         """Remove a document from the index."""
-        if doc_id in self.documents:
-            del self.documents[doc_id]
-            self._dirty = True
+        if doc_id not in self.documents:
+            return
+
+        del self.documents[doc_id]
+        self._norms.pop(doc_id, None)
+        for term in self._doc_tf.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._version += 1
 
     def clear(self):
         """Clear all documents from the index."""
         self.documents.clear()
-        self.idf_cache.clear()
-        self.vocab.clear()
-        self._dirty = True
+        self._doc_tf.clear()
+        self._postings.clear()
+        self._norms.clear()
+        self._version += 1
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a term in the current corpus."""
+        postings = self._postings.get(term)
+        if not postings:
+            return 0.0
+        return math.log((len(self.documents) + 1) / (len(postings) + 1)) + 1
 
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text into words."""
@@ -73,19 +141,7 @@ class TFIDFIndex:
         text = text.lower()
         tokens = re.findall(r'\b[a-z0-9]+\b', text)
         # Remove very short tokens and stopwords
-        stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                     'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                     'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-                     'can', 'need', 'dare', 'ought', 'used', 'to', 'of', 'in',
-                     'for', 'on', 'with', 'at', 'by', 'from', 'as', 'into',
-                     'through', 'during', 'before', 'after', 'above', 'below',
-                     'between', 'under', 'again', 'further', 'then', 'once',
-                     'here', 'there', 'when', 'where', 'why', 'how', 'all',
-                     'each', 'few', 'more', 'most', 'other', 'some', 'such',
-                     'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
-                     'too', 'very', 'just', 'and', 'but', 'if', 'or', 'because',
-                     'until', 'while', 'this', 'that', 'these', 'those', 'it', 'its'}
-        return [t for t in tokens if len(t) > 2 and t not in stopwords]
+        return [t for t in tokens if len(t) > 2 and t not in _STOPWORDS]
 
     def _compute_tf(self, tokens: List[str]) -> Dict[str, float]:
         """Compute term frequency (normalized)."""
@@ -95,71 +151,31 @@ class TFIDFIndex:
         max_count = max(counts.values())
         return {term: count / max_count for term, count in counts.items()}
 
-    def _rebuild_idf(self):
-        """Rebuild IDF cache."""
-        if not self._dirty:
-            return
-
-        self.vocab.clear()
-        doc_freq: Dict[str, int] = {}
-
-        # Count document frequency for each term
-        for chunk in self.documents.values():
-            tokens = set(self._tokenize(chunk.content))
-            self.vocab.update(tokens)
-            for token in tokens:
-                doc_freq[token] = doc_freq.get(token, 0) + 1
-
-        # Compute IDF
-        n_docs = len(self.documents)
-        if n_docs > 0:
-            self.idf_cache = {
-                term: math.log((n_docs + 1) / (freq + 1)) + 1
-                for term, freq in doc_freq.items()
-            }
-
-        # Pre-compute TF-IDF vectors for all documents
-        for chunk in self.documents.values():
-            tokens = self._tokenize(chunk.content)
-            tf = self._compute_tf(tokens)
-            chunk.tfidf_vector = {
-                term: tf_val * self.idf_cache.get(term, 0)
-                for term, tf_val in tf.items()
-            }
-
-        self._dirty = False
-
-    def _cosine_similarity(self, vec1: Dict[str, float], vec2: Dict[str, float]) -> float:
-        """Compute cosine similarity between two sparse vectors."""
-        if not vec1 or not vec2:
-            return 0.0
-
-        # Find common terms
-        common_terms = set(vec1.keys()) & set(vec2.keys())
-
-        if not common_terms:
-            return 0.0
-
-        # Compute dot product
-        dot_product = sum(vec1[t] * vec2[t] for t in common_terms)
-
-        # Compute magnitudes
-        mag1 = math.sqrt(sum(v * v for v in vec1.values()))
-        mag2 = math.sqrt(sum(v * v for v in vec2.values()))
-
-        if mag1 == 0 or mag2 == 0:
-            return 0.0
-
-        return dot_product / (mag1 * mag2)
-
-    def search(self, query: str, top_k: int = 10) -> List[Tuple[DocumentChunk, float, List[str]]]:
+    def _doc_norm(self, doc_id: str) -> float:
+        """TF-IDF vector magnitude of a document, cached until the index changes."""
+        cached = self._norms.get(doc_id)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+
+        norm = math.sqrt(sum(
+            (tf_val * self.idf(term)) ** 2
+            for term, tf_val in self._doc_tf[doc_id].items()
+        ))
+        self._norms[doc_id] = (self._version, norm)
+        return norm
+
+    def search(self, query: str, top_k: int = 10,
+               source_types: Optional[List[str]] = None) -> List[Tuple[DocumentChunk, float, List[str]]]:
         """Search for documents matching the query.
 
+        Args:
+            query: Search query
+            top_k: Maximum results to return
+            source_types: Only score documents of these source types
+
         Returns:
             List of (chunk, score, matched_terms) tuples
         """
-        self._rebuild_idf()
-
         if not self.documents:
             return []
 
@@ -169,52 +185,288 @@ class TFIDFIndex:
             return []
 
         query_tf = self._compute_tf(query_tokens)
+        query_idf = {term: self.idf(term) for term in query_tf}
         query_tfidf = {
-            term: tf_val * self.idf_cache.get(term, 0)
+            term: tf_val * query_idf[term]
             for term, tf_val in query_tf.items()
         }
+        query_norm = math.sqrt(sum(v * v for v in query_tfidf.values()))
+        if query_norm == 0:
+            return []
+
+        # Accumulate dot products from the postings of the query terms only
+        dots: Dict[str, float] = {}
+        matched_terms: Dict[str, set] = {}
+        for term, query_weight in query_tfidf.items():
+            # Document weight is tf * idf; fold the idf into the query side
+            weight = query_weight * query_idf[term]
+            for doc_id, doc_tf in self._postings.get(term, {}).items():
+                dots[doc_id] = dots.get(doc_id, 0.0) + weight * doc_tf
+                matched_terms.setdefault(doc_id, set()).add(term)
+
+        wanted = set(source_types) if source_types else None
+        scored = []
+        for doc_id, dot in dots.items():
+            if wanted is not None and self.documents[doc_id].source_type not in wanted:
+                continue
+            norm = self._doc_norm(doc_id)
+            if norm == 0:
+                continue
+            score = dot / (query_norm * norm)
+            if score > 0.01:  # Minimum threshold
+                scored.append((score, doc_id))
 
-        # Score all documents
         results = []
-        for chunk in self.documents.values():
-            if chunk.tfidf_vector:
-                score = self._cosine_similarity(query_tfidf, chunk.tfidf_vector)
-                if score > 0.01:  # Minimum threshold
-                    # Find matched terms
-                    matched = [t for t in query_tokens if t in chunk.tfidf_vector]
-                    results.append((chunk, score, matched))
-
-        # Sort by score descending
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        for score, doc_id in heapq.nlargest(top_k, scored):
+            matched = [t for t in query_tokens if t in matched_terms[doc_id]]
+            results.append((self.documents[doc_id], score, matched))
+        return results
+
+
+# Weight of each BM25 field; chunks can override them with
+# metadata["field_boosts"]. "content" is the chunk text; the other fields come
+# from metadata["fields"] and are scored on top of it, so a term in an
+# entity's name counts for more than the same term in its description.
+DEFAULT_FIELD_BOOSTS: Dict[str, float] = {
+    "content": 1.0,
+    "name": 3.0,
+    "type": 1.5,
+    "description": 1.0,
+    "notes": 0.5,
+}
+
+
+class BM25Index:
+    """BM25 index over chunk text and boosted metadata fields.
+
+    Each field is scored with BM25 against its own average length, and the
+    field scores are added up with their boosts. Unlike max-normalized
+    TF-IDF cosine, a short chunk whose name matches the query outranks a long
+    one that mentions the same term in passing.
+
+    Fields are saturated separately rather than combined first as in strict
+    BM25F: with one shared saturation, a long entry repeating a name scores
+    about as high as the entry of that name, whatever the name boost.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75,
+                 field_boosts: Optional[Dict[str, float]] = None):
+        """Initialize BM25 index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Strength of document length normalization
+            field_boosts: Default weight of each field (see DEFAULT_FIELD_BOOSTS)
+        """
+        self.k1 = k1
+        self.b = b
+        self.field_boosts = dict(field_boosts or DEFAULT_FIELD_BOOSTS)
+        self.documents: Dict[str, DocumentChunk] = {}
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {}  # term -> {doc_id: {field: count}}
+        self._doc_terms: Dict[str, List[str]] = {}  # doc_id -> distinct terms
+        self._field_lengths: Dict[str, Dict[str, int]] = {}  # doc_id -> {field: token count}
+        self._doc_boosts: Dict[str, Dict[str, float]] = {}  # doc_id -> per-chunk boosts
+        self._total_lengths: Counter = Counter()  # field -> tokens over all documents
+        self._field_docs: Counter = Counter()  # field -> documents having it
+
+    _tokenize = TFIDFIndex._tokenize
+
+    def add_document(self, chunk: DocumentChunk):
+        """Add (or replace) a document in the index."""
+        self.remove_document(chunk.id)
+
+        fields = {"content": chunk.content}
+        fields.update((name, str(text)) for name, text in chunk.metadata.get("fields", {}).items() if text)
+
+        terms: Dict[str, Dict[str, int]] = {}
+        lengths = {}
+        for name, text in fields.items():
+            tokens = self._tokenize(text)
+            if not tokens:
+                continue
+            lengths[name] = len(tokens)
+            for term, count in Counter(tokens).items():
+                terms.setdefault(term, {})[name] = count
+
+        self.documents[chunk.id] = chunk
+        self._doc_terms[chunk.id] = list(terms)
+        self._field_lengths[chunk.id] = lengths
+        self._doc_boosts[chunk.id] = chunk.metadata.get("field_boosts", {})
+        for term, field_counts in terms.items():
+            self._postings.setdefault(term, {})[chunk.id] = field_counts
+        self._total_lengths.update(lengths)
+        self._field_docs.update(lengths.keys())
+
+    def remove_document(self, doc_id: str):
+        """Remove a document from the index."""
+        if doc_id not in self.documents:
+            return
+
+        del self.documents[doc_id]
+        del self._doc_boosts[doc_id]
+        for term in self._doc_terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        lengths = self._field_lengths.pop(doc_id)
+        self._total_lengths.subtract(lengths)
+        self._field_docs.subtract(lengths.keys())
+
+    def clear(self):
+        """Clear all documents from the index."""
+        self.documents.clear()
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._field_lengths.clear()
+        self._doc_boosts.clear()
+        self._total_lengths.clear()
+        self._field_docs.clear()
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (never negative)."""
+        postings = self._postings.get(term)
+        if not postings:
+            return 0.0
+        count = len(postings)
+        return math.log(1 + (len(self.documents) - count + 0.5) / (count + 0.5))
+
+    def search(self, query: str, top_k: int = 10,
+               source_types: Optional[List[str]] = None) -> List[Tuple[DocumentChunk, float, List[str]]]:
+        """Search for documents matching the query.
+
+        Scores are divided by that of a document matching every query term
+        in both its text and its most boosted field, so they mostly fall
+        between 0 and 1 like the other methods' (and are capped at 1).
+
+        Args:
+            query: Search query
+            top_k: Maximum results to return
+            source_types: Only score documents of these source types
+
+        Returns:
+            List of (chunk, score, matched_terms) tuples
+        """
+        query_tokens = self._tokenize(query)
+        if not self.documents or not query_tokens:
+            return []
+
+        query_counts = Counter(query_tokens)
+        average_lengths = {
+            name: self._total_lengths[name] / self._field_docs[name]
+            for name in self._field_docs if self._field_docs[name] > 0
+        }
+        k1, b = self.k1, self.b
+        best_boost = self.field_boosts.get("content", 1.0) + max(
+            (boost for name, boost in self.field_boosts.items() if name != "content"), default=0.0
+        )
+
+        wanted = set(source_types) if source_types else None
+        scores: Dict[str, float] = {}
+        matched_terms: Dict[str, set] = {}
+        max_score = 0.0
+        for term, query_count in query_counts.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            weight = self.idf(term) * query_count * (k1 + 1)
+            max_score += weight * best_boost
+            for doc_id, field_counts in postings.items():
+                if wanted is not None and self.documents[doc_id].source_type not in wanted:
+                    continue
+                lengths = self._field_lengths[doc_id]
+                boosts = self._doc_boosts[doc_id]
+                score = 0.0
+                for name, count in field_counts.items():
+                    boost = boosts.get(name, self.field_boosts.get(name, 1.0))
+                    norm = 1 - b + b * lengths[name] / average_lengths[name]
+                    score += boost * count / (count + k1 * norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * score
+                matched_terms.setdefault(doc_id, set()).add(term)
+
+        if max_score == 0:
+            return []
+
+        results = []
+        for doc_id, score in heapq.nlargest(top_k, scores.items(), key=lambda item: item[1]):
+            matched = [t for t in query_counts if t in matched_terms[doc_id]]
+            results.append((self.documents[doc_id], min(1.0, score / max_score), matched))
+        return results
 
 
 class EmbeddingIndex:
-    """Index using neural embeddings for semantic search."""
+    """Index using neural embeddings for semantic search.
+
+    Embeddings are held in one contiguous matrix with L2-normalized rows, so a
+    query is a single matrix-vector product. Embeddings are copied into the
+    matrix; chunks passed in are never modified, so pass the vector
+    separately (see add_document) to keep it off the stored chunk.
+    Optionally rows are stored as float16 or int8 to cut memory, and large
+    collections are searched through an approximate IVF index.
+    """
 
-    def __init__(self, embedding_fn: Optional[Callable[[str], List[float]]] = None):
+    # Storage modes for the embedding matrix
+    QUANTIZATION_MODES = (None, "float16", "int8")
+
+    # Rows upcast to float32 per block when searching a quantized matrix
+    _SEARCH_BLOCK_ROWS = 8192
+
+    def __init__(self, embedding_fn: Optional[Callable[[str], List[float]]] = None,
+                 quantization: Optional[str] = None, ann_index: Optional[IVFIndex] = None):
         """Initialize embedding index.
 
         Args:
             embedding_fn: Function that takes text and returns embedding vector
+            quantization: None for float32 rows, or "float16" / "int8"
+            ann_index: Optional IVF index used for approximate search once the
+                collection reaches its min_train_rows
         """
+        if quantization not in self.QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization}")
+
         self.documents: Dict[str, DocumentChunk] = {}
         self.embedding_fn = embedding_fn
+        self.quantization = quantization
         self._embedding_dim: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None  # Rows beyond _count are unused capacity
+        self._count = 0
+        self._row_ids: List[str] = []  # row -> doc_id
+        self._rows: Dict[str, int] = {}  # doc_id -> row
+        self._row_types = np.zeros(0, dtype=np.int32)  # row -> source type code, for filtering
+        self._type_codes: Dict[str, int] = {}  # source type -> code
+        self.ann_index = ann_index
 
     def set_embedding_function(self, fn: Callable[[str], List[float]]):
         """Set the embedding function."""
         self.embedding_fn = fn
 
-    def add_document(self, chunk: DocumentChunk, compute_embedding: bool = True):
-        """Add a document to the index."""
-        if compute_embedding and self.embedding_fn and not chunk.embedding:
-            try:
-                chunk.embedding = self.embedding_fn(chunk.content[:2000])  # Limit length
-                if chunk.embedding and self._embedding_dim is None:
-                    self._embedding_dim = len(chunk.embedding)
-            except Exception as e:
-                print(f"Failed to compute embedding: {e}")
+    def compute_embedding(self, text: str):
+        """Embed document text with the embedding function, or return None."""
+        if not self.embedding_fn:
+            return None
+        try:
+            return self.embedding_fn(text[:2000])  # Limit length
+        except Exception as e:
+            print(f"Failed to compute embedding: {e}")
+            return None
+
+    def add_document(self, chunk: DocumentChunk, compute_embedding: bool = True,
+                     embedding: Optional[Sequence[float]] = None):
+        """Add a document to the index.
+
+        Args:
+            chunk: The document chunk to add; it is not modified
+            compute_embedding: Embed the content if no vector is given
+            embedding: Vector for the chunk, instead of chunk.embedding
+        """
+        if not _has_vector(embedding):
+            embedding = chunk.embedding
+        if compute_embedding and not _has_vector(embedding):
+            embedding = self.compute_embedding(chunk.content)
+
+        self._remove_row(chunk.id)
+        if _has_vector(embedding):
+            self._add_row(chunk.id, embedding, chunk.source_type)
 
         self.documents[chunk.id] = chunk
 
@@ -222,92 +474,398 @@ class EmbeddingIndex:
         """Remove a document from the index."""
         if doc_id in self.documents:
             del self.documents[doc_id]
+            self._remove_row(doc_id)
 
     def clear(self):
         """Clear all documents."""
         self.documents.clear()
+        self._matrix = None
+        self._row_types = np.zeros(0, dtype=np.int32)
+        self._count = 0
+        self._row_ids.clear()
+        self._rows.clear()
+        self._embedding_dim = None
+        if self.ann_index:
+            # Trained centroids stay valid for the next build with the same model
+            self.ann_index.reset_rows()
+
+    def has_embedding(self, doc_id: str) -> bool:
+        """Check whether a document has an embedding in the index."""
+        return doc_id in self._rows
+
+    def get_embedding(self, doc_id: str) -> Optional[np.ndarray]:
+        """Get a document's normalized embedding as float32, or None."""
+        row = self._rows.get(doc_id)
+        if row is None:
+            return None
+        return self._dequantize(self._matrix[row:row + 1])[0]
+
+    @property
+    def embedded_count(self) -> int:
+        """Number of documents with an embedding."""
+        return self._count
+
+    def memory_bytes(self) -> int:
+        """Memory used by the embedding matrix, including spare capacity."""
+        return 0 if self._matrix is None else self._matrix.nbytes
+
+    def embed_query(self, query: str) -> List[float]:
+        """Compute a query's embedding; empty if there is nothing to search or it fails."""
+        if not self.embedding_fn or self._count == 0:
+            return []
 
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Compute cosine similarity between two vectors."""
-        if not vec1 or not vec2 or len(vec1) != len(vec2):
-            return 0.0
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        mag1 = math.sqrt(sum(a * a for a in vec1))
-        mag2 = math.sqrt(sum(b * b for b in vec2))
-
-        if mag1 == 0 or mag2 == 0:
-            return 0.0
-
-        return dot_product / (mag1 * mag2)
+        try:
+            return self.embedding_fn(query)
+        except Exception as e:
+            print(f"Failed to compute query embedding: {e}")
+            return []
 
-    def search(self, query: str, top_k: int = 10) -> List[Tuple[DocumentChunk, float]]:
+    def search(self, query: str, top_k: int = 10,
+               source_types: Optional[List[str]] = None,
+               query_embedding: Optional[Sequence[float]] = None) -> List[Tuple[DocumentChunk, float]]:
         """Search for semantically similar documents.
 
+        Args:
+            query: Search query
+            top_k: Maximum results to return
+            source_types: Only score documents of these source types
+            query_embedding: The query's embedding from embed_query, if
+                already computed
+
         Returns:
             List of (chunk, score) tuples
         """
-        if not self.embedding_fn:
+        if not self.embedding_fn or self._count == 0:
             return []
 
-        try:
-            query_embedding = self.embedding_fn(query)
-        except Exception as e:
-            print(f"Failed to compute query embedding: {e}")
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+        if not _has_vector(query_embedding) or len(query_embedding) != self._embedding_dim:
             return []
 
-        if not query_embedding:
+        query_vector = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+        type_mask = self._type_mask(source_types)
+        if self.prepare_ann():
+            # Score only the rows in the clusters nearest the query
+            rows = self.ann_index.candidate_rows(query_vector, self._count)
+            if type_mask is not None:
+                rows = rows[type_mask[rows]]
+            scores = self._dequantize(self._matrix[rows]) @ query_vector
+        elif type_mask is not None:
+            rows = np.flatnonzero(type_mask)
+            scores = self._dequantize(self._matrix[rows]) @ query_vector
+        else:
+            rows = None
+            scores = self._scores(query_vector)
+
+        # Top k without sorting every score
+        k = min(top_k, len(scores))
+        if k <= 0:
             return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
 
         results = []
-        for chunk in self.documents.values():
-            if chunk.embedding:
-                score = self._cosine_similarity(query_embedding, chunk.embedding)
-                if score > 0.3:  # Semantic similarity threshold
-                    results.append((chunk, score))
+        for i in top:
+            score = float(scores[i])
+            if score <= 0.3:  # Semantic similarity threshold
+                break
+            row = i if rows is None else rows[i]
+            results.append((self.documents[self._row_ids[row]], score))
+        return results
+
+    def prepare_ann(self) -> bool:
+        """Train the ANN index if due, and check whether searches use it."""
+        ann = self.ann_index
+        if not ann or self._count < ann.min_train_rows:
+            return False
+        if ann.needs_training(self._count):
+            ann.train(self._dequantize(self._matrix[:self._count]))
+        return True
+
+    def _type_mask(self, source_types: Optional[List[str]]) -> Optional[np.ndarray]:
+        """Boolean mask of the rows of the given source types, or None for all rows."""
+        if not source_types:
+            return None
+        codes = [self._type_codes[t] for t in source_types if t in self._type_codes]
+        return np.isin(self._row_types[:self._count], codes)
+
+    def _scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query against every stored row."""
+        matrix = self._matrix[:self._count]
+        if self.quantization is None:
+            return matrix @ query_vector
+
+        # Upcast quantized rows block by block to bound temporary memory
+        scores = np.empty(self._count, dtype=np.float32)
+        for start in range(0, self._count, self._SEARCH_BLOCK_ROWS):
+            block = matrix[start:start + self._SEARCH_BLOCK_ROWS]
+            scores[start:start + len(block)] = self._dequantize(block) @ query_vector
+        return scores
+
+    def _add_row(self, doc_id: str, embedding: List[float], source_type: str = "") -> None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._embedding_dim is None:
+            self._embedding_dim = len(vector)
+        elif len(vector) != self._embedding_dim:
+            print(f"Skipping embedding with dimension {len(vector)}, expected {self._embedding_dim}")
+            return
 
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        if self._matrix is None or self._count == len(self._matrix):
+            self._grow()
+
+        vector = self._normalize(vector)
+        self._matrix[self._count] = self._quantize(vector)
+        self._row_types[self._count] = self._type_codes.setdefault(source_type, len(self._type_codes))
+        if self.ann_index:
+            if self.ann_index.trained and self.ann_index.centroids.shape[1] != len(vector):
+                self.ann_index.clear()  # Trained for another embedding model
+            self.ann_index.set_row(self._count, vector)
+        self._rows[doc_id] = self._count
+        self._row_ids.append(doc_id)
+        self._count += 1
+
+    def _remove_row(self, doc_id: str) -> None:
+        """Remove a row by moving the last row into its place."""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+
+        last = self._count - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._row_types[row] = self._row_types[last]
+            if self.ann_index:
+                self.ann_index.move_row(last, row)
+            moved_id = self._row_ids[last]
+            self._row_ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._row_ids.pop()
+        self._count -= 1
+
+    def _grow(self) -> None:
+        """Double the matrix capacity."""
+        capacity = max(64, 2 * self._count)
+        matrix = np.zeros((capacity, self._embedding_dim), dtype=self._storage_dtype())
+        row_types = np.zeros(capacity, dtype=np.int32)
+        if self._matrix is not None:
+            matrix[:self._count] = self._matrix[:self._count]
+            row_types[:self._count] = self._row_types[:self._count]
+        self._matrix = matrix
+        self._row_types = row_types
+
+    def _storage_dtype(self):
+        if self.quantization == "float16":
+            return np.float16
+        if self.quantization == "int8":
+            return np.int8
+        return np.float32
+
+    def _quantize(self, vector: np.ndarray) -> np.ndarray:
+        # Normalized components lie in [-1, 1]
+        if self.quantization == "int8":
+            return np.clip(np.rint(vector * 127), -127, 127).astype(np.int8)
+        return vector.astype(self._storage_dtype())
+
+    def _dequantize(self, rows: np.ndarray) -> np.ndarray:
+        if self.quantization == "int8":
+            return rows.astype(np.float32) / 127
+        return rows.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
 
 
 class SemanticSearchEngine:
     """Unified semantic search engine combining multiple methods."""
 
-    def __init__(self):
+    def __init__(self, embedding_quantization: Optional[str] = None,
+                 ann_index: Optional[IVFIndex] = None):
+        """Initialize search engine.
+
+        Args:
+            embedding_quantization: Embedding storage mode, None (float32),
+                "float16" or "int8"
+            ann_index: Optional IVF index for approximate embedding search
+                over large collections
+        """
         self.tfidf_index = TFIDFIndex()
-        self.embedding_index = EmbeddingIndex()
+        self.bm25_index = BM25Index()
+        self.embedding_index = EmbeddingIndex(quantization=embedding_quantization, ann_index=ann_index)
         self._document_hashes: Dict[str, str] = {}  # Track content changes
+        self.embedding_cache: Optional['EmbeddingCache'] = None
+        self.compute_embeddings = False  # Default for index_document
+        self.embedding_batcher = EmbeddingBatcher()
+
+        # HYBRID search fuses the results of these methods. Each contributes
+        # up to its candidate pool of results (at least top_k), so a document
+        # one method ranks low but the other ranks high can still surface.
+        self.hybrid_methods: Tuple[SearchMethod, ...] = (SearchMethod.BM25, SearchMethod.EMBEDDING)
+        self.candidate_pool: Dict[SearchMethod, int] = {
+            SearchMethod.TFIDF: 50,
+            SearchMethod.BM25: 50,
+            SearchMethod.EMBEDDING: 50,
+        }
 
-    def set_embedding_function(self, fn: Callable[[str], List[float]]):
+    def set_embedding_cache(self, cache: Optional['EmbeddingCache']):
+        """Set a persistent cache consulted before computing embeddings."""
+        self.embedding_cache = cache
+
+    def set_embedding_function(self, fn: Optional[Callable[[str], List[float]]]):
         """Set the embedding function for semantic search."""
         self.embedding_index.set_embedding_function(fn)
+        self.embedding_batcher.embedding_fn = fn
+
+    def set_batch_embedding_function(self, fn: Optional[Callable[[List[str]], List[List[float]]]]):
+        """Set a function that embeds a list of texts in one call.
+
+        Used for indexing instead of the single-text function. If no
+        single-text function is set, queries are embedded as one-text batches.
+        """
+        self.embedding_batcher.batch_embedding_fn = fn
+        if fn and not self.embedding_index.embedding_fn:
+            self.set_embedding_function(lambda text: fn([text])[0])
+
+    def configure_embedding_batches(
+        self,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_requests_per_second: Optional[float] = None
+    ):
+        """Configure batch size, concurrency and rate limit for embedding."""
+        batcher = self.embedding_batcher
+        self.embedding_batcher = EmbeddingBatcher(
+            embedding_fn=batcher.embedding_fn,
+            batch_embedding_fn=batcher.batch_embedding_fn,
+            batch_size=batch_size or batcher.batch_size,
+            max_concurrency=max_concurrency or batcher.max_concurrency,
+            max_requests_per_second=max_requests_per_second
+        )
 
     def _compute_hash(self, content: str) -> str:
         """Compute hash of content for change detection."""
         return hashlib.md5(content.encode()).hexdigest()
 
-    def index_document(self, chunk: DocumentChunk, compute_embedding: bool = False):
+    def index_document(self, chunk: DocumentChunk, compute_embedding: Optional[bool] = None):
         """Index a document for search.
 
         Args:
             chunk: The document chunk to index
-            compute_embedding: Whether to compute neural embeddings (slower)
+            compute_embedding: Whether to compute neural embeddings (slower);
+                defaults to the engine's compute_embeddings setting
         """
-        # Check if content changed
-        content_hash = self._compute_hash(chunk.content)
-        if chunk.id in self._document_hashes:
-            if self._document_hashes[chunk.id] == content_hash:
-                return  # No change, skip re-indexing
+        self.index_documents([chunk], compute_embedding)
 
-        self._document_hashes[chunk.id] = content_hash
+    def index_documents(
+        self,
+        chunks: List[DocumentChunk],
+        compute_embedding: Optional[bool] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        """Index several documents, computing their embeddings in batches.
 
-        # Add to both indices
-        self.tfidf_index.add_document(chunk)
-        self.embedding_index.add_document(chunk, compute_embedding)
+        Args:
+            chunks: The document chunks to index
+            compute_embedding: Whether to compute neural embeddings (slower);
+                defaults to the engine's compute_embeddings setting
+            progress_callback: Optional callback(done, total) as embeddings
+                are computed
+
+        Returns:
+            Number of chunks that were new or changed and got (re)indexed
+        """
+        prepared = self.prepare_documents(chunks, compute_embedding, progress_callback)
+        self.apply_documents(prepared)
+        return len(prepared)
+
+    def prepare_documents(
+        self,
+        chunks: List[DocumentChunk],
+        compute_embedding: Optional[bool] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[Tuple[DocumentChunk, str, Optional[Sequence[float]]]]:
+        """Find the new or changed chunks and compute their embeddings.
+
+        This is the slow half of index_documents(). It does not modify the
+        indices or the chunks, so searches can keep running while it works;
+        pass the result to apply_documents() to index the chunks.
+
+        Returns:
+            (chunk, content hash, embedding or None) for each chunk that
+            needs (re)indexing
+        """
+        if compute_embedding is None:
+            compute_embedding = self.compute_embeddings
+        compute_embedding = compute_embedding and self.embedding_batcher.available
+
+        changed = []
+        for chunk in chunks:
+            # Check if content changed
+            content_hash = self._compute_hash(chunk.content)
+            if self._document_hashes.get(chunk.id) == content_hash:
+                continue  # No change, skip re-indexing
+            changed.append((chunk, content_hash))
+        embeddings = [chunk.embedding for chunk, _ in changed]
+
+        if compute_embedding:
+            # Reuse cached embeddings for unchanged text before calling the provider
+            cache = self.embedding_cache
+            missing = []
+            for i, (chunk, content_hash) in enumerate(changed):
+                if _has_vector(embeddings[i]):
+                    continue
+                cached = cache.get(content_hash) if cache is not None else None
+                if cached is not None:
+                    embeddings[i] = cached
+                else:
+                    missing.append(i)
+
+            computed = self.embedding_batcher.embed(
+                [changed[i][0].content for i in missing], progress_callback
+            )
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+                if cache is not None and _has_vector(embedding):
+                    cache.put(changed[i][1], embedding)
+
+        return [(chunk, content_hash, embedding)
+                for (chunk, content_hash), embedding in zip(changed, embeddings)]
+
+    def apply_documents(self, prepared: List[Tuple[DocumentChunk, str, Optional[Sequence[float]]]]):
+        """Add chunks returned by prepare_documents() to the indices."""
+        for chunk, content_hash, embedding in prepared:
+            self._document_hashes[chunk.id] = content_hash
+            # Add to both indices (embeddings already computed)
+            self.tfidf_index.add_document(chunk)
+            self.bm25_index.add_document(chunk)
+            self.embedding_index.add_document(chunk, compute_embedding=False, embedding=embedding)
+
+    def refresh_documents(self, chunks: List[DocumentChunk]):
+        """Update the name and metadata of indexed chunks whose content is unchanged.
+
+        prepare_documents() skips such chunks, but their metadata may still
+        have changed, e.g. the line range of a passage after an edit above it,
+        or its BM25 fields after a rename, which are then re-indexed.
+        """
+        for chunk in chunks:
+            indexed = self.tfidf_index.documents.get(chunk.id)
+            if indexed is None or indexed is chunk:
+                continue
+            if self._document_hashes.get(chunk.id) == self._compute_hash(chunk.content):
+                fields_changed = any(
+                    indexed.metadata.get(key) != chunk.metadata.get(key) for key in ("fields", "field_boosts")
+                )
+                indexed.source_name = chunk.source_name
+                indexed.metadata = chunk.metadata
+                if fields_changed:
+                    self.bm25_index.add_document(indexed)
 
     def remove_document(self, doc_id: str):
         """Remove a document from all indices."""
         self.tfidf_index.remove_document(doc_id)
+        self.bm25_index.remove_document(doc_id)
         self.embedding_index.remove_document(doc_id)
         if doc_id in self._document_hashes:
             del self._document_hashes[doc_id]
@@ -315,6 +873,7 @@ class SemanticSearchEngine:
     def clear(self):
         """Clear all indices."""
         self.tfidf_index.clear()
+        self.bm25_index.clear()
         self.embedding_index.clear()
         self._document_hashes.clear()
 
@@ -323,7 +882,8 @@ class SemanticSearchEngine:
         query: str,
         method: SearchMethod = SearchMethod.HYBRID,
         top_k: int = 10,
-        source_types: Optional[List[str]] = None
+        source_types: Optional[List[str]] = None,
+        query_embedding: Optional[Sequence[float]] = None
     ) -> List[SearchResult]:
         """Search for relevant documents.
 
@@ -331,53 +891,107 @@ class SemanticSearchEngine:
             query: Search query
             method: Search method to use
             top_k: Maximum results to return
-            source_types: Optional filter by source types
+            source_types: Optional filter by source types, applied inside
+                each index so top_k results of those types are returned
+            query_embedding: The query's embedding from embed_query, if
+                already computed
 
         Returns:
             List of SearchResult objects
         """
-        results: List[SearchResult] = []
+        if method != SearchMethod.HYBRID:
+            return self._search_method(method, query, top_k, source_types, query_embedding)
+
+        ranked_lists = [
+            self._search_method(hybrid_method, query,
+                                max(top_k, self.candidate_pool.get(hybrid_method, top_k)),
+                                source_types, query_embedding)
+            for hybrid_method in self.hybrid_methods
+        ]
+        return self._fuse(ranked_lists, top_k)
+
+    def embed_query(self, query: str, method: SearchMethod = SearchMethod.HYBRID) -> Optional[List[float]]:
+        """Compute the query embedding a search with a method uses, or None if it uses none.
+
+        Embedding a query may be a network call; callers that search under a
+        lock compute it first and pass it to search().
+        """
+        methods = self.hybrid_methods if method == SearchMethod.HYBRID else (method,)
+        if SearchMethod.EMBEDDING not in methods:
+            return None
+        return self.embedding_index.embed_query(query)
 
-        if method in (SearchMethod.TFIDF, SearchMethod.KEYWORD, SearchMethod.HYBRID):
-            tfidf_results = self.tfidf_index.search(query, top_k * 2)
-            for chunk, score, matched in tfidf_results:
-                if source_types and chunk.source_type not in source_types:
-                    continue
-                results.append(SearchResult(
-                    chunk=chunk,
-                    score=score,
-                    match_type="tfidf",
-                    matched_terms=matched
-                ))
-
-        if method in (SearchMethod.EMBEDDING, SearchMethod.HYBRID):
-            embed_results = self.embedding_index.search(query, top_k * 2)
-            for chunk, score in embed_results:
-                if source_types and chunk.source_type not in source_types:
-                    continue
-                # Check if already in results
-                existing = next((r for r in results if r.chunk.id == chunk.id), None)
-                if existing:
-                    # Combine scores for hybrid
-                    existing.score = (existing.score + score) / 2
-                    existing.match_type = "hybrid"
+    def _search_method(
+        self,
+        method: SearchMethod,
+        query: str,
+        top_k: int,
+        source_types: Optional[List[str]],
+        query_embedding: Optional[Sequence[float]] = None
+    ) -> List[SearchResult]:
+        """Search with one (non-hybrid) method."""
+        if method in (SearchMethod.TFIDF, SearchMethod.KEYWORD):
+            return [
+                SearchResult(chunk=chunk, score=score, match_type="tfidf", matched_terms=matched)
+                for chunk, score, matched in self.tfidf_index.search(query, top_k, source_types)
+            ]
+        if method == SearchMethod.BM25:
+            return [
+                SearchResult(chunk=chunk, score=score, match_type="bm25", matched_terms=matched)
+                for chunk, score, matched in self.bm25_index.search(query, top_k, source_types)
+            ]
+        if method == SearchMethod.EMBEDDING:
+            return [
+                SearchResult(chunk=chunk, score=score, match_type="semantic")
+                for chunk, score in self.embedding_index.search(query, top_k, source_types, query_embedding)
+            ]
+        return []
+
+    def _fuse(self, ranked_lists: List[List[SearchResult]], top_k: int) -> List[SearchResult]:
+        """Merge result lists of different methods by their calibrated scores.
+
+        Raw scores of different methods are not on a common scale (a BM25
+        score relative to its query's maximum, a cosine), so each list's
+        scores are first divided by that list's best score. A document's
+        fused score is the mean of its calibrated scores over the lists that
+        returned anything, counting 0 where a method did not find it, so
+        documents both methods rank highly come first. Results are ordered
+        by the fused score they report.
+        """
+        fused: Dict[str, SearchResult] = {}
+        totals: Dict[str, float] = {}
+        contributing = 0
+        for results in ranked_lists:
+            best = max((result.score for result in results), default=0.0)
+            if best <= 0:
+                continue
+            contributing += 1
+            for result in results:
+                doc_id = result.chunk.id
+                totals[doc_id] = totals.get(doc_id, 0.0) + result.score / best
+                existing = fused.get(doc_id)
+                if existing is None:
+                    fused[doc_id] = SearchResult(
+                        chunk=result.chunk,
+                        score=0.0,
+                        match_type=result.match_type,
+                        matched_terms=list(result.matched_terms)
+                    )
                 else:
-                    results.append(SearchResult(
-                        chunk=chunk,
-                        score=score,
-                        match_type="semantic"
-                    ))
-
-        # Sort by score and return top_k
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:top_k]
+                    existing.match_type = "hybrid"
+                    existing.matched_terms = existing.matched_terms or list(result.matched_terms)
+
+        for doc_id, result in fused.items():
+            result.score = totals[doc_id] / contributing
+        return heapq.nlargest(top_k, fused.values(), key=lambda r: r.score)
 
     def find_similar(
         self,
         text: str,
         exclude_id: Optional[str] = None,
         top_k: int = 5,
-        method: SearchMethod = SearchMethod.HYBRID
+        method: SearchMethod = SearchMethod.HYBRID,
+        query_embedding: Optional[Sequence[float]] = None
     ) -> List[SearchResult]:
         """Find documents similar to the given text.
 
@@ -388,11 +1002,13 @@ class SemanticSearchEngine:
             exclude_id: Optional document ID to exclude from results
             top_k: Maximum results
             method: Search method
+            query_embedding: The text's embedding from embed_query, if
+                already computed
 
         Returns:
             List of similar documents
         """
-        results = self.search(text, method, top_k + 1)
+        results = self.search(text, method, top_k + 1, query_embedding=query_embedding)
 
         # Filter out the source document if provided
         if exclude_id:
@@ -400,6 +1016,18 @@ class SemanticSearchEngine:
 
         return results[:top_k]
 
+    def get_document(self, doc_id: str) -> Optional[DocumentChunk]:
+        """Get an indexed document by id."""
+        return self.tfidf_index.documents.get(doc_id)
+
+    def get_document_ids(self, source_types: Optional[List[str]] = None) -> List[str]:
+        """Get the ids of indexed documents, optionally of some source types only."""
+        documents = self.tfidf_index.documents
+        if source_types is None:
+            return list(documents)
+        wanted = set(source_types)
+        return [doc_id for doc_id, chunk in documents.items() if chunk.source_type in wanted]
+
     def get_document_count(self) -> int:
         """Get total number of indexed documents."""
         return len(self.tfidf_index.documents)
@@ -410,14 +1038,15 @@ class SemanticSearchEngine:
         for chunk in self.tfidf_index.documents.values():
             type_counts[chunk.source_type] = type_counts.get(chunk.source_type, 0) + 1
 
-        embedded_count = sum(
-            1 for chunk in self.embedding_index.documents.values()
-            if chunk.embedding is not None
-        )
+        embedded_count = self.embedding_index.embedded_count
+        ann = self.embedding_index.ann_index
 
         return {
             "total_documents": len(self.tfidf_index.documents),
             "documents_by_type": type_counts,
             "vocab_size": len(self.tfidf_index.vocab),
-            "embedded_documents": embedded_count
+            "embedded_documents": embedded_count,
+            "embedding_memory_bytes": self.embedding_index.memory_bytes(),
+            # Lists searched by the ANN index; 0 until searches train and use it
+            "ann_lists": ann.n_lists if ann and ann.trained and embedded_count >= ann.min_train_rows else 0
         }
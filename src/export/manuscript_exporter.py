@@ -45,8 +45,9 @@ class ManuscriptExporter:
                 doc.add_heading(chapter.title, 1)
 
                 # Chapter content
-                if chapter.content:
-                    doc.add_paragraph(chapter.content)
+                with chapter.open_text_view() as text_view:
+                    if len(text_view):
+                        doc.add_paragraph(text_view.text())
 
                 doc.add_page_break()
 
@@ -89,10 +90,9 @@ class ManuscriptExporter:
                 # Format content
                 content = f'<h1>{chapter.title}</h1>'
                 # Convert plain text to HTML paragraphs
-                paragraphs = chapter.content.split('\n\n')
-                for para in paragraphs:
-                    if para.strip():
-                        content += f'<p>{para.strip()}</p>'
+                with chapter.open_text_view() as text_view:
+                    for para in text_view.iter_paragraphs():
+                        content += f'<p>{para}</p>'
 
                 c.content = content
 
@@ -180,15 +180,12 @@ class ManuscriptExporter:
                 chapter_title = doc.add_heading(chapter.title, 1)
                 chapter_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
-                # Chapter content - double-spaced
-                if chapter.content:
-                    # Split into paragraphs
-                    paragraphs = chapter.content.split('\n\n')
-                    for para in paragraphs:
-                        if para.strip():
-                            p = doc.add_paragraph(para.strip())
-                            # Indent first line
-                            p.paragraph_format.first_line_indent = Inches(0.5)
+                # Chapter content - double-spaced, one paragraph at a time
+                with chapter.open_text_view() as text_view:
+                    for para in text_view.iter_paragraphs():
+                        p = doc.add_paragraph(para)
+                        # Indent first line
+                        p.paragraph_format.first_line_indent = Inches(0.5)
 
                 doc.add_page_break()
 
@@ -642,23 +642,30 @@ class SummaryExporter:
             lines.append(f"### Chapter {chapter.number}: {chapter.title}")
             lines.append(f"*Words: {chapter.word_count:,}*\n")
 
-            if chapter.content:
-                if summarize_chapters and self.summarizer.method != SummarizationMethod.NONE:
-                    # Summarize the chapter
-                    summary = self.summarizer.summarize(
-                        chapter.content,
-                        200,
-                        f"chapter {chapter.number}"
-                    )
-                    lines.append(f"**Summary**: {summary}\n")
+            summarize = summarize_chapters and self.summarizer.method != SummarizationMethod.NONE
+            chapter_text = ""
+            first_paragraph = ""
+            with chapter.open_text_view() as text_view:
+                if summarize:
+                    chapter_text = text_view.text()
                 else:
-                    # Just show first paragraph or excerpt
-                    paragraphs = chapter.content.strip().split('\n\n')
-                    if paragraphs:
-                        excerpt = paragraphs[0][:300]
-                        if len(paragraphs[0]) > 300:
-                            excerpt += "..."
-                        lines.append(f"*Excerpt*: {excerpt}\n")
+                    # Only the first paragraph is needed for the excerpt
+                    first_paragraph = next(text_view.iter_paragraphs(), "")
+
+            if chapter_text:
+                # Summarize the chapter
+                summary = self.summarizer.summarize(
+                    chapter_text,
+                    200,
+                    f"chapter {chapter.number}"
+                )
+                lines.append(f"**Summary**: {summary}\n")
+            elif first_paragraph:
+                # Just show first paragraph or excerpt
+                excerpt = first_paragraph[:300]
+                if len(first_paragraph) > 300:
+                    excerpt += "..."
+                lines.append(f"*Excerpt*: {excerpt}\n")
 
             if chapter.notes:
                 lines.append(f"*Notes*: {chapter.notes[:200]}\n")
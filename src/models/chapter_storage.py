@@ -0,0 +1,137 @@
+"""Chapter storage - Read-only, memory-mapped views of chapter text.
+
+Exporters, analysis and indexing only read chapter text. Reading it through
+Chapter.content materializes the whole chapter as a Python string (and for
+lazily loaded projects pulls it into the resident set), so several consumers
+running together can hold several copies of the manuscript.
+
+A ChapterTextView maps the chapter file read-only instead. Slicing and
+line/paragraph iteration decode only the part being read, and the pages are
+shared with the OS file cache. Chapters whose content differs from the file
+(unsaved edits) get the same interface over an in-memory buffer.
+
+Close views promptly (use them as context managers): on Windows an open
+mapping keeps the file from being replaced by the next save.
+"""
+
+import hashlib
+import mmap
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+
+class ChapterTextView:
+    """Read-only view of chapter text with cheap slicing and iteration.
+
+    Offsets and lengths are in bytes of the UTF-8 encoded text. Line
+    iteration follows str.split('\\n') on the text as read_text() would
+    return it, so line numbers match those of Chapter.content. Like
+    read_text(), full-text and line reads raise UnicodeDecodeError on files
+    that are not valid UTF-8; only slices tolerate characters they cut.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], source: Optional[Path] = None):
+        """Initialize view. Use from_file() or from_text() instead.
+
+        Args:
+            buffer: Encoded text, a bytes object or a read-only mapping
+            source: File the buffer maps, or None for in-memory text
+        """
+        self._buffer = buffer
+        self.source = source
+        self._closed = False
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> 'ChapterTextView':
+        """Map a chapter file read-only."""
+        file_path = Path(file_path)
+        with open(file_path, 'rb') as f:
+            # Empty files cannot be mapped
+            if file_path.stat().st_size == 0:
+                return cls(b"", file_path)
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, file_path)
+
+    @classmethod
+    def from_text(cls, text: str) -> 'ChapterTextView':
+        """Wrap in-memory text, e.g. content with unsaved edits."""
+        return cls(text.encode('utf-8'))
+
+    @property
+    def is_mapped(self) -> bool:
+        """Check whether the view is backed by a memory-mapped file."""
+        return isinstance(self._buffer, mmap.mmap)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __getitem__(self, key: slice) -> str:
+        """Decode a byte range; characters cut by the range are dropped."""
+        if not isinstance(key, slice):
+            raise TypeError("ChapterTextView only supports slicing")
+        return self._decode(self._buffer[key], errors='ignore')
+
+    def text(self) -> str:
+        """Materialize the full text (a copy, for consumers that need one)."""
+        text = self._decode(self._buffer[:])
+        # Match read_text() universal newlines for CRLF files
+        return text.replace("\r\n", "\n") if "\r" in text else text
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield lines without line endings, like text.split('\\n')."""
+        buffer = self._buffer
+        start = 0
+        end = len(buffer)
+        while True:
+            newline = buffer.find(b"\n", start)
+            if newline < 0:
+                yield self._decode(buffer[start:end])
+                return
+            yield self._decode(buffer[start:newline]).rstrip("\r")
+            start = newline + 1
+
+    def iter_paragraphs(self) -> Iterator[str]:
+        """Yield stripped, non-empty paragraphs separated by blank lines."""
+        paragraph = []
+        for line in self.iter_lines():
+            if line.strip():
+                paragraph.append(line)
+            elif paragraph:
+                yield "\n".join(paragraph).strip()
+                paragraph = []
+        if paragraph:
+            yield "\n".join(paragraph).strip()
+
+    def content_hash(self) -> str:
+        """MD5 of the text, matching a hash of the equivalent Chapter.content."""
+        if self._buffer.find(b"\r") < 0:
+            return hashlib.md5(self._buffer).hexdigest()
+
+        # Files written in text mode on Windows hold CRLF line endings
+        digest = hashlib.md5()
+        for i, line in enumerate(self.iter_lines()):
+            if i:
+                digest.update(b"\n")
+            digest.update(line.encode('utf-8'))
+        return digest.hexdigest()
+
+    def close(self) -> None:
+        """Release the mapping."""
+        if not self._closed and self.is_mapped:
+            self._buffer.close()
+        self._buffer = b""
+        self._closed = True
+
+    def __enter__(self) -> 'ChapterTextView':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @staticmethod
+    def _decode(data: bytes, errors: str = 'strict') -> str:
+        return data.decode('utf-8', errors=errors)
@@ -0,0 +1,147 @@
+"""Edit journal - Write-ahead log of unsaved chapter edits.
+
+While a chapter is being edited its content is appended to the journal every
+few seconds, and each record is fsynced. A successful project save truncates
+the records it covered. If the application crashes, the next load replays
+the journal so at most a few seconds of typing are lost.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+from src.models.project_storage import atomic_write_text
+
+
+JOURNAL_FILE = "journal.jsonl"
+
+# Compact the journal to the latest record per chapter past this size
+MAX_JOURNAL_BYTES = 4 * 1024 * 1024
+
+
+class EditJournal:
+    """Append-only journal of chapter content edits not yet saved."""
+
+    def __init__(self, project_dir: Path):
+        """Initialize journal.
+
+        Args:
+            project_dir: Project directory holding the journal file
+        """
+        self.journal_path = Path(project_dir) / JOURNAL_FILE
+        self._lock = threading.Lock()
+        self._last_seq = 0
+        self._size = 0
+
+        for record in self._read_records():
+            self._last_seq = max(self._last_seq, record.get("seq", 0))
+        if self.journal_path.exists():
+            self._size = self.journal_path.stat().st_size
+
+    def __deepcopy__(self, memo) -> 'EditJournal':
+        # A journal is a handle on the project's journal file, which copies of
+        # the project share; a second instance would append without the lock
+        return self
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent record."""
+        return self._last_seq
+
+    def record_chapter_content(self, chapter_id: str, content: str) -> int:
+        """Append the current content of a chapter.
+
+        Args:
+            chapter_id: The chapter ID
+            content: Full chapter content
+
+        Returns:
+            Sequence number of the record
+        """
+        with self._lock:
+            self._last_seq += 1
+            record = {
+                "seq": self._last_seq,
+                "timestamp": datetime.now().isoformat(),
+                "kind": "chapter_content",
+                "chapter_id": chapter_id,
+                "content": content,
+            }
+            line = json.dumps(record) + "\n"
+
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._size += len(line.encode('utf-8'))
+
+            if self._size > MAX_JOURNAL_BYTES:
+                self._rewrite(self._latest_records(self._read_records()))
+            return record["seq"]
+
+    def get_pending_chapters(self) -> Dict[str, str]:
+        """Get the latest journaled content per chapter (chapter_id -> content)."""
+        with self._lock:
+            return {
+                record["chapter_id"]: record["content"]
+                for record in self._latest_records(self._read_records())
+            }
+
+    def has_pending(self) -> bool:
+        """Check whether the journal holds any unsaved edits."""
+        return self.journal_path.exists() and self._size > 0
+
+    def truncate_through(self, seq: int) -> None:
+        """Drop records up to and including seq, e.g. after they were saved.
+
+        Records appended after the save was prepared are kept.
+        """
+        with self._lock:
+            remaining = [r for r in self._read_records() if r.get("seq", 0) > seq]
+            self._rewrite(remaining)
+
+    def clear(self) -> None:
+        """Remove all records."""
+        with self._lock:
+            self._rewrite([])
+
+    def _rewrite(self, records) -> None:
+        """Atomically replace the journal with the given records."""
+        if not records:
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._size = 0
+            return
+
+        text = "".join(json.dumps(record) + "\n" for record in records)
+        atomic_write_text(self.journal_path, text)
+        self._size = len(text.encode('utf-8'))
+
+    @staticmethod
+    def _latest_records(records) -> list:
+        """Keep only the newest record for each chapter, in sequence order."""
+        latest = {}
+        for record in records:
+            latest[record.get("chapter_id")] = record
+        return sorted(latest.values(), key=lambda r: r.get("seq", 0))
+
+    def _read_records(self) -> list:
+        """Read all intact records from the journal."""
+        records = []
+        if not self.journal_path.exists():
+            return records
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash can leave a truncated final record
+                    continue
+                if record.get("kind") == "chapter_content" and "chapter_id" in record:
+                    records.append(record)
+        return records
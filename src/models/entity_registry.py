@@ -0,0 +1,218 @@
+"""Entity registry - Project-wide id index for worldbuilding objects.
+
+Worldbuilding objects refer to each other by string id (faction allies,
+event participants, planet species, map layer members, ...). The registry
+maps every id to its object and records every reference in both directions,
+so ids resolve in O(1), "what references this?" is a dictionary lookup, and
+dangling references can be listed without scanning the whole world.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# Reference fields per entity kind that always hold ids
+REFERENCE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'faction': ('allies', 'enemies'),
+    'planet': ('flora_species', 'fauna_species', 'factions'),
+    'historical_event': ('factions_involved', 'related_events'),
+    'army': ('faction_id', 'allies', 'enemies'),
+    'economy': ('faction_id', 'trade_partners', 'embargoes'),
+    'hierarchy': ('faction_id', 'root_node_id', 'allies', 'enemies'),
+    'hierarchy_node': ('faction', 'parent_id', 'children_ids'),
+    'political_system': ('faction_id',),
+    'government_branch': ('parent_branch_id', 'sub_branches'),
+    'technology': ('factions_with_access', 'inventor_faction', 'prerequisites'),
+    'place': ('contested_by', 'species_present', 'historical_events'),
+    'culture': ('associated_factions', 'neighboring_cultures'),
+    'myth': ('associated_factions',),
+    'map': ('planet_id',),
+    'map_place': ('faction_id',),
+    'map_event': ('associated_factions',),
+    'map_layer': ('place_ids', 'landmark_ids', 'event_ids'),
+}
+
+# Reference fields that may hold either an id or a free-text name. They are
+# indexed when they resolve, but never reported as dangling.
+LOOSE_REFERENCE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'place': ('planet', 'controlling_faction', 'historical_owners', 'connected_places'),
+    'culture': ('associated_planets',),
+    'flora': ('native_planets',),
+    'fauna': ('native_planets',),
+    'map_place': ('linked_elements',),
+    'map_landmark': ('linked_elements',),
+    'map_event': ('linked_elements',),
+}
+
+
+class EntityReference(NamedTuple):
+    """One id reference from a field of one entity to another."""
+    source_id: str
+    source_kind: str
+    field: str
+    target_id: str
+
+
+def iter_worldbuilding_entities(worldbuilding) -> Iterator[Tuple[str, object]]:
+    """Yield (kind, object) for every object with an id in a WorldBuilding."""
+    simple = [
+        ('faction', worldbuilding.factions),
+        ('myth', worldbuilding.myths),
+        ('place', worldbuilding.places),
+        ('climate_preset', worldbuilding.climate_presets),
+        ('technology', worldbuilding.technologies),
+        ('flora', worldbuilding.flora),
+        ('fauna', worldbuilding.fauna),
+        ('star', worldbuilding.stars),
+        ('army', worldbuilding.armies),
+        ('economy', worldbuilding.economies),
+        ('historical_event', worldbuilding.historical_events),
+    ]
+    for kind, items in simple:
+        for item in items:
+            yield kind, item
+
+    for system in worldbuilding.star_systems:
+        yield 'star_system', system
+        for star in system.stars:
+            yield 'star', star
+        for planet in system.planets:
+            yield 'planet', planet
+
+    for culture in worldbuilding.cultures:
+        yield 'culture', culture
+        for collection in (culture.rituals, culture.languages, culture.music_styles,
+                           culture.art_forms, culture.traditions, culture.cuisines):
+            for element in collection:
+                yield 'culture_element', element
+
+    for hierarchy in worldbuilding.hierarchies:
+        yield 'hierarchy', hierarchy
+        for node in hierarchy.nodes:
+            yield 'hierarchy_node', node
+
+    for system in worldbuilding.political_systems:
+        yield 'political_system', system
+        for branch in system.branches:
+            yield 'government_branch', branch
+
+    for world_map in worldbuilding.maps:
+        yield 'map', world_map
+        for place in world_map.places:
+            yield 'map_place', place
+        for landmark in world_map.landmarks:
+            yield 'map_landmark', landmark
+        for event in world_map.events:
+            yield 'map_event', event
+        for layer in world_map.layers:
+            yield 'map_layer', layer
+
+
+class EntityRegistry:
+    """Id index and reverse reference index over worldbuilding objects.
+
+    The registry is a snapshot: build a new one (or let
+    WorldBuilding.get_entity_registry() do so) after the world changes.
+    """
+
+    def __init__(self):
+        self._entities: Dict[str, Tuple[str, object]] = {}  # id -> (kind, object)
+        self._referrers: Dict[str, List[EntityReference]] = {}  # target id -> references to it
+        self._references: Dict[str, List[EntityReference]] = {}  # source id -> references from it
+        self._strict: List[EntityReference] = []  # References that must resolve
+
+    @classmethod
+    def from_worldbuilding(cls, worldbuilding) -> 'EntityRegistry':
+        """Build a registry over every object in a WorldBuilding."""
+        registry = cls()
+        entities = list(iter_worldbuilding_entities(worldbuilding))
+        for kind, entity in entities:
+            registry._register(kind, entity)
+        for kind, entity in entities:
+            registry._index_references(kind, entity)
+        return registry
+
+    @classmethod
+    def from_items(cls, kind: str, items) -> 'EntityRegistry':
+        """Build a registry over one collection, e.g. the factions a builder shows."""
+        registry = cls()
+        items = list(items)
+        for entity in items:
+            registry._register(kind, entity)
+        for entity in items:
+            registry._index_references(kind, entity)
+        return registry
+
+    def get(self, entity_id: Optional[str]):
+        """Get the object with an id, or None."""
+        entry = self._entities.get(entity_id) if entity_id else None
+        return entry[1] if entry else None
+
+    def kind_of(self, entity_id: str) -> Optional[str]:
+        """Get the kind of the object with an id (e.g. 'faction'), or None."""
+        entry = self._entities.get(entity_id)
+        return entry[0] if entry else None
+
+    def get_name(self, entity_id: str, default: Optional[str] = None) -> str:
+        """Get the display name for an id, falling back to default (or the id)."""
+        entity = self.get(entity_id)
+        if entity is None:
+            return default if default is not None else entity_id
+        return getattr(entity, 'name', None) or getattr(entity, 'title', None) or entity_id
+
+    def get_all(self, kind: str) -> List[object]:
+        """Get all registered objects of a kind."""
+        return [entity for entity_kind, entity in self._entities.values() if entity_kind == kind]
+
+    def referrers(self, entity_id: str) -> List[EntityReference]:
+        """Get all references pointing at an id ("what references this?")."""
+        return list(self._referrers.get(entity_id, []))
+
+    def references_from(self, entity_id: str) -> List[EntityReference]:
+        """Get all references held by the object with an id."""
+        return list(self._references.get(entity_id, []))
+
+    def find_dangling(self) -> List[EntityReference]:
+        """Get id references whose target does not exist."""
+        return [ref for ref in self._strict if ref.target_id not in self._entities]
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._entities
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def _register(self, kind: str, entity) -> None:
+        entity_id = getattr(entity, 'id', None)
+        # First object wins if an id is duplicated
+        if entity_id and entity_id not in self._entities:
+            self._entities[entity_id] = (kind, entity)
+
+    def _index_references(self, kind: str, entity) -> None:
+        source_id = getattr(entity, 'id', None)
+        if not source_id:
+            return
+
+        for field, strict in self._reference_fields(kind):
+            for target_id in self._field_ids(getattr(entity, field, None)):
+                if not strict and target_id not in self._entities:
+                    continue
+                ref = EntityReference(source_id, kind, field, target_id)
+                self._referrers.setdefault(target_id, []).append(ref)
+                self._references.setdefault(source_id, []).append(ref)
+                if strict:
+                    self._strict.append(ref)
+
+    @staticmethod
+    def _reference_fields(kind: str) -> Iterator[Tuple[str, bool]]:
+        for field in REFERENCE_FIELDS.get(kind, ()):
+            yield field, True
+        for field in LOOSE_REFERENCE_FIELDS.get(kind, ()):
+            yield field, False
+
+    @staticmethod
+    def _field_ids(value) -> List[str]:
+        if not value:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return [item for item in value if isinstance(item, str) and item]
@@ -1,12 +1,43 @@
 """Project model - Root level encapsulating all writer work."""
 
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field, field_validator
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import Any, List, Dict, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, ValidationError, field_validator, model_serializer
 from datetime import datetime
 from pathlib import Path
+import hashlib
 import json
+import time
 
 from src.models.worldbuilding_objects import Faction, Myth, ClimatePreset, Flora, Fauna, Technology, Star, StarSystem, Place, Culture, Army, Economy, HistoricalEvent, PowerHierarchy, PoliticalSystem, WorldMap
+from src.models.project_storage import (
+    COLLECTION_SHARDS, JSON_FORMAT, SECTION_SHARDS, SHARDED_FORMAT, STORAGE_FORMATS, SavePlan,
+    atomic_write_text, build_manifest, decode_data, detect_format, is_sharded_manifest,
+    merge_shards, shard_file_path, split_shards, write_json
+)
+from src.models.chapter_storage import ChapterTextView
+from src.models.edit_journal import EditJournal
+from src.models.entity_registry import EntityReference, EntityRegistry
+from src.models.revision_store import REVISIONS_DIR, RevisionStore
+
+
+# Fields that change on every save and must not count as a section change
+_VOLATILE_FIELDS = {'updated_at'}
+
+# Version of the on-disk project schema, stamped into every saved project.
+# Files at this version load on a fast path without the repair pass.
+PROJECT_SCHEMA_VERSION = 1
+
+
+def _hash_text(text: str) -> str:
+    """Compute hash of text for change detection."""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def _hash_section(value) -> str:
+    """Compute hash of a JSON-serializable project section."""
+    return _hash_text(json.dumps(value, sort_keys=True, default=str))
 
 
 class WorldBuilding(BaseModel):
@@ -57,6 +88,41 @@ class WorldBuilding(BaseModel):
         """Convert None to empty list for backward compatibility."""
         return v if v is not None else []
 
+    # Id registry over all structured objects, with the collection signature
+    # it was built from
+    _entity_registry: Optional[EntityRegistry] = PrivateAttr(default=None)
+    _registry_signature: Optional[tuple] = PrivateAttr(default=None)
+
+    def get_entity_registry(self) -> EntityRegistry:
+        """Get the id registry, rebuilding it if a collection was replaced or resized.
+
+        Call invalidate_entity_registry() after editing references or nested
+        objects (e.g. planets in a star system) in place.
+        """
+        signature = self._collection_signature()
+        if self._entity_registry is None or signature != self._registry_signature:
+            self._entity_registry = EntityRegistry.from_worldbuilding(self)
+            self._registry_signature = signature
+        return self._entity_registry
+
+    def invalidate_entity_registry(self) -> None:
+        """Drop the id registry so the next lookup rebuilds it."""
+        self._entity_registry = None
+
+    def find_dangling_references(self) -> List[EntityReference]:
+        """Get id references to objects that no longer exist."""
+        self.invalidate_entity_registry()
+        return self.get_entity_registry().find_dangling()
+
+    def _collection_signature(self) -> tuple:
+        collections = (
+            self.factions, self.myths, self.places, self.climate_presets, self.technologies,
+            self.flora, self.fauna, self.stars, self.star_systems, self.cultures, self.armies,
+            self.economies, self.maps, self.historical_events, self.hierarchies,
+            self.political_systems,
+        )
+        return tuple((id(items), len(items)) for items in collections)
+
 
 class Character(BaseModel):
     """Character with full details including image, personality, backstory."""
@@ -139,10 +205,13 @@ class StoryPlanning(BaseModel):
 class ChapterRevision(BaseModel):
     """Revision history for a chapter."""
     revision_number: int
-    content: str
+    content: str = ""  # Empty once the revision is written to the revision store
     timestamp: datetime = Field(default_factory=datetime.now)
     notes: str = ""
 
+    # Whether this revision is persisted in the project's RevisionStore
+    _stored: bool = PrivateAttr(default=False)
+
 
 class Annotation(BaseModel):
     """Annotation/note attached to a specific line in a chapter."""
@@ -195,6 +264,69 @@ class ChapterPlanning(BaseModel):
     timeline_position: str = ""  # When this chapter occurs in story timeline
 
 
+class ChapterResidentSet:
+    """Bounded set of lazily loaded chapters whose content is kept in memory.
+
+    Chapters are tracked in least-recently-used order. When the set grows past
+    its limit, the oldest chapters whose content matches the file on disk are
+    unloaded and will be re-read from their file on next access. Chapters with
+    unsaved edits are never unloaded.
+    """
+
+    def __init__(self, max_chapters: int = 10):
+        """Initialize resident set.
+
+        Args:
+            max_chapters: Maximum number of clean chapters to keep loaded
+        """
+        self.max_chapters = max_chapters
+        self._chapters: OrderedDict[str, 'Chapter'] = OrderedDict()  # chapter_id -> chapter
+        self._suspended = 0
+
+    @contextmanager
+    def suspend_eviction(self):
+        """Keep every loaded chapter resident, e.g. while chapter files are rewritten."""
+        self._suspended += 1
+        try:
+            yield
+        finally:
+            self._suspended -= 1
+            if not self._suspended:
+                self._evict(keep_id=None)
+
+    def touch(self, chapter: 'Chapter') -> None:
+        """Mark chapter content as recently used, evicting old chapters if needed."""
+        self._chapters[chapter.id] = chapter
+        self._chapters.move_to_end(chapter.id)
+        self._evict(keep_id=chapter.id)
+
+    def discard(self, chapter_id: str) -> None:
+        """Stop tracking a chapter."""
+        self._chapters.pop(chapter_id, None)
+
+    def _evict(self, keep_id: Optional[str]) -> None:
+        """Unload least recently used clean chapters until within the limit."""
+        excess = len(self._chapters) - self.max_chapters
+        if excess <= 0 or self._suspended:
+            return
+
+        for chapter_id in list(self._chapters):
+            if excess <= 0:
+                break
+            if chapter_id == keep_id:
+                continue
+            chapter = self._chapters[chapter_id]
+            if not chapter.is_content_loaded():
+                del self._chapters[chapter_id]
+                excess -= 1
+            elif chapter.unload_content():
+                del self._chapters[chapter_id]
+                excess -= 1
+
+    def __len__(self) -> int:
+        return len(self._chapters)
+
+
 class Chapter(BaseModel):
     """Chapter unit for manuscript."""
     id: str
@@ -213,6 +345,40 @@ class Chapter(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
+    # Content hash and file path as last written to / read from disk
+    _saved_content_hash: Optional[str] = PrivateAttr(default=None)
+    _saved_file_path: Optional[str] = PrivateAttr(default=None)
+    _saved_project_dir: Optional[Path] = PrivateAttr(default=None)
+
+    # Lazy loading: directory to read content from and the shared resident set
+    _project_dir: Optional[Path] = PrivateAttr(default=None)
+    _resident_set: Optional[ChapterResidentSet] = PrivateAttr(default=None)
+
+    # Where stored revision content is reconstructed from
+    _revision_store: Optional[RevisionStore] = PrivateAttr(default=None)
+
+    def __getattr__(self, name: str):
+        # Only reached for 'content' when it was deferred by a lazy project load
+        if name == 'content' and self._resident_set is not None:
+            return self._load_deferred_content()
+        return super().__getattr__(name)
+
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+        if name == 'content' and self._resident_set is not None:
+            self._resident_set.touch(self)
+
+    @model_serializer(mode='wrap')
+    def _serialize_with_content(self, handler, info):
+        # Deferred content is missing from __dict__ and would be silently left
+        # out, so read it first unless the caller excluded it
+        if not self.is_content_loaded():
+            included = info.include is None or 'content' in info.include
+            excluded = info.exclude is not None and 'content' in info.exclude
+            if included and not excluded:
+                self._load_deferred_content()
+        return handler(self)
+
     def add_revision(self, notes: str = ""):
         """Save current content as a revision."""
         revision = ChapterRevision(
@@ -222,6 +388,45 @@ class Chapter(BaseModel):
         )
         self.revisions.append(revision)
 
+    def get_revision_content(self, revision_number: int) -> Optional[str]:
+        """Get the full content of a revision, reconstructing it if stored.
+
+        Args:
+            revision_number: The revision number
+
+        Returns:
+            Revision content, or None if the revision does not exist
+        """
+        revision = next(
+            (r for r in self.revisions if r.revision_number == revision_number),
+            None
+        )
+        if revision is None:
+            return None
+        if revision._stored and self._revision_store is not None:
+            return self._revision_store.get_content(self.id, revision_number)
+        return revision.content
+
+    def attach_revision_store(self, store: RevisionStore) -> None:
+        """Use a revision store, replacing inline revisions with its metadata."""
+        self._revision_store = store
+        if not store.has_chapter(self.id):
+            return
+
+        stored = []
+        for meta in store.get_revisions(self.id):
+            revision = ChapterRevision(**meta)
+            revision._stored = True
+            stored.append(revision)
+        self.revisions = stored
+
+    def mark_revisions_stored(self, store: RevisionStore, revisions: List[ChapterRevision]) -> None:
+        """Record that revisions were appended to the store and drop their content."""
+        self._revision_store = store
+        for revision in revisions:
+            revision._stored = True
+            revision.content = ""
+
     def load_content_from_file(self, project_dir: Path) -> bool:
         """Load chapter content from external file."""
         if not self.file_path:
@@ -230,20 +435,165 @@ class Chapter(BaseModel):
         full_path = project_dir / self.file_path
         if full_path.exists():
             self.content = full_path.read_text(encoding='utf-8')
+            self._mark_content_saved(project_dir=project_dir)
             return True
         return False
 
-    def save_content_to_file(self, project_dir: Path) -> bool:
-        """Save chapter content to external file."""
+    def defer_content(self, project_dir: Path, resident_set: ChapterResidentSet) -> bool:
+        """Leave content on disk until first access instead of loading it now.
+
+        Args:
+            project_dir: Project directory containing the chapter file
+            resident_set: Resident set bounding how many chapters stay loaded
+
+        Returns:
+            True if content was deferred, False if there is no file to load from
+        """
+        if not self.file_path or not (project_dir / self.file_path).exists():
+            return False
+
+        self._project_dir = project_dir
+        self._resident_set = resident_set
+        self._saved_file_path = self.file_path
+        self._saved_project_dir = project_dir
+        self._saved_content_hash = None
+        self.__dict__.pop('content', None)
+        return True
+
+    def is_content_loaded(self) -> bool:
+        """Check whether content is in memory (always True unless deferred)."""
+        return 'content' in self.__dict__
+
+    def unload_content(self) -> bool:
+        """Drop deferred content from memory if it matches the file on disk.
+
+        Returns:
+            True if content was unloaded
+        """
+        if self._resident_set is None or not self.is_content_loaded():
+            return False
+        if self.is_content_dirty():
+            return False
+
+        del self.__dict__['content']
+        return True
+
+    def _load_deferred_content(self) -> str:
+        """Read deferred content from the chapter file on first access."""
+        content = ""
+        full_path = self._project_dir / self.file_path if self._project_dir and self.file_path else None
+        if full_path is not None and full_path.exists():
+            content = full_path.read_text(encoding='utf-8')
+
+        self.__dict__['content'] = content
+        if full_path is not None:
+            self._saved_content_hash = _hash_text(content)
+        self._resident_set.touch(self)
+        return content
+
+    def deferred_file_path(self) -> Optional[Path]:
+        """Get the file deferred content will be read from, without touching the disk.
+
+        Returns:
+            The chapter file, or None if the content is in memory
+        """
+        if self.is_content_loaded() or not self._project_dir or not self.file_path:
+            return None
+        return self._project_dir / self.file_path
+
+    def open_text_view(self) -> ChapterTextView:
+        """Open a read-only view of the content for streaming consumers.
+
+        The view maps the chapter file when it holds the current content, so
+        reading does not load (or copy) the chapter into memory. Otherwise
+        it wraps the in-memory content. Close the view when done.
+        """
+        saved_path = (self._saved_project_dir / self._saved_file_path
+                      if self._saved_project_dir and self._saved_file_path else None)
+
+        if saved_path is not None and saved_path.exists():
+            if not self.is_content_loaded():
+                return ChapterTextView.from_file(saved_path)
+            if (self._saved_content_hash is not None
+                    and _hash_text(self.content) == self._saved_content_hash):
+                return ChapterTextView.from_file(saved_path)
+
+        return ChapterTextView.from_text(self.content)
+
+    def target_file_path(self) -> str:
+        """Get the relative chapter file path for the current chapter number."""
+        return f"chapters/chapter_{self.number:03d}.md"
+
+    def save_content_to_file(self, project_dir: Path, force: bool = False,
+                             plan: Optional[SavePlan] = None) -> bool:
+        """Save chapter content to external file.
+
+        The write is skipped when neither the content nor the target path
+        changed since the chapter was last saved or loaded.
+
+        Args:
+            project_dir: Project directory containing the chapters folder
+            force: Write the file even if nothing changed
+            plan: If given, queue the write on this plan instead of writing now
+
+        Returns:
+            True if the file was written (or queued)
+        """
+        target_path = self.target_file_path()
+        full_path = project_dir / target_path
+
+        # Deferred content must be read from its current file before moving it
+        if not self.is_content_loaded() and (
+                force or target_path != self.file_path or project_dir != self._project_dir
+                or not full_path.exists()):
+            self._load_deferred_content()
+
         # Always regenerate file path based on current chapter number
         # This ensures reordered chapters save to the correct files
-        self.file_path = f"chapters/chapter_{self.number:03d}.md"
+        self.file_path = target_path
 
-        full_path = project_dir / self.file_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(self.content, encoding='utf-8')
+        if (not force and not self.is_content_dirty()
+                and project_dir == self._saved_project_dir and full_path.exists()):
+            return False
+
+        content = self.content
+        content_hash = _hash_text(content)
+
+        def mark_saved():
+            self._mark_content_saved(content_hash, target_path, project_dir)
+
+        if plan is None:
+            atomic_write_text(full_path, content)
+            mark_saved()
+        else:
+            plan.add_text(full_path, content)
+            plan.on_commit(mark_saved)
         return True
 
+    def is_content_dirty(self) -> bool:
+        """Check whether content or file path changed since the last save or load."""
+        if self.file_path != self._saved_file_path:
+            return True
+        if not self.is_content_loaded():
+            return False
+        if self._saved_content_hash is None:
+            return True
+        return _hash_text(self.content) != self._saved_content_hash
+
+    def _mark_content_saved(self, content_hash: Optional[str] = None,
+                            file_path: Optional[str] = None,
+                            project_dir: Optional[Path] = None) -> None:
+        """Record which content and file path match the file on disk.
+
+        Defaults to the current content and file path.
+        """
+        self._saved_content_hash = content_hash if content_hash is not None else _hash_text(self.content)
+        self._saved_file_path = file_path if file_path is not None else self.file_path
+        if project_dir is not None:
+            self._saved_project_dir = project_dir
+            if self._resident_set is not None:
+                self._project_dir = project_dir
+
     def load_plan_from_file(self, project_dir: Path) -> bool:
         """Load chapter plan from external file."""
         if not self.plan_file_path:
@@ -261,8 +611,7 @@ class Chapter(BaseModel):
         self.plan_file_path = f"chapters/plans/chapter_{self.number:03d}_plan.md"
 
         full_path = project_dir / self.plan_file_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(self.plan, encoding='utf-8')
+        atomic_write_text(full_path, self.plan)
         return True
 
 
@@ -275,6 +624,103 @@ class Manuscript(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
+    # Bounds memory used by lazily loaded chapter content (None when loaded eagerly)
+    _resident_set: Optional[ChapterResidentSet] = PrivateAttr(default=None)
+
+    # Chapter id / number -> position in chapters. Rebuilt by the chapter
+    # methods below; entries are verified on lookup, and direct edits that
+    # add, remove or replace the chapters list are detected by its
+    # (identity, length) signature. Changing a chapter's id or number in
+    # place needs reindex_chapters() for lookups by the new value.
+    _id_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _number_index: Dict[int, int] = PrivateAttr(default_factory=dict)
+    _index_signature: Optional[Tuple[int, int]] = PrivateAttr(default=None)
+
+    def get_chapter(self, chapter_id: str) -> Optional[Chapter]:
+        """Get a chapter by ID."""
+        position = self.index_of(chapter_id)
+        return self.chapters[position] if position >= 0 else None
+
+    def get_chapter_by_number(self, number: int) -> Optional[Chapter]:
+        """Get a chapter by its chapter number."""
+        position = self._lookup('number', number)
+        return self.chapters[position] if position >= 0 else None
+
+    def index_of(self, chapter_id: str) -> int:
+        """Get the position of a chapter in chapters, or -1 if not found."""
+        return self._lookup('id', chapter_id)
+
+    def add_chapter(self, chapter: Chapter) -> None:
+        """Append a chapter."""
+        if self._index_signature != self._chapters_signature():
+            self.reindex_chapters()
+        self.chapters.append(chapter)
+        self._id_index.setdefault(chapter.id, len(self.chapters) - 1)
+        self._number_index.setdefault(chapter.number, len(self.chapters) - 1)
+        self._index_signature = self._chapters_signature()
+
+    def insert_chapter(self, position: int, chapter: Chapter) -> None:
+        """Insert a chapter at a position (chapter numbers are not changed)."""
+        self.chapters.insert(position, chapter)
+        self.reindex_chapters()
+
+    def remove_chapter(self, chapter_id: str) -> Optional[Chapter]:
+        """Remove a chapter by ID.
+
+        Returns:
+            The removed chapter, or None if not found
+        """
+        position = self.index_of(chapter_id)
+        if position < 0:
+            return None
+
+        chapter = self.chapters.pop(position)
+        if self._resident_set is not None:
+            self._resident_set.discard(chapter_id)
+        self.reindex_chapters()
+        return chapter
+
+    def move_chapter(self, from_position: int, to_position: int) -> None:
+        """Move a chapter to another position (chapter numbers are not changed)."""
+        chapter = self.chapters.pop(from_position)
+        self.chapters.insert(to_position, chapter)
+        self.reindex_chapters()
+
+    def renumber_chapters(self) -> None:
+        """Number chapters sequentially in their current order."""
+        for i, chapter in enumerate(self.chapters, 1):
+            chapter.number = i
+        self.reindex_chapters()
+
+    def reindex_chapters(self) -> None:
+        """Rebuild the chapter id and number indexes."""
+        self._id_index = {}
+        self._number_index = {}
+        for i, chapter in enumerate(self.chapters):
+            # First chapter wins if ids or numbers are duplicated
+            self._id_index.setdefault(chapter.id, i)
+            self._number_index.setdefault(chapter.number, i)
+        self._index_signature = self._chapters_signature()
+
+    def _chapters_signature(self) -> Tuple[int, int]:
+        return (id(self.chapters), len(self.chapters))
+
+    def _lookup(self, attribute: str, key) -> int:
+        """Find a chapter position through an index, rebuilding it if stale."""
+        index = self._id_index if attribute == 'id' else self._number_index
+        position = index.get(key)
+        if position is None:
+            # Unknown keys only rebuild if the chapters list changed directly
+            if self._index_signature == self._chapters_signature():
+                return -1
+        elif (position < len(self.chapters)
+                and getattr(self.chapters[position], attribute) == key):
+            return position
+
+        self.reindex_chapters()
+        index = self._id_index if attribute == 'id' else self._number_index
+        return index.get(key, -1)
+
 
 class GeneratedImage(BaseModel):
     """Generated image for cover art or scene visualization."""
@@ -303,6 +749,12 @@ class ProjectDictionary(BaseModel):
     definitions: Dict[str, str] = Field(default_factory=dict)
 
 
+class _ProjectFileHeader(BaseModel):
+    """Fields read from a project file to choose how to load it."""
+    schema_version: int = 0
+    format: Optional[str] = None
+
+
 class WriterProject(BaseModel):
     """Root project model encapsulating all writer work."""
     name: str
@@ -318,49 +770,445 @@ class WriterProject(BaseModel):
     agent_contacts: List[AgentContact] = Field(default_factory=list)
     dictionary: ProjectDictionary = Field(default_factory=ProjectDictionary)
 
+    # Storage
+    storage_layout: str = "sharded"  # single (one project.json), sharded (manifest + section files); loaded projects keep theirs
+    storage_format: str = JSON_FORMAT  # json, msgpack, msgpack+zstd (manifest stays JSON)
+    schema_version: int = 0  # Stamped with PROJECT_SCHEMA_VERSION on save; 0 = unversioned file
+
     # Metadata
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
-    def save_project(self, file_path: str, save_chapters_separately: bool = True):
+    # Per-section hashes of the project files as last written, for dirty tracking
+    _section_hashes: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _saved_path: Optional[str] = PrivateAttr(default=None)
+    _revision_store: Optional[RevisionStore] = PrivateAttr(default=None)
+    _journal: Optional[EditJournal] = PrivateAttr(default=None)
+    _recovered_chapter_ids: List[str] = PrivateAttr(default_factory=list)
+    _load_stats: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _dangling_references: List[EntityReference] = PrivateAttr(default_factory=list)
+
+    def save_project(self, file_path: str, save_chapters_separately: bool = True) -> bool:
         """Save project to JSON file.
 
+        Only chapter files whose content changed are rewritten. With the
+        sharded layout only section files that changed are rewritten; with the
+        single layout the project file is only rewritten when a section changed.
+        Every file is written atomically.
+
         Args:
             file_path: Path to save the project.json file
             save_chapters_separately: If True, save chapters as separate files
+
+        Returns:
+            True if any file was written
+        """
+        plan = self.prepare_save(file_path, save_chapters_separately)
+        self.commit_save(plan)
+        self.finish_save(plan)
+        return len(plan) > 0
+
+    def prepare_save(self, file_path: str, save_chapters_separately: bool = True) -> SavePlan:
+        """Snapshot changed project data into a plan of file writes.
+
+        Must run on the thread that owns the project (the UI thread). The
+        returned plan can then be written with commit_save() on a background
+        thread while editing continues, and finished with finish_save() back
+        on the UI thread.
+
+        Args:
+            file_path: Path to save the project.json file
+            save_chapters_separately: If True, save chapters as separate files
+
+        Returns:
+            SavePlan holding the writes; empty if nothing changed
         """
-        self.updated_at = datetime.now()
         project_dir = Path(file_path).parent
+        self.project_path = file_path
+        self.schema_version = PROJECT_SCHEMA_VERSION
+        plan = SavePlan()
+        if self._journal is not None:
+            plan.journal_seq = self._journal.last_seq
+
+        resident_set = self.manuscript._resident_set
 
         # Save chapters to separate files if enabled
         if save_chapters_separately:
-            for chapter in self.manuscript.chapters:
-                chapter.save_content_to_file(project_dir)
-                # Clear content from JSON to save space
-                original_content = chapter.content
-                chapter.content = ""  # Will be loaded from file
-
-            # Save project config
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.model_dump(mode='json'), f, indent=2, default=str)
-
-            # Restore content in memory
-            for chapter in self.manuscript.chapters:
-                full_path = project_dir / chapter.file_path
-                if full_path.exists():
-                    chapter.content = full_path.read_text(encoding='utf-8')
+            with resident_set.suspend_eviction() if resident_set else nullcontext():
+                # Read deferred chapters that are about to move before any file is
+                # overwritten, so swapped chapters don't read each other's new file
+                for chapter in self.manuscript.chapters:
+                    if not chapter.is_content_loaded() and (
+                            chapter.file_path != chapter.target_file_path()
+                            or chapter._project_dir != project_dir):
+                        chapter.content
+                for chapter in self.manuscript.chapters:
+                    chapter.save_content_to_file(project_dir, plan=plan)
+            self._queue_revisions(project_dir, plan)
+            manifest, shards = self._dump_sections(include_content=False)
         else:
             # Legacy: save everything in one file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.model_dump(mode='json'), f, indent=2, default=str)
+            with resident_set.suspend_eviction() if resident_set else nullcontext():
+                for chapter in self.manuscript.chapters:
+                    chapter.content  # Load deferred content so it is serialized
+            self._queue_revisions(project_dir, plan)
+            manifest, shards = self._dump_sections(include_content=True)
+
+        section_hashes = self._hash_sections(manifest, shards)
+        if file_path != self._saved_path or not Path(file_path).exists():
+            changed = set(section_hashes)
+        else:
+            changed = {
+                key for key in section_hashes.keys() | self._section_hashes.keys()
+                if section_hashes.get(key) != self._section_hashes.get(key)
+            }
+        if not changed:
+            return plan
+
+        # Track (but still save) references to deleted worldbuilding objects;
+        # the cached registry is only rebuilt when a worldbuilding shard changed
+        if any(key.split('.')[0] == 'worldbuilding' for key in changed):
+            self.worldbuilding.invalidate_entity_registry()
+        self._dangling_references = self.worldbuilding.get_entity_registry().find_dangling()
 
-        self.project_path = file_path
+        self.updated_at = datetime.now()
+        manifest['updated_at'] = self.updated_at.isoformat()
+
+        storage_format = self.storage_format if self.storage_format in STORAGE_FORMATS else JSON_FORMAT
+        if self.storage_layout == 'sharded':
+            for shard_name, shard_data in shards.items():
+                shard_path = project_dir / shard_file_path(shard_name, storage_format)
+                if shard_name in changed or not shard_path.exists():
+                    plan.add_data(shard_path, shard_data, storage_format)
+            manifest = build_manifest(manifest, shards, storage_format)
+            # Manifest last, once every shard it lists is in place
+            plan.add_json(Path(file_path), manifest)
+        else:
+            plan.add_data(Path(file_path), manifest, storage_format)
+
+        def mark_saved():
+            self._section_hashes = section_hashes
+            self._saved_path = file_path
+
+        plan.on_commit(mark_saved)
+        return plan
+
+    def export_json(self, file_path: str, include_chapter_content: bool = True) -> None:
+        """Export the project as a single pretty-printed JSON file.
+
+        Converts projects stored in a binary format back to plain JSON, e.g.
+        for diffing. The export loads as a single-layout JSON project.
+
+        Args:
+            file_path: Destination file
+            include_chapter_content: Inline chapter text instead of relying
+                on the chapter files next to the project
+        """
+        resident_set = self.manuscript._resident_set
+        with resident_set.suspend_eviction() if resident_set else nullcontext():
+            if include_chapter_content:
+                for chapter in self.manuscript.chapters:
+                    chapter.content  # Load deferred content so it is serialized
+            chapter_exclude = {'revisions'} if include_chapter_content else {'content', 'revisions'}
+            data = self.model_dump(
+                mode='json',
+                exclude={'manuscript': {'chapters': {'__all__': chapter_exclude}}}
+            )
+
+        data['storage_layout'] = 'single'
+        data['storage_format'] = JSON_FORMAT
+        data['schema_version'] = PROJECT_SCHEMA_VERSION
+        write_json(Path(file_path), data)
+
+    def commit_save(self, plan: SavePlan) -> None:
+        """Write a prepared save plan; safe to call from a background thread.
+
+        Journaled edits covered by the plan are dropped once it is written.
+        """
+        plan.commit()
+        if plan.journal_seq is not None and self._journal is not None:
+            self._journal.truncate_through(plan.journal_seq)
+
+    def finish_save(self, plan: SavePlan) -> None:
+        """Record a written save plan as saved; call on the UI thread after commit_save()."""
+        plan.finish()
+
+    def get_edit_journal(self) -> Optional[EditJournal]:
+        """Get the write-ahead edit journal for the project's directory."""
+        if not self.project_path:
+            return None
+        project_dir = Path(self.project_path).parent
+        if self._journal is None or self._journal.journal_path.parent != project_dir:
+            self._journal = EditJournal(project_dir)
+        return self._journal
+
+    def journal_chapter_edit(self, chapter_id: str, content: str) -> bool:
+        """Record unsaved chapter content in the edit journal.
+
+        Returns:
+            True if the edit was journaled (the project has been saved before)
+        """
+        journal = self.get_edit_journal()
+        if journal is None:
+            return False
+        journal.record_chapter_content(chapter_id, content)
+        return True
+
+    def replay_journal(self) -> List[str]:
+        """Apply edits left in the journal by a session that did not save.
+
+        Recovered chapters stay dirty, so the next save persists them and
+        truncates the journal.
+
+        Returns:
+            IDs of chapters whose content was recovered
+        """
+        journal = self.get_edit_journal()
+        if journal is None or not journal.has_pending():
+            return []
+
+        recovered = []
+        for chapter_id, content in journal.get_pending_chapters().items():
+            chapter = self.manuscript.get_chapter(chapter_id)
+            if chapter is None or chapter.content == content:
+                continue
+            chapter.content = content
+            chapter.word_count = len(content.split())
+            recovered.append(chapter_id)
+
+        self._recovered_chapter_ids = recovered
+        return recovered
+
+    def get_dangling_references(self) -> List[EntityReference]:
+        """Get worldbuilding references to missing objects found by the last save."""
+        return list(self._dangling_references)
+
+    def get_recovered_chapter_ids(self) -> List[str]:
+        """Get IDs of chapters recovered from the journal when loading."""
+        return list(self._recovered_chapter_ids)
+
+    def get_dirty_sections(self) -> List[str]:
+        """Get names of sections (or shards) changed since the last save."""
+        section_hashes = self._hash_sections(*self._dump_sections(include_content=False))
+        return [
+            key for key, value in section_hashes.items()
+            if self._section_hashes.get(key) != value
+        ]
+
+    def _dump_sections(self, include_content: bool) -> Tuple[dict, Dict[str, object]]:
+        """Serialize project for saving according to its storage layout.
+
+        Args:
+            include_content: Whether chapter content is serialized inline
+
+        Returns:
+            Tuple of (project file data, {shard_name: shard_data}); the shard
+            dict is empty for the single-file layout
+        """
+        # Revisions live in the revision store, never in the project file
+        chapter_exclude = {'revisions'} if include_content else {'content', 'revisions'}
+        data = self.model_dump(
+            mode='json',
+            exclude={'manuscript': {'chapters': {'__all__': chapter_exclude}}}
+        )
+
+        if self.storage_layout == 'sharded':
+            return split_shards(data)
+        return data, {}
+
+    def _queue_revisions(self, project_dir: Path, plan: SavePlan) -> None:
+        """Queue new chapter revisions to be appended to the project's revision store."""
+        revisions_dir = project_dir / REVISIONS_DIR
+        pending = [
+            (chapter, [revision for revision in chapter.revisions if not revision._stored])
+            for chapter in self.manuscript.chapters
+        ]
+        pending = [(chapter, revisions) for chapter, revisions in pending if revisions]
+
+        store = self._revision_store
+        if store is None:
+            store = self._revision_store = RevisionStore(revisions_dir)
+        if not pending and store.revisions_dir == revisions_dir:
+            return
+
+        records = [
+            (chapter.id, revision.revision_number, revision.content, revision.timestamp, revision.notes)
+            for chapter, revisions in pending for revision in revisions
+        ]
+        written = {}
+
+        def append_revisions():
+            target = store
+            if target.revisions_dir != revisions_dir:
+                # Saving to a new location: carry existing history along
+                target = target.copy_to(revisions_dir)
+            for record in records:
+                target.append(*record)
+            if records:
+                target.save_index()
+            written['store'] = target
+
+        def mark_stored():
+            self._revision_store = written['store']
+            for chapter, revisions in pending:
+                chapter.mark_revisions_stored(written['store'], revisions)
+
+        plan.add_task(append_revisions)
+        plan.on_commit(mark_stored)
+
+    @staticmethod
+    def _hash_sections(manifest: dict, shards: Dict[str, object]) -> Dict[str, str]:
+        """Hash each project file field and shard for change detection."""
+        section_hashes = {
+            key: _hash_section(value)
+            for key, value in manifest.items()
+            if key not in _VOLATILE_FIELDS
+        }
+        for shard_name, shard_data in shards.items():
+            section_hashes[shard_name] = _hash_section(shard_data)
+        return section_hashes
 
     @classmethod
-    def load_project(cls, file_path: str) -> 'WriterProject':
-        """Load project from JSON file with backwards compatibility and repair."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    def load_project(cls, file_path: str, lazy: bool = False,
+                     max_resident_chapters: int = 10) -> 'WriterProject':
+        """Load project from JSON file with backwards compatibility and repair.
+
+        Args:
+            file_path: Path to the project.json file
+            lazy: If True, chapter content stays on disk until first accessed.
+                Titles and word counts are still available from metadata.
+            max_resident_chapters: In lazy mode, how many unmodified chapters
+                to keep in memory before unloading the least recently used
+        """
+        start_time = time.perf_counter()
+        project_dir = Path(file_path).parent
+        raw = Path(file_path).read_bytes()
+
+        # Files written by the current version validate straight from bytes
+        project = cls._fast_load(raw, project_dir)
+        fast_path = project is not None
+        if project is None:
+            project = cls._load_with_migration(raw, file_path, project_dir)
+
+        project.project_path = file_path
+
+        # Revision metadata comes from the revision store; revisions still
+        # inline in older project files are moved into it on the next save
+        project._revision_store = RevisionStore(project_dir / REVISIONS_DIR)
+        for chapter in project.manuscript.chapters:
+            chapter.attach_revision_store(project._revision_store)
+
+        # Load chapter content from separate files if they exist
+        if lazy:
+            resident_set = ChapterResidentSet(max_chapters=max_resident_chapters)
+            project.manuscript._resident_set = resident_set
+            for chapter in project.manuscript.chapters:
+                chapter.defer_content(project_dir, resident_set)
+        else:
+            for chapter in project.manuscript.chapters:
+                if chapter.file_path:
+                    chapter.load_content_from_file(project_dir)
+
+        # The files on disk match the loaded sections, so an unchanged project
+        # saves nothing. Migrated projects are left dirty and rewritten in full
+        if fast_path:
+            project._section_hashes = project._hash_sections(*project._dump_sections(include_content=False))
+            project._saved_path = file_path
+
+        # Replay edits journaled after the last successful save (e.g. a crash)
+        project.replay_journal()
+
+        project._load_stats = {
+            "seconds": time.perf_counter() - start_time,
+            "fast_path": fast_path,
+            "schema_version": project.schema_version,
+            "chapters": len(project.manuscript.chapters),
+            "lazy": lazy,
+        }
+        return project
+
+    def get_load_stats(self) -> Dict[str, Any]:
+        """Get timing and path information from the last load_project call."""
+        return dict(self._load_stats)
+
+    @classmethod
+    def _fast_load(cls, raw: bytes, project_dir: Path) -> Optional['WriterProject']:
+        """Validate a current-version project directly from JSON bytes.
+
+        Skips the repair pass. Returns None if the file is from an older
+        version or fails validation, so the caller can fall back to migration.
+        Other errors are bugs and propagate.
+        """
+        try:
+            if detect_format(raw) != JSON_FORMAT:
+                data = decode_data(raw)
+                if _ProjectFileHeader.model_validate(data).schema_version != PROJECT_SCHEMA_VERSION:
+                    return None
+                return cls.model_validate(data)
+
+            header = _ProjectFileHeader.model_validate_json(raw)
+            if header.schema_version != PROJECT_SCHEMA_VERSION:
+                return None
+            if header.format == SHARDED_FORMAT:
+                return cls._fast_load_sharded(json.loads(raw), project_dir)
+            return cls.model_validate_json(raw)
+        except (ValidationError, ValueError) as e:
+            print(f"Warning: Project file failed validation, repairing it: {e}")
+            return None
+
+    @classmethod
+    def _fast_load_sharded(cls, manifest: dict, project_dir: Path) -> Optional['WriterProject']:
+        """Validate each shard of a current-version sharded project from bytes."""
+        sections = {}
+        for shard_name, relative_path in manifest.get('shards', {}).items():
+            shard_path = project_dir / relative_path
+            if not shard_path.exists():
+                return None
+
+            section, _, collection = shard_name.partition('.')
+            if section not in SECTION_SHARDS:
+                return None
+            if collection:
+                if collection not in COLLECTION_SHARDS.get(section, []):
+                    return None
+                annotation = cls.model_fields[section].annotation.model_fields[collection].annotation
+            else:
+                annotation = cls.model_fields[section].annotation
+            adapter = TypeAdapter(annotation)
+            shard_raw = shard_path.read_bytes()
+            if detect_format(shard_raw) == JSON_FORMAT:
+                sections[shard_name] = adapter.validate_json(shard_raw)
+            else:
+                sections[shard_name] = adapter.validate_python(decode_data(shard_raw))
+
+        data = {
+            key: value for key, value in manifest.items()
+            if key not in ('format', 'shards')
+        }
+        for shard_name, value in sections.items():
+            section, _, collection = shard_name.partition('.')
+            if not collection:
+                data[section] = value
+        for shard_name, value in sections.items():
+            section, _, collection = shard_name.partition('.')
+            if collection and section in data:
+                setattr(data[section], collection, value)
+
+        return cls.model_validate(data)
+
+    @classmethod
+    def _load_with_migration(cls, raw: bytes, file_path: str, project_dir: Path) -> 'WriterProject':
+        """Load an older or damaged project file through repair and migration."""
+        data = decode_data(raw)
+
+        # Keep the layout the file was written in; older single-file projects
+        # are not split into section files unless the user opts in
+        storage_layout = 'sharded' if is_sharded_manifest(data) else 'single'
+
+        # Sharded layout: the project file is a manifest of section files
+        if is_sharded_manifest(data):
+            data = merge_shards(data, project_dir)
+        data.setdefault('storage_layout', storage_layout)
 
         # Repair and migrate data before loading
         data = cls._repair_project_data(data, file_path)
@@ -370,15 +1218,7 @@ class WriterProject(BaseModel):
         except Exception as e:
             # If standard loading fails, try field-by-field recovery
             project = cls._recover_project_fields(data, file_path, e)
-
-        project.project_path = file_path
-
-        # Load chapter content from separate files if they exist
-        project_dir = Path(file_path).parent
-        for chapter in project.manuscript.chapters:
-            if chapter.file_path:
-                chapter.load_content_from_file(project_dir)
-
+            project.storage_layout = storage_layout
         return project
 
     @classmethod
@@ -0,0 +1,342 @@
+"""Project storage layouts - Sharded on-disk format for WriterProject.
+
+A sharded project keeps a small manifest at the project file path and stores
+each top-level section (and large nested collections such as maps) in its own
+file under the data directory, so a change to one section only rewrites that
+section's file.
+
+All project files are written atomically: data goes to a temp file in the
+same directory, is fsynced, and then renamed over the target, so a crash
+mid-save leaves either the old or the new file, never a partial one.
+
+Project data can be stored as JSON (default) or in a compact MessagePack
+encoding, optionally zstd-compressed. The binary formats need the optional
+msgpack and zstandard packages; files are recognized by their leading bytes,
+so loading never depends on the project's configured format.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+SHARDS_DIR = "data"
+SHARDED_FORMAT = "sharded"
+
+# Serialization formats for project data files
+JSON_FORMAT = "json"
+MSGPACK_FORMAT = "msgpack"
+MSGPACK_ZSTD_FORMAT = "msgpack+zstd"
+STORAGE_FORMATS = [JSON_FORMAT, MSGPACK_FORMAT, MSGPACK_ZSTD_FORMAT]
+
+FORMAT_EXTENSIONS = {
+    JSON_FORMAT: ".json",
+    MSGPACK_FORMAT: ".msgpack",
+    MSGPACK_ZSTD_FORMAT: ".msgpack.zst",
+}
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Top-level project sections stored in their own shard files
+SECTION_SHARDS = [
+    'worldbuilding',
+    'characters',
+    'story_planning',
+    'manuscript',
+    'generated_images',
+    'agent_contacts',
+    'dictionary',
+]
+
+# Large collections split out of their section into their own shard files
+COLLECTION_SHARDS = {
+    'worldbuilding': ['maps', 'historical_events', 'star_systems', 'factions', 'cultures'],
+}
+
+# Revision shard written by earlier versions; revisions now live in the
+# revision store, this is only read to migrate them
+REVISIONS_SHARD = "manuscript.revisions"
+
+
+def is_sharded_manifest(data: dict) -> bool:
+    """Check whether loaded project data is a sharded manifest."""
+    return isinstance(data, dict) and data.get('format') == SHARDED_FORMAT
+
+
+def shard_file_path(shard_name: str, storage_format: str = JSON_FORMAT) -> str:
+    """Get relative file path for a shard."""
+    return f"{SHARDS_DIR}/{shard_name}{FORMAT_EXTENSIONS[storage_format]}"
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError(
+            "The msgpack package is required for MessagePack project files. "
+            "Install with: pip install msgpack"
+        )
+    return msgpack
+
+
+def _import_zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "The zstandard package is required for compressed project files. "
+            "Install with: pip install zstandard"
+        )
+    return zstandard
+
+
+def detect_format(raw: bytes) -> str:
+    """Detect the serialization format of project file bytes."""
+    if raw.startswith(_ZSTD_MAGIC):
+        return MSGPACK_ZSTD_FORMAT
+    stripped = raw.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if not stripped or stripped[:1] in (b"{", b"["):
+        return JSON_FORMAT
+    return MSGPACK_FORMAT
+
+
+def encode_data(data, storage_format: str) -> bytes:
+    """Serialize JSON-compatible data in the given format."""
+    if storage_format == JSON_FORMAT:
+        return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+    packed = _import_msgpack().packb(data, use_bin_type=True, default=str)
+    if storage_format == MSGPACK_ZSTD_FORMAT:
+        return _import_zstd().ZstdCompressor(level=3).compress(packed)
+    return packed
+
+
+def decode_data(raw: bytes):
+    """Deserialize project file bytes in any supported format."""
+    storage_format = detect_format(raw)
+    if storage_format == JSON_FORMAT:
+        return json.loads(raw)
+
+    if storage_format == MSGPACK_ZSTD_FORMAT:
+        raw = _import_zstd().ZstdDecompressor().decompressobj().decompress(raw)
+    return _import_msgpack().unpackb(raw, raw=False, strict_map_key=False)
+
+
+def split_shards(data: dict) -> Tuple[dict, Dict[str, object]]:
+    """Split serialized project data into a manifest and shard contents.
+
+    Args:
+        data: Project data as produced by model_dump(mode='json')
+
+    Returns:
+        Tuple of (manifest without shard index, {shard_name: shard_data})
+    """
+    manifest = dict(data)
+    shards: Dict[str, object] = {}
+
+    for section in SECTION_SHARDS:
+        if section not in manifest:
+            continue
+        value = manifest.pop(section)
+
+        collections = COLLECTION_SHARDS.get(section, [])
+        if collections and isinstance(value, dict):
+            value = dict(value)
+            for collection in collections:
+                if collection in value:
+                    shards[f"{section}.{collection}"] = value.pop(collection)
+
+        shards[section] = value
+
+    return manifest, shards
+
+
+def build_manifest(manifest: dict, shard_names, storage_format: str = JSON_FORMAT) -> dict:
+    """Add the format marker and shard index to a manifest."""
+    manifest = dict(manifest)
+    manifest['format'] = SHARDED_FORMAT
+    manifest['shards'] = {
+        name: shard_file_path(name, storage_format) for name in sorted(shard_names)
+    }
+    return manifest
+
+
+def merge_shards(manifest: dict, project_dir: Path) -> dict:
+    """Reassemble full project data from a manifest and its shard files.
+
+    Missing or unreadable shards are skipped so that the normal repair pass
+    can fill in defaults for them.
+
+    Args:
+        manifest: Loaded manifest data
+        project_dir: Directory containing the manifest
+
+    Returns:
+        Project data in the same shape as the legacy single-file format
+    """
+    data = {
+        key: value for key, value in manifest.items()
+        if key not in ('format', 'shards')
+    }
+
+    shard_data = {}
+    for shard_name, relative_path in manifest.get('shards', {}).items():
+        shard_path = project_dir / relative_path
+        if not shard_path.exists():
+            continue
+        try:
+            shard_data[shard_name] = decode_data(shard_path.read_bytes())
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read project shard {relative_path}: {e}")
+
+    for section in SECTION_SHARDS:
+        if section in shard_data:
+            data[section] = shard_data[section]
+
+    for section, collections in COLLECTION_SHARDS.items():
+        for collection in collections:
+            shard_name = f"{section}.{collection}"
+            if shard_name in shard_data and isinstance(data.get(section), dict):
+                data[section][collection] = shard_data[shard_name]
+
+    revisions = shard_data.get(REVISIONS_SHARD)
+    manuscript = data.get('manuscript')
+    if isinstance(revisions, dict) and isinstance(manuscript, dict):
+        for chapter in manuscript.get('chapters', []):
+            if isinstance(chapter, dict) and chapter.get('id') in revisions:
+                chapter['revisions'] = revisions[chapter['id']]
+
+    return data
+
+
+def atomic_write_text(file_path: Path, text: str) -> None:
+    """Write text to a file via temp file, fsync and atomic rename."""
+    _atomic_write(file_path, text, binary=False)
+
+
+def atomic_write_bytes(file_path: Path, data: bytes) -> None:
+    """Write bytes to a file via temp file, fsync and atomic rename."""
+    _atomic_write(file_path, data, binary=True)
+
+
+def _atomic_write(file_path: Path, data, binary: bool) -> None:
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        f = os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')
+        with f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(file_path.parent)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a rename by syncing its directory (not supported on Windows)."""
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_json(file_path: Path, data) -> None:
+    """Atomically write data as pretty-printed JSON."""
+    atomic_write_text(file_path, json.dumps(data, indent=2, default=str))
+
+
+def write_data(file_path: Path, data, storage_format: str = JSON_FORMAT) -> None:
+    """Atomically write data in the given serialization format."""
+    if storage_format == JSON_FORMAT:
+        write_json(file_path, data)
+    else:
+        atomic_write_bytes(file_path, encode_data(data, storage_format))
+
+
+class SavePlan:
+    """File writes for one project save, prepared from a snapshot of the project.
+
+    Preparing a plan serializes the model on the calling (UI) thread. The plan
+    only holds independent copies of the data, so commit() does nothing but
+    file I/O and may run on a background thread while editing continues.
+    Bookkeeping that updates the project runs in finish(), back on the
+    project's thread, once everything was written.
+    """
+
+    def __init__(self):
+        self._tasks: List[Callable[[], None]] = []
+        self._writes: List[Tuple[Path, object, Optional[str]]] = []  # (path, data, storage format or None for text)
+        self._on_commit: List[Callable[[], None]] = []
+        self.journal_seq: Optional[int] = None  # Journal records covered by this save
+        self.committed = False
+
+    def add_task(self, task: Callable[[], None]) -> None:
+        """Queue file I/O that is not a whole-file write, e.g. appending to a log.
+
+        Tasks run before the file writes and must not touch the project model.
+        """
+        self._tasks.append(task)
+
+    def add_text(self, file_path: Path, text: str) -> None:
+        """Queue a text file write."""
+        self._writes.append((Path(file_path), text, None))
+
+    def add_json(self, file_path: Path, data) -> None:
+        """Queue a JSON file write; serialization happens during commit."""
+        self._writes.append((Path(file_path), data, JSON_FORMAT))
+
+    def add_data(self, file_path: Path, data, storage_format: str) -> None:
+        """Queue a data file write in the given format; serialized during commit."""
+        self._writes.append((Path(file_path), data, storage_format))
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Register bookkeeping to run in finish() once every file has been written."""
+        self._on_commit.append(callback)
+
+    def commit(self) -> None:
+        """Run queued tasks and write all queued files atomically."""
+        for task in self._tasks:
+            task()
+
+        for file_path, data, storage_format in self._writes:
+            if storage_format is None:
+                atomic_write_text(file_path, data)
+            else:
+                write_data(file_path, data, storage_format)
+        self.committed = True
+
+    def finish(self) -> None:
+        """Run commit callbacks; call on the project's thread after commit().
+
+        Does nothing if the commit did not complete, so a failed save leaves
+        the project marked as unsaved.
+        """
+        if not self.committed:
+            return
+        callbacks, self._on_commit = self._on_commit, []
+        for callback in callbacks:
+            callback()
+
+    def __len__(self) -> int:
+        return len(self._tasks) + len(self._writes)
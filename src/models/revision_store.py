@@ -0,0 +1,226 @@
+"""Revision store - Delta-compressed chapter revision history.
+
+Revisions are kept outside the project file in an append-only log per
+chapter. Each record is either a full base snapshot or a line diff against
+the most recent base snapshot, zlib-compressed. A small index file holds
+revision metadata (number, timestamp, notes) so revision lists can be shown
+without reading any revision content.
+"""
+
+import base64
+import json
+import os
+import shutil
+import zlib
+from difflib import SequenceMatcher
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.models.project_storage import write_json
+
+
+REVISIONS_DIR = "revisions"
+INDEX_FILE = "index.json"
+
+# Store a fresh base snapshot after this many deltas
+BASE_INTERVAL = 20
+
+
+def _encode(payload) -> str:
+    """Compress a JSON-serializable payload to an ASCII string."""
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.b64encode(zlib.compress(raw, 9)).decode('ascii')
+
+
+def _decode(data: str):
+    """Decompress a payload produced by _encode."""
+    return json.loads(zlib.decompress(base64.b64decode(data)).decode('utf-8'))
+
+
+def make_delta(base: str, target: str) -> list:
+    """Build a line diff that turns base into target.
+
+    Returns:
+        List of operations: [start, end] copies base lines start:end,
+        a string inserts that text
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+
+    ops = []
+    matcher = SequenceMatcher(None, base_lines, target_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(target_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(base: str, ops: list) -> str:
+    """Rebuild text from a base and a delta produced by make_delta."""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.append(''.join(base_lines[op[0]:op[1]]))
+    return ''.join(parts)
+
+
+class RevisionStore:
+    """Append-only, delta-compressed storage for chapter revisions."""
+
+    def __init__(self, revisions_dir: Path):
+        """Initialize store.
+
+        Args:
+            revisions_dir: Directory holding the index and per-chapter logs
+        """
+        self.revisions_dir = Path(revisions_dir)
+        self._index: Dict[str, List[dict]] = {}  # chapter_id -> revision metadata
+        self._latest_base: Dict[str, Tuple[int, str, int]] = {}  # chapter_id -> (number, content, deltas since)
+        self._load_index()
+
+    def _index_path(self) -> Path:
+        return self.revisions_dir / INDEX_FILE
+
+    def _log_path(self, chapter_id: str) -> Path:
+        return self.revisions_dir / f"{chapter_id}.log"
+
+    def _load_index(self) -> None:
+        """Load revision metadata index from disk."""
+        index_path = self._index_path()
+        if index_path.exists():
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read revision index: {e}")
+                self._index = {}
+
+    def save_index(self) -> None:
+        """Write revision metadata index to disk."""
+        write_json(self._index_path(), self._index)
+
+    def get_revisions(self, chapter_id: str) -> List[dict]:
+        """Get revision metadata for a chapter, oldest first."""
+        return list(self._index.get(chapter_id, []))
+
+    def has_chapter(self, chapter_id: str) -> bool:
+        """Check whether any revisions are stored for a chapter."""
+        return chapter_id in self._index
+
+    def append(self, chapter_id: str, revision_number: int, content: str,
+               timestamp: datetime, notes: str = "") -> None:
+        """Append a revision to the chapter's log.
+
+        Call save_index() after appending to persist the metadata.
+
+        Args:
+            chapter_id: The chapter ID
+            revision_number: Revision number within the chapter
+            content: Full chapter content at this revision
+            timestamp: When the revision was made
+            notes: Revision notes
+        """
+        # Already appended by a save that failed before it completed
+        if any(meta["revision_number"] == revision_number for meta in self._index.get(chapter_id, [])):
+            return
+
+        base = self._get_latest_base(chapter_id)
+        full_data = _encode(content)
+        record = {"n": revision_number, "kind": "base", "data": full_data}
+
+        if base is not None and base[2] < BASE_INTERVAL:
+            delta_data = _encode(make_delta(base[1], content))
+            # Fall back to a snapshot when the delta saves little
+            if len(delta_data) < len(full_data) // 2:
+                record = {"n": revision_number, "kind": "delta", "base": base[0], "data": delta_data}
+
+        self.revisions_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path(chapter_id), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        if record["kind"] == "base":
+            self._latest_base[chapter_id] = (revision_number, content, 0)
+        else:
+            number, base_content, deltas = base
+            self._latest_base[chapter_id] = (number, base_content, deltas + 1)
+
+        self._index.setdefault(chapter_id, []).append({
+            "revision_number": revision_number,
+            "timestamp": timestamp.isoformat(),
+            "notes": notes,
+        })
+
+    def get_content(self, chapter_id: str, revision_number: int) -> Optional[str]:
+        """Reconstruct the content of a stored revision.
+
+        Returns:
+            Revision content, or None if the revision is not stored
+        """
+        records = self._read_records(chapter_id)
+        record = records.get(revision_number)
+        if record is None:
+            return None
+
+        if record["kind"] == "base":
+            return _decode(record["data"])
+
+        base_record = records.get(record["base"])
+        if base_record is None:
+            return None
+        return apply_delta(_decode(base_record["data"]), _decode(record["data"]))
+
+    def copy_to(self, revisions_dir: Path) -> 'RevisionStore':
+        """Copy all stored revisions to another directory (e.g. on Save As)."""
+        revisions_dir = Path(revisions_dir)
+        if self.revisions_dir.exists() and self.revisions_dir.resolve() != revisions_dir.resolve():
+            shutil.copytree(self.revisions_dir, revisions_dir, dirs_exist_ok=True)
+        return RevisionStore(revisions_dir)
+
+    def _read_records(self, chapter_id: str) -> Dict[int, dict]:
+        """Read all log records for a chapter, keyed by revision number."""
+        log_path = self._log_path(chapter_id)
+        records = {}
+        if not log_path.exists():
+            return records
+
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Skip a truncated trailing record from an interrupted write
+                    continue
+                records[record["n"]] = record
+        return records
+
+    def _get_latest_base(self, chapter_id: str) -> Optional[Tuple[int, str, int]]:
+        """Get (number, content, deltas since) of the chapter's newest base snapshot."""
+        if chapter_id in self._latest_base:
+            return self._latest_base[chapter_id]
+
+        base = None
+        deltas = 0
+        for number, record in sorted(self._read_records(chapter_id).items()):
+            if record["kind"] == "base":
+                base = (number, record["data"])
+                deltas = 0
+            else:
+                deltas += 1
+
+        if base is None:
+            return None
+
+        latest = (base[0], _decode(base[1]), deltas)
+        self._latest_base[chapter_id] = latest
+        return latest
@@ -202,7 +202,7 @@ class AttributionsTab(QWidget):
         self.selected_annotation_id = annotation_id
 
         # Find annotation
-        chapter = next((c for c in self.manuscript.chapters if c.id == chapter_id), None)
+        chapter = self.manuscript.get_chapter(chapter_id)
         if not chapter:
             return
 
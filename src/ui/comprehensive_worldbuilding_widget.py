@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal
 
+from src.models.entity_registry import EntityRegistry
+from src.models.project import WorldBuilding
 from src.ui.worldbuilding.faction_builder import FactionBuilderWidget
 from src.ui.worldbuilding.timeline_builder import TimelineBuilderWidget
 from src.ui.worldbuilding.military_builder import MilitaryBuilderWidget
@@ -26,10 +28,14 @@ class ComprehensiveWorldBuildingWidget(QWidget):
     """Comprehensive worldbuilding with specialized components."""
 
     content_changed = pyqtSignal()
+    section_changed = pyqtSignal(str)  # Search index group that changed
 
     def __init__(self):
         """Initialize comprehensive worldbuilding widget."""
         super().__init__()
+        # Shares the builders' live lists, so its cached id registry stays
+        # valid until a builder reports a change
+        self._registry_view = WorldBuilding()
         self._init_ui()
 
     def _init_ui(self):
@@ -136,6 +142,25 @@ class ComprehensiveWorldBuildingWidget(QWidget):
 
         layout.addWidget(self.tabs)
 
+        # Drop the cached id registry on any change, before other widgets
+        # refresh from it
+        for widget in (
+            self.factions_widget, self.star_systems_widget, self.history_widget,
+            self.military_widget, self.economy_widget, self.hierarchy_widget,
+            self.politics_widget, self.mythology_widget, self.technology_widget,
+            self.climate_preset_widget, self.flora_widget, self.fauna_widget,
+            self.culture_widget, self.places_widget, self.maps_widget,
+        ):
+            widget.content_changed.connect(self._registry_view.invalidate_entity_registry)
+
+        # Resolve cross-entity ids through one registry instead of list scans
+        for widget in (
+            self.factions_widget, self.military_widget, self.economy_widget,
+            self.mythology_widget, self.technology_widget, self.culture_widget,
+            self.places_widget,
+        ):
+            widget.set_entity_registry(self.get_entity_registry)
+
         # Connect faction changes to update other widgets
         self.factions_widget.content_changed.connect(self._update_mythology_factions)
         self.factions_widget.content_changed.connect(self._update_technology_factions)
@@ -157,6 +182,23 @@ class ComprehensiveWorldBuildingWidget(QWidget):
         self.star_systems_widget.content_changed.connect(self._update_places_planets)
         self.star_systems_widget.content_changed.connect(self._update_maps_planets)
 
+        # Report which part of the world changed, so search re-indexes only that
+        for widget, group in (
+            (self.factions_widget, "factions"),
+            (self.star_systems_widget, "star_systems"),
+            (self.history_widget, "historical_events"),
+            (self.military_widget, "armies"),
+            (self.economy_widget, "economies"),
+            (self.politics_widget, "political_systems"),
+            (self.mythology_widget, "myths"),
+            (self.technology_widget, "technologies"),
+            (self.flora_widget, "flora_fauna"),
+            (self.fauna_widget, "flora_fauna"),
+            (self.culture_widget, "cultures"),
+            (self.places_widget, "places"),
+        ):
+            widget.content_changed.connect(lambda group=group: self.section_changed.emit(group))
+
     def _update_mythology_factions(self):
         """Update available factions in mythology widget."""
         factions = self.factions_widget.get_factions()
@@ -272,8 +314,30 @@ class ComprehensiveWorldBuildingWidget(QWidget):
                 planet_names.append(planet.name)
         return planet_names
 
+    def get_entity_registry(self) -> EntityRegistry:
+        """Get the id registry over the objects currently in the builders."""
+        view = self._registry_view
+        view.factions = self.factions_widget.factions
+        view.star_systems = self.star_systems_widget.star_systems
+        view.historical_events = self.history_widget.events
+        view.armies = self.military_widget.armies
+        view.economies = self.economy_widget.economies
+        view.hierarchies = self.hierarchy_widget.hierarchies
+        view.political_systems = self.politics_widget.political_systems
+        view.myths = self.mythology_widget.myths
+        view.technologies = self.technology_widget.technologies
+        view.climate_presets = self.climate_preset_widget.presets
+        view.flora = self.flora_widget.flora_list
+        view.fauna = self.fauna_widget.fauna_list
+        view.cultures = self.culture_widget.cultures
+        view.places = self.places_widget.places_list
+        view.maps = self.maps_widget.maps
+        return view.get_entity_registry()
+
     def load_data(self, worldbuilding):
         """Load worldbuilding data."""
+        self._registry_view.invalidate_entity_registry()
+
         # Load factions first (needed by other widgets)
         if hasattr(worldbuilding, 'factions'):
             self.factions_widget.load_factions(worldbuilding.factions)
@@ -354,8 +418,6 @@ class ComprehensiveWorldBuildingWidget(QWidget):
 
     def get_data(self):
         """Get worldbuilding data."""
-        from src.models.project import WorldBuilding
-
         # Return worldbuilding data structure
         worldbuilding = WorldBuilding(
             factions=self.factions_widget.get_factions(),
@@ -1275,10 +1275,7 @@ class JSONImportDialog(QDialog):
 
             # First try to match by chapter number
             if chapter_num is not None:
-                for ch in chapters:
-                    if ch.number == chapter_num:
-                        target_chapter = ch
-                        break
+                target_chapter = self.current_project.manuscript.get_chapter_by_number(chapter_num)
 
             # Fall back to matching by title
             if not target_chapter and chapter_title:
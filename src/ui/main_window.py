@@ -3,14 +3,17 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QMenuBar, QMenu, QFileDialog, QMessageBox,
-    QToolBar, QStatusBar, QSplitter, QLabel, QSystemTrayIcon
+    QToolBar, QStatusBar, QSplitter, QLabel, QSystemTrayIcon, QApplication
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QPoint
-from PyQt6.QtGui import QAction, QKeySequence, QIcon
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QThread, QTimer
+from PyQt6.QtGui import QAction, QActionGroup, QKeySequence, QIcon
 from pathlib import Path
 from typing import Optional
 
 from src.models.project import WriterProject, Manuscript
+from src.models.project_storage import (
+    JSON_FORMAT, MSGPACK_FORMAT, MSGPACK_ZSTD_FORMAT, SavePlan, encode_data
+)
 from src.ui.comprehensive_worldbuilding_widget import ComprehensiveWorldBuildingWidget
 from src.ui.characters_widget import CharactersWidget
 from src.ui.story_planning_widget import StoryPlanningWidget
@@ -33,6 +36,30 @@ from src.ui.styles import get_modern_style, get_icon
 from src.config import get_ai_config
 
 
+# How often unsaved chapter edits are written to the edit journal
+JOURNAL_INTERVAL_MS = 3000
+
+
+class ProjectSaveWorker(QThread):
+    """Background worker that writes a prepared project save."""
+
+    save_finished = pyqtSignal(object)  # SavePlan
+    error = pyqtSignal(str)
+
+    def __init__(self, project: WriterProject, plan: SavePlan):
+        super().__init__()
+        self.project = project
+        self.plan = plan
+
+    def run(self):
+        """Write the save plan in background."""
+        try:
+            self.project.commit_save(self.plan)
+            self.save_finished.emit(self.plan)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class MainWindow(QMainWindow):
     """Main application window with all features."""
 
@@ -50,6 +77,10 @@ class MainWindow(QMainWindow):
         self.find_dialog: Optional[FindReplaceDialog] = None
         self.replace_dialog: Optional[FindReplaceDialog] = None
 
+        # Background saving: one save in flight, at most one queued behind it
+        self._save_worker: Optional[ProjectSaveWorker] = None
+        self._queued_save: Optional[tuple] = None  # (file_path, show_status)
+
         # Register with window manager
         self.window_manager = WindowManager()
         self.window_manager.set_main_window(self)
@@ -63,6 +94,11 @@ class MainWindow(QMainWindow):
         self._create_status_bar()
         self._setup_system_tray()
 
+        # Periodically journal unsaved chapter edits for crash recovery
+        self._journal_timer = QTimer(self)
+        self._journal_timer.timeout.connect(self._flush_edit_journal)
+        self._journal_timer.start(JOURNAL_INTERVAL_MS)
+
         # Try to load last project, or prompt for new one
         self._startup_load_project()
 
@@ -159,6 +195,40 @@ class MainWindow(QMainWindow):
         save_as_action.triggered.connect(self._save_project_as)
         file_menu.addAction(save_as_action)
 
+        # Per-project serialization format
+        format_menu = file_menu.addMenu("Storage &Format")
+        self.storage_format_actions = {}
+        format_group = QActionGroup(self)
+        for storage_format, label in [
+            (JSON_FORMAT, "&JSON (readable)"),
+            (MSGPACK_FORMAT, "&MessagePack (compact)"),
+            (MSGPACK_ZSTD_FORMAT, "MessagePack + &zstd (smallest)"),
+        ]:
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.triggered.connect(
+                lambda checked, fmt=storage_format: self._set_storage_format(fmt)
+            )
+            format_group.addAction(action)
+            format_menu.addAction(action)
+            self.storage_format_actions[storage_format] = action
+        self.storage_format_actions[JSON_FORMAT].setChecked(True)
+
+        format_menu.addSeparator()
+        self.sharded_layout_action = QAction("Split Into &Section Files", self)
+        self.sharded_layout_action.setCheckable(True)
+        self.sharded_layout_action.setChecked(True)
+        self.sharded_layout_action.setToolTip(
+            "Store each project section in its own file, so saves only rewrite what changed"
+        )
+        self.sharded_layout_action.triggered.connect(self._set_storage_layout)
+        format_menu.addAction(self.sharded_layout_action)
+
+        export_json_action = QAction("Export Project as &JSON...", self)
+        export_json_action.setToolTip("Write the whole project as one readable JSON file, e.g. for diffing")
+        export_json_action.triggered.connect(self._export_project_json)
+        file_menu.addAction(export_json_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction("E&xit", self)
@@ -300,6 +370,12 @@ class MainWindow(QMainWindow):
         """Create status bar."""
         self.statusBar().showMessage("Ready")
 
+        # Search index state, kept visible alongside temporary messages
+        self.index_status_label = QLabel("")
+        self.index_status_label.setStyleSheet("color: #6b7280; padding: 0 8px;")
+        self.statusBar().addPermanentWidget(self.index_status_label)
+        self.manuscript_editor.index_status_changed.connect(self.index_status_label.setText)
+
     def _setup_system_tray(self):
         """Set up the system tray icon and menu."""
         # Check if system tray is available
@@ -373,6 +449,7 @@ class MainWindow(QMainWindow):
         # Check for unsaved changes
         if self.current_project and not self._confirm_unsaved_changes():
             return
+        self._wait_for_pending_save()
 
         # Hide tray icon
         if hasattr(self, 'tray_icon'):
@@ -390,6 +467,15 @@ class MainWindow(QMainWindow):
         self.story_planning_widget.content_changed.connect(self._on_content_changed)
         self.manuscript_editor.content_changed.connect(self._on_content_changed)
 
+        # Tell the search index which parts of the project changed
+        self.worldbuilding_widget.section_changed.connect(self.manuscript_editor.mark_rag_changed)
+        self.characters_widget.content_changed.connect(
+            lambda: self.manuscript_editor.mark_rag_changed("characters")
+        )
+        self.story_planning_widget.content_changed.connect(
+            lambda: self.manuscript_editor.mark_rag_changed("plot", "promises")
+        )
+
         # Connect annotation changes to update attributions tab
         self.manuscript_editor.annotations_changed.connect(self._on_annotations_changed)
 
@@ -407,10 +493,11 @@ class MainWindow(QMainWindow):
 
         if last_path and Path(last_path).exists():
             try:
-                self.current_project = WriterProject.load_project(last_path)
+                self.current_project = WriterProject.load_project(last_path, lazy=True)
                 self._load_project_into_ui()
                 self.project_name_label.setText(self.current_project.name)
-                self.statusBar().showMessage(f"Loaded: {last_path}")
+                self.statusBar().showMessage(f"Loaded: {last_path}{self._format_load_time()}")
+                self._report_recovered_edits()
                 return
             except Exception as e:
                 # Failed to load, will prompt for new project
@@ -457,10 +544,11 @@ class MainWindow(QMainWindow):
 
         if file_path:
             try:
-                self.current_project = WriterProject.load_project(file_path)
+                self.current_project = WriterProject.load_project(file_path, lazy=True)
                 self._load_project_into_ui()
                 self.project_name_label.setText(self.current_project.name)
-                self.statusBar().showMessage(f"Opened: {file_path}")
+                self.statusBar().showMessage(f"Opened: {file_path}{self._format_load_time()}")
+                self._report_recovered_edits()
                 # Remember this project for next startup
                 self.ai_config.set_last_project_path(file_path)
             except Exception as e:
@@ -497,36 +585,179 @@ class MainWindow(QMainWindow):
 
     def _save_to_path(self, file_path: str):
         """Save project to specified path."""
+        self._start_background_save(file_path, show_status=True)
+        # Remember this project for next startup
+        self.ai_config.set_last_project_path(file_path)
+
+    def _auto_save_project(self):
+        """Auto-save project (e.g., when switching chapters).
+
+        Silently saves without showing status messages to avoid interrupting workflow.
+        """
+        if not self.current_project:
+            return
+
+        if self.current_project.project_path:
+            self._start_background_save(self.current_project.project_path, show_status=False)
+
+    def _start_background_save(self, file_path: str, show_status: bool):
+        """Snapshot the project on the UI thread and write it in background.
+
+        If a save is already being written, this one is queued and prepared
+        once the running save finishes.
+        """
+        if self._save_worker is not None and self._save_worker.isRunning():
+            self._queued_save = (file_path, show_status)
+            return
+
         try:
             self._collect_project_data()
-            self.current_project.save_project(file_path)
-            self.statusBar().showMessage(f"Saved: {file_path}")
-            # Remember this project for next startup
-            self.ai_config.set_last_project_path(file_path)
+            plan = self.current_project.prepare_save(file_path)
         except Exception as e:
+            self._on_save_error(str(e), show_status)
+            return
+
+        if not len(plan):
+            # Nothing changed on disk; still drop journaled edits it covers
+            self.current_project.commit_save(plan)
+            self.current_project.finish_save(plan)
+            self._on_save_finished(file_path, show_status)
+            return
+
+        project = self.current_project
+        worker = ProjectSaveWorker(project, plan)
+        # Bookkeeping runs here on the UI thread, which owns the project
+        worker.save_finished.connect(project.finish_save)
+        worker.save_finished.connect(lambda _: self._on_save_finished(file_path, show_status))
+        worker.error.connect(lambda error: self._on_save_error(error, show_status))
+        worker.save_finished.connect(self._run_queued_save)
+        worker.error.connect(self._run_queued_save)
+        self._save_worker = worker
+        worker.start()
+
+    def _on_save_finished(self, file_path: str, show_status: bool):
+        """Handle a completed save."""
+        if show_status:
+            message = f"Saved: {file_path}"
+            dangling = self.current_project.get_dangling_references() if self.current_project else []
+            if dangling:
+                message += f" ({len(dangling)} worldbuilding reference(s) to deleted items)"
+            self.statusBar().showMessage(message)
+        if self.current_project:
+            # Update window title to remove unsaved indicator
+            self.setWindowTitle(f"Writer Platform - {self.current_project.name}")
+
+    def _on_save_error(self, error: str, show_status: bool):
+        """Handle a failed save."""
+        if show_status:
             QMessageBox.critical(
                 self,
                 "Error Saving Project",
-                f"Failed to save project:\n{str(e)}"
+                f"Failed to save project:\n{error}"
             )
+        else:
+            # Log error but don't interrupt user
+            print(f"Auto-save failed: {error}")
+
+    def _run_queued_save(self, *args):
+        """Start the save queued while the previous one was running."""
+        if self._queued_save and self.current_project:
+            file_path, show_status = self._queued_save
+            self._queued_save = None
+            self._start_background_save(file_path, show_status)
+
+    def _wait_for_pending_save(self):
+        """Block until the running background save (and any queued one) is written."""
+        while self._save_worker is not None and self._save_worker.isRunning():
+            self._save_worker.wait()
+            # Deliver the save_finished signal so a queued save starts
+            QApplication.processEvents()
+
+    def _flush_edit_journal(self):
+        """Write unsaved chapter edits to the project's edit journal."""
+        if not self.current_project or not self.current_project.project_path:
+            return
 
-    def _auto_save_project(self):
-        """Auto-save project (e.g., when switching chapters).
+        edit = self.manuscript_editor.take_pending_edit()
+        if edit:
+            try:
+                self.current_project.journal_chapter_edit(*edit)
+            except OSError as e:
+                print(f"Could not write edit journal: {e}")
 
-        Silently saves without showing status messages to avoid interrupting workflow.
-        """
+    def _set_storage_format(self, storage_format: str):
+        """Change the serialization format used for the current project's files."""
         if not self.current_project:
             return
 
-        if self.current_project.project_path:
+        try:
+            # Fails early if the optional msgpack/zstandard packages are missing
+            encode_data({}, storage_format)
+        except ImportError as e:
+            QMessageBox.warning(self, "Storage Format Unavailable", str(e))
+            self.storage_format_actions[self.current_project.storage_format].setChecked(True)
+            return
+
+        if storage_format != self.current_project.storage_format:
+            self.current_project.storage_format = storage_format
+            self._on_content_changed()
+            self.statusBar().showMessage(
+                f"Project will be stored as {storage_format} on next save", 3000
+            )
+
+    def _set_storage_layout(self, sharded: bool):
+        """Switch the current project between one project file and section files."""
+        if not self.current_project:
+            return
+
+        storage_layout = 'sharded' if sharded else 'single'
+        if storage_layout != self.current_project.storage_layout:
+            self.current_project.storage_layout = storage_layout
+            self._on_content_changed()
+            self.statusBar().showMessage(
+                "Project will be split into section files on next save" if sharded
+                else "Project will be stored in one file on next save", 3000
+            )
+
+    def _export_project_json(self):
+        """Export the current project as a single JSON file."""
+        if not self.current_project:
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Project as JSON",
+            f"{self.current_project.name}.json",
+            "JSON Files (*.json);;All Files (*)"
+        )
+
+        if file_path:
             try:
                 self._collect_project_data()
-                self.current_project.save_project(self.current_project.project_path)
-                # Update window title to remove unsaved indicator
-                self.setWindowTitle(f"Writer Platform - {self.current_project.name}")
+                self.current_project.export_json(file_path)
+                self.statusBar().showMessage(f"Exported: {file_path}")
             except Exception as e:
-                # Log error but don't interrupt user
-                print(f"Auto-save failed: {e}")
+                QMessageBox.critical(
+                    self,
+                    "Export Failed",
+                    f"Failed to export project:\n{str(e)}"
+                )
+
+    def _format_load_time(self) -> str:
+        """Format how long the current project took to load, for the status bar."""
+        stats = self.current_project.get_load_stats()
+        if not stats:
+            return ""
+        return f" ({stats['seconds']:.2f}s)"
+
+    def _report_recovered_edits(self):
+        """Tell the user if unsaved edits were recovered from the edit journal."""
+        recovered = self.current_project.get_recovered_chapter_ids()
+        if recovered:
+            self._on_content_changed()
+            self.statusBar().showMessage(
+                f"Recovered unsaved edits in {len(recovered)} chapter(s) from the edit journal"
+            )
 
     def _load_project_into_ui(self):
         """Load current project data into UI widgets."""
@@ -544,6 +775,11 @@ class MainWindow(QMainWindow):
         self.agent_manager.load_data(self.current_project.agent_contacts)
         self.attributions_tab.set_manuscript(self.current_project.manuscript)
 
+        action = self.storage_format_actions.get(self.current_project.storage_format)
+        if action:
+            action.setChecked(True)
+        self.sharded_layout_action.setChecked(self.current_project.storage_layout == 'sharded')
+
         self.project_changed.emit()
 
     def _collect_project_data(self):
@@ -558,6 +794,9 @@ class MainWindow(QMainWindow):
         self.current_project.generated_images = self.image_generator.get_data()
         self.current_project.agent_contacts = self.agent_manager.get_data()
 
+        # The project now holds fresh copies of everything the widgets edit
+        self.manuscript_editor.mark_rag_changed()
+
     def _confirm_unsaved_changes(self) -> bool:
         """Ask user to confirm discarding unsaved changes."""
         reply = QMessageBox.question(
@@ -573,6 +812,10 @@ class MainWindow(QMainWindow):
             self._save_project()
             return True
         elif reply == QMessageBox.StandardButton.Discard:
+            # Discarded edits must not be recovered the next time it opens
+            journal = self.current_project.get_edit_journal()
+            if journal:
+                journal.clear()
             return True
         else:
             return False
@@ -937,22 +1180,19 @@ class MainWindow(QMainWindow):
         self.tab_widget.setCurrentWidget(self.manuscript_editor)
 
         # Find and select the chapter in manuscript editor
-        for i in range(self.manuscript_editor.chapter_list.count()):
-            item = self.manuscript_editor.chapter_list.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == chapter_id:
-                self.manuscript_editor.chapter_list.setCurrentItem(item)
-
-                # Wait for chapter to load, then jump to annotation
-                if self.manuscript_editor.current_chapter_editor:
-                    # Find the annotation to get its line number
-                    annotation = next(
-                        (a for a in self.manuscript_editor.current_chapter_editor.chapter.annotations
-                         if a.id == annotation_id),
-                        None
-                    )
-                    if annotation:
-                        self.manuscript_editor.current_chapter_editor._jump_to_line(annotation.line_number)
-                break
+        if not self.manuscript_editor.select_chapter(chapter_id):
+            return
+
+        # Wait for chapter to load, then jump to annotation
+        if self.manuscript_editor.current_chapter_editor:
+            # Find the annotation to get its line number
+            annotation = next(
+                (a for a in self.manuscript_editor.current_chapter_editor.chapter.annotations
+                 if a.id == annotation_id),
+                None
+            )
+            if annotation:
+                self.manuscript_editor.current_chapter_editor._jump_to_line(annotation.line_number)
 
     def _toggle_multi_window_mode(self, checked: bool):
         """Toggle multi-window mode on/off."""
@@ -1033,6 +1273,7 @@ class MainWindow(QMainWindow):
         if self.current_project and not self._confirm_unsaved_changes():
             event.ignore()
         else:
+            self._wait_for_pending_save()
             # Hide tray icon before closing
             if hasattr(self, 'tray_icon'):
                 self.tray_icon.hide()
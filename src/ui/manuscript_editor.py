@@ -5,11 +5,11 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QTextEdit, QToolBar, QComboBox, QSpinBox,
     QMessageBox, QInputDialog, QGroupBox, QSplitter, QFileDialog,
     QDialog, QMenu, QCheckBox, QLineEdit, QScrollArea, QFrame,
-    QProgressBar, QRadioButton, QButtonGroup, QTabWidget
+    QProgressBar, QRadioButton, QButtonGroup, QTabWidget, QTextBrowser
 )
-from PyQt6.QtCore import pyqtSignal, Qt, QSize
+from PyQt6.QtCore import pyqtSignal, Qt, QSize, QThread, QTimer
 from PyQt6.QtGui import QFont, QTextCursor, QAction, QTextCharFormat, QColor, QPainter
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import uuid
 
 from src.models.project import Manuscript, Chapter, Annotation, ChapterTodo, ChapterPlanning, StoryEvent
@@ -1129,7 +1129,8 @@ Type: {tech.technology_type.value.replace('_', ' ').title() if hasattr(tech.tech
         dialog = SimilaritySearchDialog(
             search_text=text,
             project=self.project,
-            parent=self
+            parent=self,
+            rag_system=self._get_shared_rag_system()
         )
         dialog.exec()
 
@@ -1139,9 +1140,22 @@ Type: {tech.technology_type.value.replace('_', ' ').title() if hasattr(tech.tech
             QMessageBox.warning(self, "No Project", "Please load a project first.")
             return
 
-        dialog = AdvancedSearchDialog(project=self.project, parent=self)
+        dialog = AdvancedSearchDialog(
+            project=self.project,
+            parent=self,
+            rag_system=self._get_shared_rag_system()
+        )
         dialog.exec()
 
+    def _get_shared_rag_system(self):
+        """Get the manuscript editor's search index, brought up to date."""
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, 'get_rag_system'):
+                return parent.get_rag_system()
+            parent = parent.parent()
+        return None
+
     def _save_revision(self):
         """Save current content as a revision."""
         notes, ok = QInputDialog.getText(
@@ -1234,25 +1248,33 @@ Type: {tech.technology_type.value.replace('_', ' ').title() if hasattr(tech.tech
         """Set up context lookup callbacks for RAG system."""
         from src.ai.rag_system import RAGSystem
 
-        # Get memory manager from parent if available
-        memory_manager = None
-        parent = self.parent()
-        while parent:
-            if hasattr(parent, 'memory_manager'):
-                memory_manager = parent.memory_manager
-                break
-            parent = parent.parent()
-
-        # Create RAG system with memory manager for faster lookups
-        rag = RAGSystem(self.project, memory_manager=memory_manager)
+        rag = None
+
+        def get_rag() -> RAGSystem:
+            # Created on first lookup: the editor has no parent yet during setup
+            nonlocal rag
+            if rag is None:
+                # Get memory manager from parent if available
+                memory_manager = None
+                parent = self.parent()
+                while parent:
+                    if hasattr(parent, 'memory_manager'):
+                        memory_manager = parent.memory_manager
+                        break
+                    parent = parent.parent()
+
+                # Share the manuscript editor's search index when there is one
+                rag = RAGSystem(self.project, memory_manager=memory_manager,
+                                engine=self._get_shared_rag_system())
+            return rag
 
         # Define callback functions
         def lookup_worldbuilding(section_name: str) -> str:
-            result = rag.get_quick_reference("worldbuilding", section_name)
+            result = get_rag().get_quick_reference("worldbuilding", section_name)
             return result if result else f"No worldbuilding information found for: {section_name}"
 
         def lookup_characters(character_name: str) -> str:
-            result = rag.get_quick_reference("character", character_name)
+            result = get_rag().get_quick_reference("character", character_name)
             return result if result else f"No character information found for: {character_name}"
 
         def lookup_plot() -> str:
@@ -1281,7 +1303,7 @@ Type: {tech.technology_type.value.replace('_', ' ').title() if hasattr(tech.tech
             return plot_text
 
         def lookup_context(query: str) -> str:
-            return rag.summarize_context(query, max_results=5)
+            return get_rag().summarize_context(query, max_results=5)
 
         def get_character_list() -> list:
             return [c.name for c in self.project.characters]
@@ -1654,12 +1676,39 @@ Type: {tech.technology_type.value.replace('_', ' ').title() if hasattr(tech.tech
         self._update_word_count()
 
 
+class RAGIndexWorker(QThread):
+    """Background worker that indexes a snapshot of project changes.
+
+    The snapshot is taken on the UI thread (see EnhancedRAGSystem.prepare_sync),
+    so the worker never reads the project model; it reads and chunks the
+    chapter files the snapshot points to.
+    """
+
+    progress = pyqtSignal(int, int)  # done, total
+    sync_finished = pyqtSignal(object)  # sync stats
+    error = pyqtSignal(str)
+
+    def __init__(self, rag_system, snapshot):
+        super().__init__()
+        self.rag_system = rag_system
+        self.snapshot = snapshot
+
+    def run(self):
+        """Sync the index in background."""
+        try:
+            stats = self.rag_system.apply_sync(self.snapshot, progress_callback=self.progress.emit)
+            self.sync_finished.emit(stats)
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class ManuscriptEditor(QWidget):
     """Main manuscript editor with chapter navigation."""
 
     content_changed = pyqtSignal()
     annotations_changed = pyqtSignal()  # Signal when any annotation changes
     chapter_switched = pyqtSignal()  # Signal when switching between chapters (triggers auto-save)
+    index_status_changed = pyqtSignal(str)  # Search index status for the status bar
 
     def __init__(self, project=None):
         """Initialize manuscript editor."""
@@ -1668,6 +1717,11 @@ class ManuscriptEditor(QWidget):
         self.project = project
         self.current_chapter_editor: Optional[ChapterEditor] = None
         self._current_chapter_id: Optional[str] = None
+        self._has_pending_edit = False  # Edits not yet written to the edit journal
+        self._rag_chapter_dirty = False  # Current chapter edited since it was last indexed
+        self.rag_system = None  # Search index shared by search dialogs, built on first use
+        self._index_worker: Optional[RAGIndexWorker] = None
+        self._index_resync = False
 
         # Initialize memory manager for chapter caching and key points
         self.memory_manager = ChapterMemoryManager(
@@ -1679,9 +1733,98 @@ class ManuscriptEditor(QWidget):
 
     def set_project(self, project):
         """Set the project for context lookup."""
+        if project is not self.project:
+            self.rag_system = None
         self.project = project
         self.memory_manager.set_project(project)
 
+    def get_rag_system(self):
+        """Get the project search index, starting a sync of any changes.
+
+        The index is returned straight away; searches use its last completed
+        state while the sync runs in the background.
+        """
+        if self._rag_chapter_dirty and self.current_chapter_editor:
+            # Index the open chapter's edits, not just those of closed chapters
+            self.current_chapter_editor.save_to_model()
+            self.mark_chapter_rag_changed(self._current_chapter_id)
+        self.update_rag_index()
+        return self.rag_system
+
+    def update_rag_index(self):
+        """Bring the search index up to date on a background thread."""
+        if not self.project:
+            return
+        if not self.rag_system:
+            try:
+                from src.ai.enhanced_rag import EnhancedRAGSystem
+                self.rag_system = EnhancedRAGSystem(self.project, memory_manager=self.memory_manager)
+            except Exception as e:
+                print(f"Failed to create search index: {e}")
+                return
+
+        if self._index_worker and self._index_worker.isRunning():
+            self._index_resync = True  # Sync again when the running one finishes
+            return
+
+        # Read the changes here, on the UI thread (chapter prose is only
+        # located); the worker chunks and indexes them
+        snapshot = self.rag_system.prepare_sync(compute_embeddings=True)
+        if not snapshot.groups:
+            return
+        worker = RAGIndexWorker(self.rag_system, snapshot)
+        worker.progress.connect(self._on_index_progress)
+        worker.sync_finished.connect(self._on_index_finished)
+        worker.error.connect(self._on_index_error)
+        self._index_worker = worker
+        self._index_resync = False
+        worker.start()
+        self.index_status_changed.emit("Indexing for search...")
+
+    def _on_index_progress(self, done: int, total: int):
+        """Report embedding progress of a background index sync."""
+        self.index_status_changed.emit(f"Indexing for search... {done}/{total}")
+
+    def _on_index_finished(self, stats):
+        """Report the result of a background index sync."""
+        if self.rag_system:
+            status = self.rag_system.get_index_status()
+            self.index_status_changed.emit(f"Search index: {status['documents']} items")
+        if self._index_resync:
+            self.update_rag_index()
+
+    def _on_index_error(self, error: str):
+        """Report a failed background index sync."""
+        print(f"Failed to update search index: {error}")
+        self.index_status_changed.emit("Search index: update failed")
+
+    def mark_rag_changed(self, *groups: str):
+        """Record project changes for the next search index sync.
+
+        Args:
+            groups: Index groups that changed (see enhanced_rag.INDEX_GROUPS);
+                none marks the whole project
+        """
+        if self.rag_system:
+            self.rag_system.mark_changed(*groups)
+
+    def mark_chapter_rag_changed(self, chapter_id: str):
+        """Record that a chapter's text changed, for the next search index sync."""
+        self._rag_chapter_dirty = False
+        if self.rag_system:
+            self.rag_system.mark_chapter_changed(chapter_id)
+
+    def jump_to_chapter_line(self, chapter_id: str, line_number: int) -> bool:
+        """Open a chapter with the cursor on a line (1-based).
+
+        Returns:
+            True if the chapter was found
+        """
+        if not self.select_chapter(chapter_id) or not self.current_chapter_editor:
+            return False
+        self.current_chapter_editor._jump_to_line(line_number)
+        return True
+
     def _init_ui(self):
         """Initialize user interface."""
         layout = QVBoxLayout(self)
@@ -1820,7 +1963,7 @@ class ManuscriptEditor(QWidget):
                 number=chapter_num,
                 title=title
             )
-            self.manuscript.chapters.append(chapter)
+            self.manuscript.add_chapter(chapter)
 
             item = QListWidgetItem(f"{chapter_num}. {title}")
             item.setData(Qt.ItemDataRole.UserRole, chapter.id)
@@ -1858,7 +2001,7 @@ class ManuscriptEditor(QWidget):
                 number=chapter_num,
                 title=title
             )
-            self.manuscript.chapters.insert(current_row, chapter)
+            self.manuscript.insert_chapter(current_row, chapter)
             self._renumber_chapters()
 
             item = QListWidgetItem(f"{chapter_num}. {title}")
@@ -1880,10 +2023,7 @@ class ManuscriptEditor(QWidget):
             return
 
         chapter_id = current_item.data(Qt.ItemDataRole.UserRole)
-        chapter = next(
-            (c for c in self.manuscript.chapters if c.id == chapter_id),
-            None
-        )
+        chapter = self.manuscript.get_chapter(chapter_id)
 
         if not chapter:
             return
@@ -1920,9 +2060,7 @@ class ManuscriptEditor(QWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             chapter_id = current_item.data(Qt.ItemDataRole.UserRole)
-            self.manuscript.chapters = [
-                c for c in self.manuscript.chapters if c.id != chapter_id
-            ]
+            self.manuscript.remove_chapter(chapter_id)
 
             row = self.chapter_list.row(current_item)
             self.chapter_list.takeItem(row)
@@ -1945,8 +2083,7 @@ class ManuscriptEditor(QWidget):
         self.chapter_list.blockSignals(True)
 
         # Swap in manuscript
-        self.manuscript.chapters[current_row], self.manuscript.chapters[current_row - 1] = \
-            self.manuscript.chapters[current_row - 1], self.manuscript.chapters[current_row]
+        self.manuscript.move_chapter(current_row, current_row - 1)
 
         # Rebuild list items to ensure IDs match manuscript order
         self._rebuild_chapter_list()
@@ -1973,8 +2110,7 @@ class ManuscriptEditor(QWidget):
         self.chapter_list.blockSignals(True)
 
         # Swap in manuscript
-        self.manuscript.chapters[current_row], self.manuscript.chapters[current_row + 1] = \
-            self.manuscript.chapters[current_row + 1], self.manuscript.chapters[current_row]
+        self.manuscript.move_chapter(current_row, current_row + 1)
 
         # Rebuild list items to ensure IDs match manuscript order
         self._rebuild_chapter_list()
@@ -1990,16 +2126,16 @@ class ManuscriptEditor(QWidget):
     def _rebuild_chapter_list(self):
         """Rebuild the chapter list from manuscript.chapters to ensure sync."""
         self.chapter_list.clear()
+        self.manuscript.renumber_chapters()
         for i, chapter in enumerate(self.manuscript.chapters, 1):
-            chapter.number = i
             item = QListWidgetItem(f"{i}. {chapter.title}")
             item.setData(Qt.ItemDataRole.UserRole, chapter.id)
             self.chapter_list.addItem(item)
 
     def _renumber_chapters(self):
         """Renumber all chapters sequentially."""
+        self.manuscript.renumber_chapters()
         for i, chapter in enumerate(self.manuscript.chapters, 1):
-            chapter.number = i
             item = self.chapter_list.item(i - 1)
             if item:
                 item.setText(f"{i}. {chapter.title}")
@@ -2015,15 +2151,16 @@ class ManuscriptEditor(QWidget):
             self._update_total_word_count()
             # Notify memory manager of chapter exit (saves state, marks for re-analysis if changed)
             self.memory_manager.on_chapter_exit(self._current_chapter_id, save_content=True)
+            self.mark_rag_changed("chapter_data")
+            if self._rag_chapter_dirty:
+                self.mark_chapter_rag_changed(self._current_chapter_id)
             # Emit signal to trigger project auto-save
             self.chapter_switched.emit()
+            self._has_pending_edit = False
 
         # Load selected chapter
         chapter_id = current.data(Qt.ItemDataRole.UserRole)
-        chapter = next(
-            (c for c in self.manuscript.chapters if c.id == chapter_id),
-            None
-        )
+        chapter = self.manuscript.get_chapter(chapter_id)
 
         if chapter:
             # Notify memory manager of chapter entry (preloads cache, generates summary)
@@ -2053,6 +2190,21 @@ class ManuscriptEditor(QWidget):
         if self._current_chapter_id and self.current_chapter_editor:
             new_content = self.current_chapter_editor.editor.toPlainText()
             self.memory_manager.on_content_changed(self._current_chapter_id, new_content)
+            self._has_pending_edit = True
+            self._rag_chapter_dirty = True
+
+    def take_pending_edit(self) -> Optional[Tuple[str, str]]:
+        """Get the current chapter's content if it changed since the last call.
+
+        Used to feed the project's edit journal.
+
+        Returns:
+            (chapter_id, content) or None if nothing changed
+        """
+        if not self._has_pending_edit or not self._current_chapter_id or not self.current_chapter_editor:
+            return None
+        self._has_pending_edit = False
+        return self._current_chapter_id, self.current_chapter_editor.editor.toPlainText()
 
     def _clear_editor(self):
         """Clear the editor area."""
@@ -2086,11 +2238,34 @@ class ManuscriptEditor(QWidget):
             self.chapter_list.addItem(item)
 
             # Pre-populate cache with chapter content for faster initial load
-            if chapter.content:
+            # (chapters deferred by a lazy project load are read on first access)
+            if chapter.is_content_loaded() and chapter.content:
                 self.memory_manager.cache.put(chapter.id, chapter.content)
 
         self._update_total_word_count()
 
+        # Start the search index once the window has painted; the worker
+        # reads the chapter text, so opening a project does not wait for it
+        QTimer.singleShot(0, self.update_rag_index)
+
+    def select_chapter(self, chapter_id: str) -> bool:
+        """Select a chapter in the chapter list by ID.
+
+        Returns:
+            True if the chapter was found and selected
+        """
+        if not self.manuscript:
+            return False
+
+        # List rows follow manuscript order
+        row = self.manuscript.index_of(chapter_id)
+        item = self.chapter_list.item(row) if row >= 0 else None
+        if item is None or item.data(Qt.ItemDataRole.UserRole) != chapter_id:
+            return False
+
+        self.chapter_list.setCurrentItem(item)
+        return True
+
     def get_manuscript(self) -> Manuscript:
         """Get manuscript data."""
         # Save current chapter
@@ -2435,21 +2610,51 @@ class PromiseCheckDialog(QDialog):
         self.results_text.setHtml("\n".join(lines))
 
 
+def _chapter_link_html(result) -> str:
+    """Link that opens a chapter passage search result in the editor."""
+    if result.source_type != "chapter_prose":
+        return ""
+    chapter_id = result.metadata.get("chapter_id")
+    line = result.metadata.get("start_line", 1)
+    return (f"<p><a href='chapter:{chapter_id}:{line}'>"
+            f"Open in chapter (line {line})</a></p>")
+
+
+def _open_chapter_link(dialog: QDialog, url) -> None:
+    """Open a link made by _chapter_link_html() in the manuscript editor."""
+    target = url.toString()
+    if not target.startswith("chapter:"):
+        return
+    chapter_id, _, line = target[len("chapter:"):].rpartition(":")
+
+    parent = dialog.parent()
+    while parent:
+        if hasattr(parent, 'jump_to_chapter_line'):
+            # Close first: switching chapters replaces the dialog's parent editor
+            dialog.accept()
+            editor = parent
+            QTimer.singleShot(0, lambda: editor.jump_to_chapter_line(chapter_id, int(line)))
+            return
+        parent = parent.parent()
+
+
 class SimilaritySearchDialog(QDialog):
     """Dialog for finding similar content using semantic search."""
 
-    def __init__(self, search_text: str, project, parent=None):
+    def __init__(self, search_text: str, project, parent=None, rag_system=None):
         """Initialize similarity search dialog.
 
         Args:
             search_text: Text to find similar content for
             project: The writer project
             parent: Parent widget
+            rag_system: Optional up-to-date search index to use instead of
+                building one
         """
         super().__init__(parent)
         self.search_text = search_text
         self.project = project
-        self.rag_system = None
+        self.rag_system = rag_system
         self._init_ui()
         self._run_search()
 
@@ -2474,9 +2679,10 @@ class SimilaritySearchDialog(QDialog):
         search_layout.addWidget(search_label)
         layout.addWidget(search_frame)
 
-        # Results area
-        self.results_text = QTextEdit()
-        self.results_text.setReadOnly(True)
+        # Results area; chapter passages link to their place in the manuscript
+        self.results_text = QTextBrowser()
+        self.results_text.setOpenLinks(False)
+        self.results_text.anchorClicked.connect(lambda url: _open_chapter_link(self, url))
         self.results_text.setPlaceholderText("Searching...")
         layout.addWidget(self.results_text, stretch=1)
 
@@ -2497,8 +2703,9 @@ class SimilaritySearchDialog(QDialog):
             from src.ai.semantic_search import SearchMethod
 
             # Initialize RAG system
-            self.rag_system = EnhancedRAGSystem(self.project)
-            self.rag_system.rebuild_index()
+            if not self.rag_system:
+                self.rag_system = EnhancedRAGSystem(self.project)
+                self.rag_system.rebuild_index()
 
             # Find similar content
             results = self.rag_system.find_similar(
@@ -2544,6 +2751,7 @@ class SimilaritySearchDialog(QDialog):
             if len(result.content) > 400:
                 content_preview += "..."
             lines.append(f"<p>{content_preview}</p>")
+            lines.append(_chapter_link_html(result))
             lines.append("</div>")
 
         self.results_text.setHtml("\n".join(lines))
@@ -2570,6 +2778,7 @@ class SimilaritySearchDialog(QDialog):
             "promise": "🤝",
             "worldbuilding": "🌍",
             "chapter_key_point": "📝",
+            "chapter_prose": "✍️",
             "themes": "🎨"
         }
         return icons.get(source_type, "📄")
@@ -2578,16 +2787,18 @@ class SimilaritySearchDialog(QDialog):
 class AdvancedSearchDialog(QDialog):
     """Advanced search dialog with filters and options."""
 
-    def __init__(self, project, parent=None):
+    def __init__(self, project, parent=None, rag_system=None):
         """Initialize advanced search dialog.
 
         Args:
             project: The writer project
             parent: Parent widget
+            rag_system: Optional up-to-date search index to use instead of
+                building one
         """
         super().__init__(parent)
         self.project = project
-        self.rag_system = None
+        self.rag_system = rag_system
         self._init_ui()
         self._init_rag()
 
@@ -2630,7 +2841,8 @@ class AdvancedSearchDialog(QDialog):
             ("fauna", "Fauna"),
             ("plot", "Plot"),
             ("promise", "Promises"),
-            ("worldbuilding", "Worldbuilding")
+            ("worldbuilding", "Worldbuilding"),
+            ("chapter_prose", "Chapter Text")
         ]
 
         for type_id, type_name in types:
@@ -2649,6 +2861,7 @@ class AdvancedSearchDialog(QDialog):
         self.method_combo = QComboBox()
         self.method_combo.addItem("Hybrid (Recommended)", "hybrid")
         self.method_combo.addItem("TF-IDF (Keyword-based)", "tfidf")
+        self.method_combo.addItem("BM25 (Keyword, names boosted)", "bm25")
         self.method_combo.addItem("Semantic (AI Embeddings)", "embedding")
         method_layout.addWidget(self.method_combo)
 
@@ -2663,9 +2876,10 @@ class AdvancedSearchDialog(QDialog):
 
         layout.addLayout(method_layout)
 
-        # Results
-        self.results_text = QTextEdit()
-        self.results_text.setReadOnly(True)
+        # Results; chapter passages link to their place in the manuscript
+        self.results_text = QTextBrowser()
+        self.results_text.setOpenLinks(False)
+        self.results_text.anchorClicked.connect(lambda url: _open_chapter_link(self, url))
         self.results_text.setPlaceholderText("Enter a search query and click Search...")
         layout.addWidget(self.results_text, stretch=1)
 
@@ -2689,8 +2903,9 @@ class AdvancedSearchDialog(QDialog):
         try:
             from src.ai.enhanced_rag import EnhancedRAGSystem
 
-            self.rag_system = EnhancedRAGSystem(self.project)
-            self.rag_system.rebuild_index()
+            if not self.rag_system:
+                self.rag_system = EnhancedRAGSystem(self.project)
+                self.rag_system.rebuild_index()
 
             # Show stats
             stats = self.rag_system.get_stats()
@@ -2725,6 +2940,7 @@ class AdvancedSearchDialog(QDialog):
             method_map = {
                 "hybrid": SearchMethod.HYBRID,
                 "tfidf": SearchMethod.TFIDF,
+                "bm25": SearchMethod.BM25,
                 "embedding": SearchMethod.EMBEDDING
             }
             method = method_map.get(
@@ -2761,7 +2977,8 @@ class AdvancedSearchDialog(QDialog):
             "flora": "🌿", "fauna": "🦁", "myth": "📖", "star_system": "⭐",
             "military": "🎖️", "economy": "💰", "political_system": "🏛️",
             "plot": "📊", "plot_event": "📍", "subplot": "🔀",
-            "promise": "🤝", "worldbuilding": "🌍", "chapter_key_point": "📝"
+            "promise": "🤝", "worldbuilding": "🌍", "chapter_key_point": "📝",
+            "chapter_prose": "✍️"
         }
 
         for result in results:
@@ -2800,6 +3017,7 @@ class AdvancedSearchDialog(QDialog):
                     )
 
             lines.append(f"<p style='margin-top: 8px;'>{preview}</p>")
+            lines.append(_chapter_link_html(result))
             lines.append("</div>")
 
         self.results_text.setHtml("\n".join(lines))
@@ -1,6 +1,6 @@
 """Culture builder widget with rituals, language, music, art, and traditions."""
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget,
     QLabel, QLineEdit, QTextEdit, QFormLayout, QComboBox, QGroupBox,
@@ -9,6 +9,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal, Qt
 
+from src.models.entity_registry import EntityRegistry
 from src.models.worldbuilding_objects import (
     Culture, Ritual, Language, MusicStyle, ArtForm, Tradition, Cuisine, Faction, Planet
 )
@@ -1155,6 +1156,7 @@ class CultureBuilderWidget(QWidget):
         self.cultures: List[Culture] = []
         self.available_factions: List[Faction] = []
         self.available_planets: List[str] = []
+        self._get_registry: Callable[[], EntityRegistry] = EntityRegistry
         self._init_ui()
 
     def _init_ui(self):
@@ -1281,6 +1283,15 @@ class CultureBuilderWidget(QWidget):
                 p for p in culture.associated_planets if p in planets
             ]
 
+    def set_entity_registry(self, get_registry: Callable[[], EntityRegistry]):
+        """Resolve faction ids through the shared worldbuilding registry.
+
+        Args:
+            get_registry: Returns the registry for the current world
+        """
+        self._get_registry = get_registry
+        self._update_list()
+
     def load_cultures(self, cultures: List[Culture]):
         """Load cultures into widget."""
         self.cultures = cultures
@@ -1305,10 +1316,19 @@ class CultureBuilderWidget(QWidget):
     def _update_list(self):
         """Update culture list display."""
         self.culture_list.clear()
+        registry = self._get_registry()
+
+        def get_faction_names(culture):
+            names = []
+            for faction_id in culture.associated_factions:
+                faction = registry.get(faction_id)
+                if faction:
+                    names.append(faction.name)
+            return names
 
         # Filter and sort functions
         def get_searchable_text(culture):
-            faction_names = [f.name for f in self.available_factions if f.id in culture.associated_factions]
+            faction_names = get_faction_names(culture)
             planets = " ".join(culture.associated_planets) if culture.associated_planets else ""
             return f"{culture.name} {' '.join(faction_names)} {planets} {culture.description or ''}"
 
@@ -1323,11 +1343,7 @@ class CultureBuilderWidget(QWidget):
 
         for culture in filtered_cultures:
             # Get faction names for display
-            faction_names = []
-            for faction_id in culture.associated_factions:
-                faction = next((f for f in self.available_factions if f.id == faction_id), None)
-                if faction:
-                    faction_names.append(faction.name)
+            faction_names = get_faction_names(culture)
 
             # Create display text
             factions_text = f" • {', '.join(faction_names)}" if faction_names else ""
@@ -1349,9 +1365,10 @@ class CultureBuilderWidget(QWidget):
             return
 
         # Get faction names for display
+        registry = self._get_registry()
         faction_names = []
         for faction_id in culture.associated_factions:
-            faction = next((f for f in self.available_factions if f.id == faction_id), None)
+            faction = registry.get(faction_id)
             if faction:
                 faction_names.append(faction.name)
 
@@ -8,10 +8,11 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QRectF
 from PyQt6.QtGui import QPainter, QPen, QColor, QFont
-from typing import List, Optional, Dict, Tuple
+from typing import Callable, List, Optional, Dict, Tuple
 import uuid
 import math
 
+from src.models.entity_registry import EntityRegistry
 from src.models.worldbuilding_objects import Economy, Good, TradeRoute, EconomyType, Faction
 from src.ui.worldbuilding.filter_sort_widget import FilterSortWidget
 
@@ -24,22 +25,25 @@ class TradeRouteGraph(QWidget):
         super().__init__()
         self.economies: List[Economy] = []
         self.factions: List[Faction] = []
+        self._faction_registry = EntityRegistry()
         self.economy_positions: Dict[str, Tuple[float, float]] = {}
         self.setMinimumHeight(400)
         self.setMinimumWidth(500)
         self.setStyleSheet("background-color: white; border: 1px solid #e5e7eb; border-radius: 8px;")
 
-    def set_data(self, economies: List[Economy], factions: List[Faction]):
-        """Set economies and factions to display."""
+    def set_data(self, economies: List[Economy], factions: List[Faction],
+                 entity_registry: Optional[EntityRegistry] = None):
+        """Set economies and factions to display, with the registry to resolve faction ids."""
         self.economies = economies
         self.factions = factions
+        if entity_registry is not None:
+            self._faction_registry = entity_registry
         self._calculate_positions()
         self.update()
 
     def _get_faction_name(self, faction_id: str) -> str:
         """Get faction name from ID."""
-        faction = next((f for f in self.factions if f.id == faction_id), None)
-        return faction.name if faction else faction_id[:8]
+        return self._faction_registry.get_name(faction_id, faction_id[:8])
 
     def _calculate_positions(self):
         """Calculate circular positions for economies."""
@@ -197,14 +201,16 @@ class TradeRouteGraph(QWidget):
 class TradeRouteGraphDialog(QDialog):
     """Popup dialog showing trade route network graph."""
 
-    def __init__(self, economies: List[Economy], factions: List[Faction], parent=None):
+    def __init__(self, economies: List[Economy], factions: List[Faction],
+                 entity_registry: Optional[EntityRegistry] = None, parent=None):
         """Initialize dialog."""
         super().__init__(parent)
         self.setWindowTitle("Trade Network")
         self.resize(800, 650)
-        self._init_ui(economies, factions)
+        self._init_ui(economies, factions, entity_registry)
 
-    def _init_ui(self, economies: List[Economy], factions: List[Faction]):
+    def _init_ui(self, economies: List[Economy], factions: List[Faction],
+                 entity_registry: Optional[EntityRegistry]):
         """Initialize UI."""
         layout = QVBoxLayout(self)
 
@@ -233,7 +239,7 @@ class TradeRouteGraphDialog(QDialog):
 
         # Graph
         self.graph = TradeRouteGraph()
-        self.graph.set_data(economies, factions)
+        self.graph.set_data(economies, factions, entity_registry)
         layout.addWidget(self.graph)
 
         # Close button
@@ -433,7 +439,8 @@ class EconomyEditorDialog(QDialog):
     """Dialog for editing an economy."""
 
     def __init__(self, economy: Optional[Economy] = None, all_economies: List[Economy] = None,
-                 available_factions: List[Faction] = None, parent=None):
+                 available_factions: List[Faction] = None,
+                 entity_registry: Optional[EntityRegistry] = None, parent=None):
         super().__init__(parent)
         self.economy = economy or Economy(
             id="",
@@ -443,6 +450,7 @@ class EconomyEditorDialog(QDialog):
         )
         self.all_economies = all_economies or []
         self.available_factions = available_factions or []
+        self._faction_registry = entity_registry if entity_registry is not None else EntityRegistry()
         self._init_ui()
         if economy:
             self._load_economy()
@@ -693,7 +701,7 @@ class EconomyEditorDialog(QDialog):
 
         for partner in self.economy.trade_partners:
             # Resolve faction name
-            faction = next((f for f in self.available_factions if f.id == partner), None)
+            faction = self._faction_registry.get(partner)
             if faction:
                 item = QListWidgetItem(faction.name)
                 item.setData(Qt.ItemDataRole.UserRole, partner)
@@ -701,7 +709,7 @@ class EconomyEditorDialog(QDialog):
 
         for embargo in self.economy.embargoes:
             # Resolve faction name
-            faction = next((f for f in self.available_factions if f.id == embargo), None)
+            faction = self._faction_registry.get(embargo)
             if faction:
                 item = QListWidgetItem(faction.name)
                 item.setData(Qt.ItemDataRole.UserRole, embargo)
@@ -721,8 +729,7 @@ class EconomyEditorDialog(QDialog):
         self.routes_list.clear()
         for route in self.economy.trade_routes:
             # Resolve faction name
-            faction = next((f for f in self.available_factions if f.id == route.to_faction), None)
-            faction_name = faction.name if faction else route.to_faction
+            faction_name = self._faction_registry.get_name(route.to_faction)
 
             goods_count = len(route.goods)
             display = f"To: {faction_name} ({route.route_type})"
@@ -915,6 +922,7 @@ class EconomyBuilderWidget(QWidget):
         super().__init__()
         self.economies: List[Economy] = []
         self.available_factions: List[Faction] = []
+        self._get_registry: Callable[[], EntityRegistry] = EntityRegistry
         self._init_ui()
 
     def _init_ui(self):
@@ -986,11 +994,11 @@ class EconomyBuilderWidget(QWidget):
     def _update_list(self):
         """Update economy list display."""
         self.list_widget.clear()
+        registry = self._get_registry()
 
         # Get faction name helper
         def get_faction_name(economy):
-            faction = next((f for f in self.available_factions if f.id == economy.faction_id), None)
-            return faction.name if faction else economy.faction_id
+            return registry.get_name(economy.faction_id)
 
         # Filter and sort
         def get_searchable_text(economy):
@@ -1037,7 +1045,8 @@ class EconomyBuilderWidget(QWidget):
     def _add_economy(self):
         """Add new economy."""
         editor = EconomyEditorDialog(available_factions=self.available_factions,
-                                     all_economies=self.economies, parent=self)
+                                     all_economies=self.economies,
+                                     entity_registry=self._get_registry(), parent=self)
         if editor.exec() == QDialog.DialogCode.Accepted:
             economy = editor.get_economy()
             self.economies.append(economy)
@@ -1056,7 +1065,8 @@ class EconomyBuilderWidget(QWidget):
             return
 
         editor = EconomyEditorDialog(economy=economy, available_factions=self.available_factions,
-                                     all_economies=self.economies, parent=self)
+                                     all_economies=self.economies,
+                                     entity_registry=self._get_registry(), parent=self)
         if editor.exec() == QDialog.DialogCode.Accepted:
             self._update_list()
             self.content_changed.emit()
@@ -1085,7 +1095,8 @@ class EconomyBuilderWidget(QWidget):
             QMessageBox.information(self, "No Economies", "Add economies to view the trade network.")
             return
 
-        dialog = TradeRouteGraphDialog(self.economies, self.available_factions, self)
+        dialog = TradeRouteGraphDialog(self.economies, self.available_factions,
+                                       self._get_registry(), self)
         dialog.exec()
 
     def set_available_factions(self, factions: List[Faction]):
@@ -1093,6 +1104,15 @@ class EconomyBuilderWidget(QWidget):
         self.available_factions = factions
         self._update_list()
 
+    def set_entity_registry(self, get_registry: Callable[[], EntityRegistry]):
+        """Resolve faction ids through the shared worldbuilding registry.
+
+        Args:
+            get_registry: Returns the registry for the current world
+        """
+        self._get_registry = get_registry
+        self._update_list()
+
     def load_economies(self, economies: List[Economy]):
         """Load economies list."""
         self.economies = economies
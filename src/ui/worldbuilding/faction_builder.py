@@ -8,10 +8,11 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QRectF
 from PyQt6.QtGui import QPainter, QPen, QColor, QFont
-from typing import List, Optional, Dict, Tuple
+from typing import Callable, List, Optional, Dict, Tuple
 import uuid
 import math
 
+from src.models.entity_registry import EntityRegistry
 from src.models.worldbuilding_objects import Faction, FactionType
 from src.ui.worldbuilding.filter_sort_widget import FilterSortWidget
 
@@ -190,7 +191,8 @@ class FactionRelationshipGraphDialog(QDialog):
 class FactionEditor(QDialog):
     """Dialog for editing a faction."""
 
-    def __init__(self, faction: Optional[Faction] = None, available_factions: List[Faction] = None, parent=None):
+    def __init__(self, faction: Optional[Faction] = None, available_factions: List[Faction] = None,
+                 entity_registry: Optional[EntityRegistry] = None, parent=None):
         """Initialize faction editor dialog."""
         super().__init__(parent)
         self.faction = faction or Faction(
@@ -199,6 +201,7 @@ class FactionEditor(QDialog):
             faction_type=FactionType.NATION
         )
         self.available_factions = available_factions or []
+        self._entity_registry = entity_registry if entity_registry is not None else EntityRegistry()
         self._init_ui()
         if faction:
             self._load_faction()
@@ -597,10 +600,7 @@ class FactionEditor(QDialog):
 
     def _get_faction_name(self, faction_id: str) -> str:
         """Get faction name from ID."""
-        for faction in self.available_factions:
-            if faction.id == faction_id:
-                return faction.name
-        return faction_id
+        return self._entity_registry.get_name(faction_id)
 
     def _save(self):
         """Save faction data."""
@@ -662,6 +662,7 @@ class FactionBuilderWidget(QWidget):
         """Initialize faction builder."""
         super().__init__()
         self.factions: List[Faction] = []
+        self._get_registry: Callable[[], EntityRegistry] = EntityRegistry
         self._init_ui()
 
     def _init_ui(self):
@@ -803,7 +804,8 @@ class FactionBuilderWidget(QWidget):
 
     def _add_faction(self):
         """Add new faction."""
-        editor = FactionEditor(available_factions=self.factions, parent=self)
+        editor = FactionEditor(available_factions=self.factions,
+                               entity_registry=self._get_registry(), parent=self)
         if editor.exec() == QDialog.DialogCode.Accepted:
             faction = editor.get_faction()
             self.factions.append(faction)
@@ -817,11 +819,13 @@ class FactionBuilderWidget(QWidget):
             return
 
         faction_id = items[0].data(Qt.ItemDataRole.UserRole)
-        faction = next((f for f in self.factions if f.id == faction_id), None)
+        registry = self._get_registry()
+        faction = registry.get(faction_id)
         if not faction:
             return
 
-        editor = FactionEditor(faction=faction, available_factions=self.factions, parent=self)
+        editor = FactionEditor(faction=faction, available_factions=self.factions,
+                               entity_registry=registry, parent=self)
         if editor.exec() == QDialog.DialogCode.Accepted:
             self._update_list()
             self.content_changed.emit()
@@ -833,13 +837,26 @@ class FactionBuilderWidget(QWidget):
             return
 
         faction_id = items[0].data(Qt.ItemDataRole.UserRole)
-        faction_name = next((f.name for f in self.factions if f.id == faction_id), "")
+        registry = self._get_registry()
+        faction_name = registry.get_name(faction_id, "")
+
+        # List what refers to this faction
+        referrers = registry.referrers(faction_id)
+        referrer_names = sorted({registry.get_name(ref.source_id) for ref in referrers})
+        if referrer_names:
+            shown = ", ".join(referrer_names[:5])
+            if len(referrer_names) > 5:
+                shown += f" and {len(referrer_names) - 5} more"
+            references_text = f"It is referenced by: {shown}\n\n"
+        else:
+            references_text = ""
 
         # Confirm deletion
         reply = QMessageBox.question(
             self,
             "Remove Faction",
             f"Are you sure you want to remove '{faction_name}'?\n\n"
+            f"{references_text}"
             "This will also remove references to this faction from:\n"
             "• Other factions' allies and enemies lists\n"
             "• Mythology associations\n"
@@ -852,11 +869,11 @@ class FactionBuilderWidget(QWidget):
             return
 
         # Remove faction references from other factions
-        for faction in self.factions:
-            if faction_id in faction.allies:
-                faction.allies.remove(faction_id)
-            if faction_id in faction.enemies:
-                faction.enemies.remove(faction_id)
+        for ref in referrers:
+            if ref.source_kind == 'faction' and ref.field in ('allies', 'enemies'):
+                ids = getattr(registry.get(ref.source_id), ref.field)
+                if faction_id in ids:
+                    ids.remove(faction_id)
 
         current_row = self.faction_list.row(items[0])
         self.factions = [f for f in self.factions if f.id != faction_id]
@@ -901,3 +918,11 @@ class FactionBuilderWidget(QWidget):
         """Load factions."""
         self.factions = factions
         self._update_list()
+
+    def set_entity_registry(self, get_registry: Callable[[], EntityRegistry]):
+        """Resolve faction ids through the shared worldbuilding registry.
+
+        Args:
+            get_registry: Returns the registry for the current world
+        """
+        self._get_registry = get_registry
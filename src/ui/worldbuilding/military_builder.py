@@ -8,9 +8,10 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QAction
-from typing import List, Optional
+from typing import Callable, List, Optional
 import uuid
 
+from src.models.entity_registry import EntityRegistry
 from src.models.worldbuilding_objects import Army, MilitaryBranch, Faction
 from src.ui.worldbuilding.filter_sort_widget import FilterSortWidget
 
@@ -196,11 +197,13 @@ class MilitaryBranchEditor(QDialog):
 class ArmyEditorDialog(QDialog):
     """Popup dialog for editing an army."""
 
-    def __init__(self, army: Optional[Army] = None, available_factions: List[Faction] = None, parent=None):
+    def __init__(self, army: Optional[Army] = None, available_factions: List[Faction] = None,
+                 entity_registry: Optional[EntityRegistry] = None, parent=None):
         """Initialize army editor dialog."""
         super().__init__(parent)
         self.army = army
         self.available_factions = available_factions or []
+        self._entity_registry = entity_registry if entity_registry is not None else EntityRegistry()
         self.setWindowTitle("Edit Military Force" if army else "New Military Force")
         self.resize(750, 650)
         self._init_ui()
@@ -465,7 +468,7 @@ class ArmyEditorDialog(QDialog):
 
         # Load allies - display faction names but store faction IDs
         for ally_id in self.army.allies:
-            faction = next((f for f in self.available_factions if f.id == ally_id), None)
+            faction = self._entity_registry.get(ally_id)
             if faction:
                 item = QListWidgetItem(f"{faction.name} ({faction.faction_type})")
                 item.setData(Qt.ItemDataRole.UserRole, ally_id)
@@ -477,7 +480,7 @@ class ArmyEditorDialog(QDialog):
 
         # Load enemies - display faction names but store faction IDs
         for enemy_id in self.army.enemies:
-            faction = next((f for f in self.available_factions if f.id == enemy_id), None)
+            faction = self._entity_registry.get(enemy_id)
             if faction:
                 item = QListWidgetItem(f"{faction.name} ({faction.faction_type})")
                 item.setData(Qt.ItemDataRole.UserRole, enemy_id)
@@ -724,6 +727,7 @@ class MilitaryBuilderWidget(QWidget):
         super().__init__()
         self.armies: List[Army] = []
         self.available_factions = available_factions or []
+        self._get_registry: Callable[[], EntityRegistry] = EntityRegistry
         self._init_ui()
 
     def _init_ui(self):
@@ -779,11 +783,11 @@ class MilitaryBuilderWidget(QWidget):
     def _update_list(self):
         """Update army list display with filtering and sorting."""
         self.army_list.clear()
+        registry = self._get_registry()
 
         # Get faction name helper
         def get_faction_name(army):
-            faction = next((f for f in self.available_factions if f.id == army.faction_id), None)
-            return faction.name if faction else army.faction_id
+            return registry.get_name(army.faction_id)
 
         # Filter and sort functions
         def get_searchable_text(army):
@@ -816,7 +820,8 @@ class MilitaryBuilderWidget(QWidget):
 
     def _add_army(self):
         """Add new army via popup dialog."""
-        dialog = ArmyEditorDialog(available_factions=self.available_factions, parent=self)
+        dialog = ArmyEditorDialog(available_factions=self.available_factions,
+                                  entity_registry=self._get_registry(), parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             army = dialog.get_army()
             self.armies.append(army)
@@ -834,7 +839,8 @@ class MilitaryBuilderWidget(QWidget):
         army = next((a for a in self.armies if a.id == army_id), None)
 
         if army:
-            dialog = ArmyEditorDialog(army=army, available_factions=self.available_factions, parent=self)
+            dialog = ArmyEditorDialog(army=army, available_factions=self.available_factions,
+                                      entity_registry=self._get_registry(), parent=self)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 updated_army = dialog.get_army()
                 # Update in list
@@ -894,3 +900,12 @@ class MilitaryBuilderWidget(QWidget):
         """Update the list of available factions."""
         self.available_factions = factions
         self._update_list()
+
+    def set_entity_registry(self, get_registry: Callable[[], EntityRegistry]):
+        """Resolve faction ids through the shared worldbuilding registry.
+
+        Args:
+            get_registry: Returns the registry for the current world
+        """
+        self._get_registry = get_registry
+        self._update_list()
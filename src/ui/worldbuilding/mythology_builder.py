@@ -1,6 +1,6 @@
 """Mythology builder widget with faction associations."""
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget,
     QLabel, QLineEdit, QTextEdit, QFormLayout, QComboBox, QGroupBox,
@@ -8,6 +8,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal, Qt
 
+from src.models.entity_registry import EntityRegistry
 from src.models.worldbuilding_objects import Myth, Faction
 from src.ui.worldbuilding.filter_sort_widget import FilterSortWidget
 
@@ -234,6 +235,7 @@ class MythologyBuilderWidget(QWidget):
         super().__init__()
         self.myths: List[Myth] = []
         self.available_factions: List[Faction] = []
+        self._get_registry: Callable[[], EntityRegistry] = EntityRegistry
         self._init_ui()
 
     def _init_ui(self):
@@ -314,6 +316,15 @@ class MythologyBuilderWidget(QWidget):
         """
         self.available_factions = factions
 
+    def set_entity_registry(self, get_registry: Callable[[], EntityRegistry]):
+        """Resolve faction ids through the shared worldbuilding registry.
+
+        Args:
+            get_registry: Returns the registry for the current world
+        """
+        self._get_registry = get_registry
+        self._update_list()
+
     def load_myths(self, myths: List[Myth]):
         """Load myths into widget.
 
@@ -347,10 +358,11 @@ class MythologyBuilderWidget(QWidget):
     def _update_list(self):
         """Update myth list display."""
         self.myth_list.clear()
+        registry = self._get_registry()
 
         # Filter and sort functions
         def get_searchable_text(myth):
-            faction_names = [f.name for f in self.available_factions if f.id in myth.associated_factions]
+            faction_names = [registry.get_name(fid) for fid in myth.associated_factions if fid in registry]
             return f"{myth.name} {myth.myth_type} {' '.join(faction_names)} {myth.description or ''}"
 
         def get_sort_value(myth, key):
@@ -371,7 +383,7 @@ class MythologyBuilderWidget(QWidget):
             # Get faction names for display
             faction_names = []
             for faction_id in myth.associated_factions:
-                faction = next((f for f in self.available_factions if f.id == faction_id), None)
+                faction = registry.get(faction_id)
                 if faction:
                     faction_names.append(faction.name)
 
@@ -6,9 +6,10 @@ from PyQt6.QtWidgets import (
     QTextEdit, QComboBox, QSpinBox, QFormLayout, QGroupBox, QScrollArea
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from typing import List, Optional
+from typing import Callable, List, Optional
 import uuid
 
+from src.models.entity_registry import EntityRegistry
 from src.models.worldbuilding_objects import Place, PlaceType, Faction
 from src.ui.worldbuilding.filter_sort_widget import FilterSortWidget
 
@@ -248,6 +249,7 @@ class PlaceBuilderWidget(QWidget):
         self.places_list: List[Place] = []
         self.available_factions: List[Faction] = []
         self.available_planets: List[str] = []
+        self._get_registry: Callable[[], EntityRegistry] = EntityRegistry
         self._init_ui()
 
     def _init_ui(self):
@@ -313,12 +315,13 @@ class PlaceBuilderWidget(QWidget):
     def _update_list(self):
         """Update place list display."""
         self.list_widget.clear()
+        registry = self._get_registry()
 
         # Filter and sort functions
         def get_searchable_text(place):
             faction_name = ""
             if place.controlling_faction:
-                faction = next((f for f in self.available_factions if f.id == place.controlling_faction), None)
+                faction = registry.get(place.controlling_faction)
                 if faction:
                     faction_name = faction.name
             return f"{place.name} {place.place_type.value} {place.planet or ''} {faction_name} {place.description or ''}"
@@ -345,7 +348,7 @@ class PlaceBuilderWidget(QWidget):
             # Get controlling faction name if available
             faction_text = ""
             if place.controlling_faction:
-                faction = next((f for f in self.available_factions if f.id == place.controlling_faction), None)
+                faction = registry.get(place.controlling_faction)
                 if faction:
                     faction_text = f" • {faction.name}"
 
@@ -416,6 +419,15 @@ class PlaceBuilderWidget(QWidget):
         self.available_factions = factions
         self._update_list()
 
+    def set_entity_registry(self, get_registry: Callable[[], EntityRegistry]):
+        """Resolve faction ids through the shared worldbuilding registry.
+
+        Args:
+            get_registry: Returns the registry for the current world
+        """
+        self._get_registry = get_registry
+        self._update_list()
+
     def set_available_planets(self, planets: List[str]):
         """Set available planets for place association."""
         self.available_planets = planets
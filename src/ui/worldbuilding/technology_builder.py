@@ -1,6 +1,6 @@
 """Technology builder for managing technologies and innovations."""
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget,
     QLabel, QLineEdit, QTextEdit, QComboBox, QSlider, QFormLayout,
@@ -9,6 +9,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal, Qt
 
+from src.models.entity_registry import EntityRegistry
 from src.models.worldbuilding_objects import Technology, TechnologyType, Faction
 from src.ui.worldbuilding.filter_sort_widget import FilterSortWidget
 
@@ -352,6 +353,7 @@ class TechnologyBuilderWidget(QWidget):
         super().__init__()
         self.technologies: List[Technology] = []
         self.available_factions: List[Faction] = []
+        self._get_registry: Callable[[], EntityRegistry] = EntityRegistry
         self._init_ui()
 
     def _init_ui(self):
@@ -430,6 +432,15 @@ class TechnologyBuilderWidget(QWidget):
         """
         self.available_factions = factions
 
+    def set_entity_registry(self, get_registry: Callable[[], EntityRegistry]):
+        """Resolve faction ids through the shared worldbuilding registry.
+
+        Args:
+            get_registry: Returns the registry for the current world
+        """
+        self._get_registry = get_registry
+        self._update_list()
+
     def load_technologies(self, technologies: List[Technology]):
         """Load technologies into widget.
 
@@ -462,10 +473,11 @@ class TechnologyBuilderWidget(QWidget):
     def _update_list(self):
         """Update technology list display."""
         self.tech_list.clear()
+        registry = self._get_registry()
 
         # Filter and sort functions
         def get_searchable_text(tech):
-            faction_names = [f.name for f in self.available_factions if f.id in tech.factions_with_access]
+            faction_names = [registry.get_name(fid) for fid in tech.factions_with_access if fid in registry]
             return f"{tech.name} {tech.technology_type.value} {tech.tech_level or ''} {' '.join(faction_names)} {tech.description or ''}"
 
         def get_sort_value(tech, key):
@@ -488,7 +500,7 @@ class TechnologyBuilderWidget(QWidget):
             # Get faction names
             faction_names = []
             for faction_id in tech.factions_with_access[:3]:  # Show first 3
-                faction = next((f for f in self.available_factions if f.id == faction_id), None)
+                faction = registry.get(faction_id)
                 if faction:
                     faction_names.append(faction.name)
 
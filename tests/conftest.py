@@ -0,0 +1,31 @@
+"""Shared fixtures for the test suite."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the application as the "src" package, as main.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.project import Chapter, WriterProject  # noqa: E402
+
+
+@pytest.fixture
+def make_project():
+    """Create a project with numbered chapters of distinct content."""
+    def make(chapters: int = 3, name: str = "Test Project") -> WriterProject:
+        project = WriterProject(name=name)
+        for i in range(1, chapters + 1):
+            project.manuscript.add_chapter(Chapter(
+                id=f"chapter{i}", number=i, title=f"Chapter {i}",
+                content=f"Chapter {i} begins.\n\nSomething happens in chapter {i}."
+            ))
+        return project
+    return make
+
+
+@pytest.fixture
+def project_file(tmp_path):
+    """Path of a project file in a fresh directory."""
+    return str(tmp_path / "project.json")
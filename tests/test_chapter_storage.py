@@ -0,0 +1,69 @@
+"""Tests for read-only chapter text views."""
+
+import hashlib
+
+import pytest
+
+from src.models.chapter_storage import ChapterTextView
+from src.models.project import WriterProject
+
+
+def md5(text: str) -> str:
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def test_crlf_file_reads_like_read_text(tmp_path):
+    path = tmp_path / "chapter.md"
+    path.write_bytes(b"First line.\r\nSecond line.\r\n\r\nNext paragraph.\r\n")
+    expected = path.read_text(encoding='utf-8')
+
+    with ChapterTextView.from_file(path) as view:
+        assert view.is_mapped
+        assert view.text() == expected
+        assert list(view.iter_lines()) == expected.split("\n")
+        assert list(view.iter_paragraphs()) == ["First line.\nSecond line.", "Next paragraph."]
+        assert view.content_hash() == md5(expected)
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "chapter.md"
+    path.write_bytes(b"")
+
+    with ChapterTextView.from_file(path) as view:
+        assert len(view) == 0
+        assert view.text() == ""
+        assert list(view.iter_lines()) == [""]
+        assert list(view.iter_paragraphs()) == []
+        assert view.content_hash() == md5("")
+
+
+def test_saved_chapter_view_hash_matches_content(make_project, project_file):
+    make_project().save_project(project_file)
+    project = WriterProject.load_project(project_file, lazy=True)
+    chapter = project.manuscript.get_chapter("chapter1")
+
+    with chapter.open_text_view() as view:
+        assert view.is_mapped
+        assert not chapter.is_content_loaded()
+        assert view.content_hash() == md5(chapter.content)
+
+    chapter.content += "\n\nUnsaved ending."
+    with chapter.open_text_view() as view:
+        assert not view.is_mapped
+        assert view.text() == chapter.content
+        assert view.content_hash() == md5(chapter.content)
+
+
+def test_slices_drop_cut_characters_but_full_reads_are_strict(tmp_path):
+    view = ChapterTextView.from_text("Café")
+    assert view[:4] == "Caf"
+    assert view[:5] == "Café"
+
+    path = tmp_path / "chapter.md"
+    path.write_bytes(b"Latin-1 caf\xe9\nSecond line.")
+    with ChapterTextView.from_file(path) as view:
+        assert view[:11] == "Latin-1 caf"
+        with pytest.raises(UnicodeDecodeError):
+            view.text()
+        with pytest.raises(UnicodeDecodeError):
+            list(view.iter_lines())
@@ -0,0 +1,35 @@
+"""Tests for packing search results into a token budget."""
+
+from src.ai.context_packer import TokenCounter, pack_context
+from src.ai.enhanced_rag import ContextResult
+
+
+def result(name: str, words: int, score: float = 0.5) -> ContextResult:
+    return ContextResult(
+        content=f"{name} " + " ".join(["word"] * words) + ".",
+        source_type="faction", source_name=name, relevance_score=score,
+        matched_terms=[], match_type="hybrid", metadata={}
+    )
+
+
+def test_long_top_hit_is_not_pushed_out_by_short_low_ranked_results():
+    counter = TokenCounter()
+    # Close scores, as fused searches give: per token, every short result
+    # looks better than the long top hit
+    results = [result("top", 300)] + [result(f"minor {i}", 20, 0.45) for i in range(5)]
+
+    packed = pack_context(results, 400, counter)
+
+    assert packed[0].result.source_name == "top"
+    assert not packed[0].truncated
+    assert sum(item.tokens for item in packed) <= 400
+
+
+def test_small_relevant_results_are_packed_around_a_large_one():
+    counter = TokenCounter()
+    results = [result("first", 20), result("culture", 300), result("second", 20), result("third", 20)]
+
+    packed = pack_context(results, 150, counter)
+
+    assert [item.result.source_name for item in packed] == ["first", "second", "third"]
+    assert sum(item.tokens for item in packed) <= 150
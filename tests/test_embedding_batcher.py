@@ -0,0 +1,92 @@
+"""Tests for batched embedding computation."""
+
+import threading
+
+import pytest
+
+from src.ai.embedding_batcher import MAX_EMBEDDING_CHARS, EmbeddingBatcher
+
+
+def length_embedding(text):
+    return [float(len(text)), 1.0]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_texts_are_split_into_batches_and_keep_their_order(max_concurrency):
+    calls = []
+    lock = threading.Lock()
+
+    def embed_batch(texts):
+        with lock:
+            calls.append(list(texts))
+        return [length_embedding(text) for text in texts]
+
+    batcher = EmbeddingBatcher(batch_embedding_fn=embed_batch, batch_size=3,
+                               max_concurrency=max_concurrency)
+    texts = ["x" * n for n in range(1, 9)]
+
+    embeddings = batcher.embed(texts)
+
+    assert embeddings == [length_embedding(text) for text in texts]
+    assert sorted(len(batch) for batch in calls) == [2, 3, 3]
+    assert sorted(text for batch in calls for text in batch) == sorted(texts)
+
+
+def test_single_text_function_is_used_without_a_batch_function():
+    calls = []
+
+    def embed_one(text):
+        calls.append(text)
+        return length_embedding(text)
+
+    batcher = EmbeddingBatcher(embedding_fn=embed_one, batch_size=4, max_concurrency=1)
+    long_text = "y" * (MAX_EMBEDDING_CHARS + 50)
+
+    embeddings = batcher.embed(["a", "bb", long_text])
+
+    assert calls == ["a", "bb", long_text[:MAX_EMBEDDING_CHARS]]
+    assert embeddings[2] == [float(MAX_EMBEDDING_CHARS), 1.0]
+
+    # A batch function takes precedence over the single-text one
+    both = EmbeddingBatcher(embedding_fn=embed_one, batch_embedding_fn=lambda texts: [[0.0]] * len(texts))
+    assert both.embed(["c"]) == [[0.0]]
+    assert "c" not in calls
+
+
+def test_progress_is_reported_after_each_batch():
+    progress = []
+    batcher = EmbeddingBatcher(embedding_fn=length_embedding, batch_size=2, max_concurrency=1)
+
+    batcher.embed(["a", "b", "c", "d", "e"], progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+
+
+def test_failures_only_lose_the_texts_they_affect():
+    def embed_batch(texts):
+        if "bad" in texts:
+            raise RuntimeError("provider error")
+        return [length_embedding(text) for text in texts]
+
+    batcher = EmbeddingBatcher(batch_embedding_fn=embed_batch, batch_size=2, max_concurrency=2)
+    assert batcher.embed(["a", "b", "bad", "c", "d"]) == [
+        length_embedding("a"), length_embedding("b"), None, None, length_embedding("d")
+    ]
+
+    # A batch answered with the wrong number of embeddings is dropped whole
+    short = EmbeddingBatcher(batch_embedding_fn=lambda texts: [[1.0]], batch_size=2)
+    assert short.embed(["a", "b"]) == [None, None]
+
+    def embed_one(text):
+        if text == "bad":
+            raise RuntimeError("provider error")
+        return length_embedding(text)
+
+    single = EmbeddingBatcher(embedding_fn=embed_one, batch_size=4)
+    assert single.embed(["a", "bad", "c"]) == [length_embedding("a"), None, length_embedding("c")]
+
+
+def test_no_embedding_function():
+    batcher = EmbeddingBatcher()
+    assert not batcher.available
+    assert batcher.embed(["a", "b"]) == [None, None]
@@ -0,0 +1,77 @@
+"""Tests for the persistent embedding cache."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.ai.embedding_cache import EmbeddingCache
+
+
+MODEL = "local/hashing-256"
+
+
+def matrix_files(cache_dir):
+    return sorted(path.name for path in cache_dir.glob("*.npy"))
+
+
+def test_saved_embeddings_load_in_a_new_cache(tmp_path):
+    cache = EmbeddingCache(tmp_path, MODEL)
+    cache.put("hash-a", [1.0, 0.0])
+    cache.put("hash-b", [0.0, 2.0])
+    assert cache.save()
+
+    reopened = EmbeddingCache(tmp_path, MODEL)
+    assert len(reopened) == 2
+    assert reopened.get("hash-b") == pytest.approx([0.0, 2.0])
+    assert reopened.get("missing") is None
+    assert EmbeddingCache(tmp_path, "another-model").get("hash-a") is None
+
+
+def test_save_replaces_matrix_and_prunes_unused(tmp_path):
+    cache = EmbeddingCache(tmp_path, MODEL)
+    cache.put("hash-a", [1.0, 0.0])
+    cache.save()
+    first = matrix_files(tmp_path)
+
+    cache = EmbeddingCache(tmp_path, MODEL)
+    cache.put("hash-b", [0.0, 1.0])
+    cache.save(prune=True)
+
+    assert len(matrix_files(tmp_path)) == 1
+    assert matrix_files(tmp_path) != first
+    reopened = EmbeddingCache(tmp_path, MODEL)
+    assert "hash-a" not in reopened
+    assert reopened.get("hash-b") == pytest.approx([0.0, 1.0])
+
+
+def test_interrupted_save_keeps_the_previous_generation(tmp_path):
+    cache = EmbeddingCache(tmp_path, MODEL)
+    cache.put("hash-a", [1.0, 0.0])
+    cache.save()
+
+    # A crash after writing a new matrix but before the index leaves an
+    # orphaned matrix of the same length with different rows
+    np.save(tmp_path / "local_hashing-256.0123456789ab.npy", np.array([[0.0, 1.0]], dtype=np.float32))
+
+    reopened = EmbeddingCache(tmp_path, MODEL)
+    assert reopened.get("hash-a") == pytest.approx([1.0, 0.0])
+
+    reopened.put("hash-b", [0.0, 1.0])
+    reopened.save()
+    assert len(matrix_files(tmp_path)) == 1
+
+
+def test_index_without_its_matrix_is_ignored(tmp_path):
+    cache = EmbeddingCache(tmp_path, MODEL)
+    cache.put("hash-a", [1.0, 0.0])
+    cache.save()
+
+    index_path = tmp_path / "local_hashing-256.json"
+    index = json.loads(index_path.read_text())
+    index["generation"] = "ffffffffffff"
+    index_path.write_text(json.dumps(index))
+
+    reopened = EmbeddingCache(tmp_path, MODEL)
+    assert len(reopened) == 0
+    assert reopened.get("hash-a") is None
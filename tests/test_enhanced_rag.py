@@ -0,0 +1,264 @@
+"""Tests for syncing the project search index."""
+
+import threading
+
+import pytest
+
+from src.ai.enhanced_rag import EnhancedRAGSystem, QueryResultCache
+from src.ai.semantic_search import SearchMethod
+from src.models.project import WriterProject
+from src.models.worldbuilding_objects import Faction, FactionType
+
+
+@pytest.fixture
+def rag(make_project):
+    project = make_project()
+    project.worldbuilding.factions.append(
+        Faction(id="f1", name="Empire", faction_type=FactionType.NATION, description="Rules the stars.")
+    )
+    rag = EnhancedRAGSystem(project)
+    rag.rebuild_index()
+    return rag
+
+
+def faction_text(rag):
+    return rag.search_engine.get_document("faction_f1").content
+
+
+def test_snapshot_holds_project_text_read_when_prepared(rag):
+    rag.project.worldbuilding.factions[0].description = "Rules the inner planets."
+    rag.mark_changed("factions")
+    snapshot = rag.prepare_sync()
+
+    # Edits after the snapshot are not seen by the worker side
+    rag.project.worldbuilding.factions[0].description = "Edited again."
+    stats = rag.apply_sync(snapshot)
+
+    assert stats["indexed"] == 1
+    assert "inner planets" in faction_text(rag)
+    assert [r.source_name for r in rag.search("inner planets", SearchMethod.BM25)] == ["Empire"]
+
+
+def test_failed_sync_restores_only_the_groups_it_took(rag, monkeypatch):
+    rag.mark_changed("factions")
+    snapshot = rag.prepare_sync()
+    assert snapshot.groups == ["factions"]
+    rag.mark_changed("places")  # Marked while the sync runs
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("embedding provider down")
+    monkeypatch.setattr(rag.search_engine, "prepare_documents", fail)
+    with pytest.raises(RuntimeError):
+        rag.apply_sync(snapshot)
+
+    assert rag._changed_groups == {"factions", "places"}
+    assert rag.get_index_status()["state"] == "failed"
+
+
+def test_late_snapshot_does_not_replace_newer_data(rag):
+    faction = rag.project.worldbuilding.factions[0]
+    faction.description = "First edit."
+    rag.mark_changed("factions")
+    older = rag.prepare_sync()
+    faction.description = "Second edit."
+    rag.mark_changed("factions")
+    newer = rag.prepare_sync()
+
+    rag.apply_sync(newer)
+    rag.apply_sync(older)
+
+    assert "Second edit." in faction_text(rag)
+
+
+def test_background_sync_indexes_snapshot(rag):
+    rag.project.worldbuilding.factions[0].description = "Rules from the moon."
+    rag.mark_changed("factions")
+    assert rag.start_background_sync()
+    worker = rag._worker
+    if worker is not None:
+        worker.join(timeout=10)
+
+    assert not rag.is_indexing
+    assert "moon" in faction_text(rag)
+    assert not rag.start_background_sync()  # Nothing left to sync
+
+
+def test_cached_results_are_dropped_when_the_index_changes(rag):
+    first = rag.search("Empire stars", SearchMethod.BM25)
+    assert [r.source_name for r in rag.search("  empire   STARS ", SearchMethod.BM25)] == ["Empire"]
+    assert rag.get_stats()["query_cache"]["hits"] == 1
+
+    version = rag.index_version
+    rag.project.worldbuilding.factions[0].name = "Republic"
+    rag.mark_changed("factions")
+    rag.sync_index()
+    assert rag.index_version > version
+
+    again = rag.search("Empire stars", SearchMethod.BM25)
+    stats = rag.get_stats()["query_cache"]
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert [r.source_name for r in first] == ["Empire"]
+    assert [r.source_name for r in again] == ["Republic"]
+
+
+def test_query_embedding_is_computed_without_holding_the_lock(rag):
+    rag.rebuild_index(compute_embeddings=True)
+    index = rag.search_engine.embedding_index
+    assert index.embedded_count
+    embed = index.embedding_fn
+    started, release = threading.Event(), threading.Event()
+
+    def slow_embedding(text):  # As a network call to the embedding provider
+        started.set()
+        release.wait(timeout=5)
+        return embed(text)
+    index.embedding_fn = slow_embedding
+
+    results = []
+    search = threading.Thread(target=lambda: results.append(rag.search("Empire stars", SearchMethod.HYBRID)))
+    search.start()
+    assert started.wait(timeout=5)
+    assert rag._lock.acquire(timeout=1)  # Searches and syncs can go ahead
+    rag._lock.release()
+    assert [r.source_name for r in rag.search("Empire stars", SearchMethod.BM25)] == ["Empire"]
+
+    release.set()
+    search.join(timeout=5)
+    assert [r.source_name for r in results[0]] == ["Empire"]
+    assert rag.search("empire stars", SearchMethod.HYBRID) == results[0]  # Cached
+
+
+def test_query_cache_is_bounded_and_keyed_by_version():
+    cache = QueryResultCache(max_entries=2)
+    keys = [QueryResultCache.make_key("search", f"query {i}", SearchMethod.BM25, 5) for i in range(3)]
+    for key in keys:
+        cache.put(key, 1, [])
+
+    assert cache.get(keys[0], 1) is None  # Least recently used, evicted
+    assert cache.get(keys[2], 1) == []
+    assert cache.get(keys[2], 2) is None  # New index version
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_chunk_ids_are_stable_across_rebuilds(rag):
+    rag.project.worldbuilding.factions.append(
+        Faction(id="", name="Nameless Guild", faction_type=FactionType.GUILD, description="Trades in secrets.")
+    )
+    rag.rebuild_index()
+    ids = set(rag.search_engine.get_document_ids())
+
+    rag.rebuild_index()
+    assert set(rag.search_engine.get_document_ids()) == ids
+
+    fresh = EnhancedRAGSystem(rag.project)
+    fresh.rebuild_index()
+    assert set(fresh.search_engine.get_document_ids()) == ids
+
+    # Without an entity id the chunk is keyed on the name, so edits keep it
+    guild_ids = set(rag.search_engine.get_document_ids(["faction"])) - {"faction_f1"}
+    rag.project.worldbuilding.factions[1].description = "Trades in rumours."
+    rag.mark_changed("factions")
+    rag.sync_index()
+    assert set(rag.search_engine.get_document_ids(["faction"])) - {"faction_f1"} == guild_ids
+
+
+def test_sync_removes_chunks_of_deleted_entities(rag):
+    assert rag.search_engine.get_document("faction_f1") is not None
+
+    rag.project.worldbuilding.factions.clear()
+    rag.mark_changed("factions")
+    stats = rag.sync_index()
+
+    assert stats["removed"] == 1
+    assert rag.search_engine.get_document("faction_f1") is None
+    assert rag.search("Empire", SearchMethod.BM25) == []
+
+
+def test_entities_sharing_a_name_get_distinct_chunks(rag):
+    for description in ("The first twin.", "The second twin."):
+        rag.project.worldbuilding.factions.append(
+            Faction(id="", name="Twins", faction_type=FactionType.GUILD, description=description)
+        )
+    rag.mark_changed("factions")
+    rag.sync_index()
+
+    twin_ids = set(rag.search_engine.get_document_ids(["faction"])) - {"faction_f1"}
+    assert len(twin_ids) == 2
+    contents = {rag.search_engine.get_document(doc_id).content for doc_id in twin_ids}
+    assert any("first twin" in content for content in contents)
+    assert any("second twin" in content for content in contents)
+
+
+def wait_for_worker(rag):
+    worker = rag._worker
+    if worker is not None:
+        worker.join(timeout=10)
+
+
+def test_snapshot_locates_prose_without_reading_chapters(make_project, project_file):
+    original = make_project()
+    original.manuscript.get_chapter("chapter2").content = "The lighthouse keeper waits."
+    original.save_project(project_file)
+    project = WriterProject.load_project(project_file, lazy=True)
+    rag = EnhancedRAGSystem(project)
+
+    snapshot = rag.prepare_sync(full=True)
+
+    assert not any(chapter.is_content_loaded() for chapter in project.manuscript.chapters)
+    assert not any(chunk.source_type == "chapter_prose" for chunk in snapshot.chunks)
+    assert [source.chapter_id for source in snapshot.chapters] == ["chapter1", "chapter2", "chapter3"]
+
+    rag.apply_sync(snapshot)
+
+    assert not any(chapter.is_content_loaded() for chapter in project.manuscript.chapters)
+    results = rag.search("lighthouse", SearchMethod.BM25)
+    assert [r.metadata["chapter_id"] for r in results] == ["chapter2"]
+
+
+def test_first_search_starts_a_background_build(make_project):
+    project = make_project()
+    project.manuscript.get_chapter("chapter3").content = "The lighthouse keeper waits."
+    rag = EnhancedRAGSystem(project)
+    started = []
+    original = rag.start_background_sync
+    rag.start_background_sync = lambda *args, **kwargs: started.append(1) or original(*args, **kwargs)
+    rag.rebuild_index = None  # A synchronous build would fail
+
+    rag.search("chapter", SearchMethod.BM25)
+    wait_for_worker(rag)
+
+    assert started == [1]
+    assert rag.get_index_status()["state"] == "ready"
+    assert [r.metadata["chapter_id"] for r in rag.search("lighthouse", SearchMethod.BM25)] == ["chapter3"]
+
+
+def test_unreadable_chapter_keeps_its_indexed_prose(make_project, project_file, tmp_path):
+    make_project().save_project(project_file)
+    project = WriterProject.load_project(project_file, lazy=True)
+    rag = EnhancedRAGSystem(project)
+    rag.rebuild_index()
+    chapter = project.manuscript.get_chapter("chapter1")
+    prose_ids = set(rag.search_engine.get_document_ids(["chapter_prose"]))
+
+    (tmp_path / chapter.file_path).write_bytes(b"Not UTF-8: \xff\xfe")
+    rag.mark_chapter_changed("chapter1")
+    rag.sync_index()
+
+    assert set(rag.search_engine.get_document_ids(["chapter_prose"])) == prose_ids
+
+
+def test_renamed_chapter_is_found_by_its_new_title(make_project):
+    project = make_project()
+    chapter = project.manuscript.get_chapter("chapter1")
+    chapter.title = "Alpha"
+    rag = EnhancedRAGSystem(project)
+    rag.rebuild_index()
+    assert rag.search("Alpha", SearchMethod.BM25)
+
+    chapter.title = "Zephyrine"
+    rag.mark_changed("chapter_prose")
+    stats = rag.sync_index()
+
+    assert stats["indexed"] == 0  # The prose itself is unchanged
+    assert {r.metadata["chapter_id"] for r in rag.search("Zephyrine", SearchMethod.BM25)} == {"chapter1"}
+    assert rag.search("Alpha", SearchMethod.BM25) == []
@@ -0,0 +1,62 @@
+"""Tests for the worldbuilding entity registry."""
+
+from src.models.project import WorldBuilding
+from src.models.worldbuilding_objects import Army, Faction, FactionType
+
+
+def make_world() -> WorldBuilding:
+    return WorldBuilding(
+        factions=[
+            Faction(id="f1", name="Empire", faction_type=FactionType.NATION, enemies=["f2"]),
+            Faction(id="f2", name="Rebels", faction_type=FactionType.ORGANIZATION, allies=["f3"]),
+        ],
+        armies=[Army(id="a1", name="First Legion", faction_id="f1", enemies=["f2"])],
+    )
+
+
+def test_ids_resolve_to_objects():
+    world = make_world()
+    registry = world.get_entity_registry()
+
+    assert registry.get("f1") is world.factions[0]
+    assert registry.kind_of("a1") == "army"
+    assert registry.get_name("f2") == "Rebels"
+    assert registry.get_name("missing") == "missing"
+    assert registry.get(None) is None
+
+
+def test_referrers_and_dangling_references():
+    registry = make_world().get_entity_registry()
+
+    sources = {(ref.source_id, ref.field) for ref in registry.referrers("f2")}
+    assert sources == {("f1", "enemies"), ("a1", "enemies")}
+
+    dangling = registry.find_dangling()
+    assert [(ref.source_id, ref.target_id) for ref in dangling] == [("f2", "f3")]
+
+
+def test_registry_is_cached_until_a_collection_changes():
+    world = make_world()
+    registry = world.get_entity_registry()
+    assert world.get_entity_registry() is registry
+
+    world.factions.append(Faction(id="f3", name="Guild", faction_type=FactionType.ORGANIZATION))
+    rebuilt = world.get_entity_registry()
+    assert rebuilt is not registry
+    assert rebuilt.find_dangling() == []
+
+
+def test_save_reuses_registry_unless_worldbuilding_changed(make_project, project_file):
+    project = make_project()
+    project.worldbuilding = make_world()
+    project.save_project(project_file)
+    assert len(project.get_dangling_references()) == 1
+
+    registry = project.worldbuilding.get_entity_registry()
+    project.story_planning.main_plot = "A new plot."
+    project.save_project(project_file)
+    assert project.worldbuilding.get_entity_registry() is registry
+
+    project.worldbuilding.factions[1].allies.clear()
+    project.save_project(project_file)
+    assert project.get_dangling_references() == []
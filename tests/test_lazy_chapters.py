@@ -0,0 +1,64 @@
+"""Tests for lazy chapter content loading and the resident set."""
+
+from src.models.project import WriterProject
+
+
+def test_lazy_load_reads_content_on_first_access(make_project, project_file):
+    original = make_project()
+    original.save_project(project_file)
+
+    project = WriterProject.load_project(project_file, lazy=True)
+    chapter = project.manuscript.get_chapter("chapter2")
+    assert not chapter.is_content_loaded()
+    assert chapter.title == "Chapter 2"
+
+    assert chapter.content == original.manuscript.get_chapter("chapter2").content
+    assert chapter.is_content_loaded()
+
+
+def test_resident_set_evicts_least_recently_used_clean_chapters(make_project, project_file):
+    make_project(chapters=5).save_project(project_file)
+    project = WriterProject.load_project(project_file, lazy=True, max_resident_chapters=2)
+    chapters = project.manuscript.chapters
+
+    for chapter in chapters:
+        chapter.content
+    assert [c.is_content_loaded() for c in chapters] == [False, False, False, True, True]
+
+    # Evicted content is read back from its file
+    assert chapters[0].content == "Chapter 1 begins.\n\nSomething happens in chapter 1."
+
+
+def test_dirty_chapters_are_not_evicted(make_project, project_file):
+    make_project(chapters=4).save_project(project_file)
+    project = WriterProject.load_project(project_file, lazy=True, max_resident_chapters=1)
+    chapters = project.manuscript.chapters
+
+    chapters[0].content = "Unsaved edit."
+    for chapter in chapters[1:]:
+        chapter.content
+
+    assert chapters[0].is_content_loaded()
+    assert chapters[0].content == "Unsaved edit."
+
+
+def test_dump_of_lazy_project_includes_content(make_project, project_file):
+    original = make_project()
+    original.save_project(project_file)
+
+    project = WriterProject.load_project(project_file, lazy=True)
+    data = project.model_dump(mode='json')
+
+    copy = WriterProject.model_validate(data)
+    for chapter in original.manuscript.chapters:
+        assert copy.manuscript.get_chapter(chapter.id).content == chapter.content
+
+
+def test_dump_excluding_content_leaves_chapters_unloaded(make_project, project_file):
+    make_project().save_project(project_file)
+    project = WriterProject.load_project(project_file, lazy=True)
+
+    data = project.model_dump(exclude={'manuscript': {'chapters': {'__all__': {'content'}}}})
+
+    assert all('content' not in chapter for chapter in data['manuscript']['chapters'])
+    assert not any(chapter.is_content_loaded() for chapter in project.manuscript.chapters)
@@ -0,0 +1,66 @@
+"""Tests for the offline hashing embedder."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.ai.local_embeddings import HashingEmbedder
+
+
+TEXTS = ["The Iron Legion marches north.", "Stormwatch harbor at dawn"]
+
+
+def test_embeddings_are_the_same_in_every_process():
+    # Python's str hash is salted per process; the embedder must not use it
+    script = (
+        "import json; from src.ai.local_embeddings import HashingEmbedder; "
+        f"print(json.dumps([HashingEmbedder(dim=64).get_embedding(t) for t in {TEXTS!r}]))"
+    )
+    outputs = []
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent
+        )
+        outputs.append(json.loads(result.stdout))
+
+    local = [HashingEmbedder(dim=64).get_embedding(text) for text in TEXTS]
+    assert outputs[0] == outputs[1]
+    assert np.allclose(outputs[0], local)
+
+
+@pytest.mark.parametrize("dim", [16, 384])
+def test_dimensions_and_unit_length_rows(dim):
+    embedder = HashingEmbedder(dim=dim)
+
+    batch = embedder.get_embeddings(TEXTS)
+
+    assert batch.shape == (2, dim)
+    assert batch.dtype == np.float32
+    assert np.linalg.norm(batch, axis=1) == pytest.approx([1.0, 1.0], abs=1e-6)
+    assert embedder.get_embedding(TEXTS[0]) == pytest.approx(batch[0].tolist())
+    assert str(dim) in embedder.embedding_model
+
+
+def test_empty_text_embeds_to_zeros():
+    embedder = HashingEmbedder(dim=32)
+
+    batch = embedder.get_embeddings(["", "  ...  ", "word"])
+
+    assert not batch[0].any() and not batch[1].any()
+    assert np.linalg.norm(batch[2]) == pytest.approx(1.0)
+    assert embedder.get_embeddings([]).shape == (0, 32)
+
+
+def test_shared_words_are_more_similar():
+    embedder = HashingEmbedder()
+    legion, marching, harbor = embedder.get_embeddings(
+        ["The Iron Legion", "the iron legions marching", "a quiet fishing harbor"]
+    )
+    assert float(legion @ marching) > float(legion @ harbor)
@@ -0,0 +1,89 @@
+"""Tests for the Manuscript chapter id and number indexes."""
+
+from src.models.project import Chapter, Manuscript
+
+
+def chapter(n: int) -> Chapter:
+    return Chapter(id=f"c{n}", number=n, title=f"Chapter {n}")
+
+
+def assert_consistent(manuscript: Manuscript):
+    for position, ch in enumerate(manuscript.chapters):
+        assert manuscript.index_of(ch.id) == position
+        assert manuscript.get_chapter(ch.id) is ch
+        assert manuscript.get_chapter_by_number(ch.number) is ch
+
+
+def make_manuscript(count: int = 4) -> Manuscript:
+    manuscript = Manuscript()
+    for n in range(1, count + 1):
+        manuscript.add_chapter(chapter(n))
+    return manuscript
+
+
+def test_indexes_follow_insert_remove_and_move():
+    manuscript = make_manuscript()
+    assert_consistent(manuscript)
+
+    manuscript.insert_chapter(1, chapter(9))
+    assert [ch.id for ch in manuscript.chapters] == ["c1", "c9", "c2", "c3", "c4"]
+    assert_consistent(manuscript)
+
+    assert manuscript.remove_chapter("c2").id == "c2"
+    assert manuscript.get_chapter("c2") is None
+    assert manuscript.get_chapter_by_number(2) is None
+    assert_consistent(manuscript)
+
+    manuscript.move_chapter(0, 3)
+    assert [ch.id for ch in manuscript.chapters] == ["c9", "c3", "c4", "c1"]
+    assert_consistent(manuscript)
+
+    manuscript.renumber_chapters()
+    assert [ch.number for ch in manuscript.chapters] == [1, 2, 3, 4]
+    assert manuscript.get_chapter_by_number(1).id == "c9"
+    assert_consistent(manuscript)
+
+
+def test_direct_edits_to_chapters_are_picked_up():
+    manuscript = make_manuscript()
+
+    manuscript.chapters.append(chapter(5))
+    assert manuscript.get_chapter("c5").number == 5
+    manuscript.chapters.pop(0)
+    assert manuscript.get_chapter("c1") is None
+    manuscript.chapters.reverse()
+    assert_consistent(manuscript)
+
+    manuscript.chapters = [chapter(7), chapter(8)]
+    assert manuscript.get_chapter("c2") is None
+    assert_consistent(manuscript)
+
+    manuscript.add_chapter(chapter(10))
+    manuscript.chapters.insert(0, chapter(11))
+    assert_consistent(manuscript)
+
+
+def test_unknown_ids_do_not_rebuild_the_index(monkeypatch):
+    manuscript = make_manuscript()
+    manuscript.get_chapter("c1")
+
+    rebuilds = []
+    original = Manuscript.reindex_chapters
+    monkeypatch.setattr(Manuscript, "reindex_chapters",
+                        lambda self: rebuilds.append(1) or original(self))
+
+    for _ in range(10):
+        assert manuscript.get_chapter("deleted") is None
+        assert manuscript.get_chapter_by_number(99) is None
+    assert rebuilds == []
+
+
+def test_duplicate_ids_and_numbers_resolve_to_the_first_chapter():
+    manuscript = make_manuscript(2)
+    duplicate = Chapter(id="c1", number=2, title="Duplicate")
+    manuscript.add_chapter(duplicate)
+    assert manuscript.get_chapter("c1") is manuscript.chapters[0]
+    assert manuscript.get_chapter_by_number(2) is manuscript.chapters[1]
+
+    manuscript.reindex_chapters()
+    assert manuscript.get_chapter("c1") is manuscript.chapters[0]
@@ -0,0 +1,56 @@
+"""Tests for the project load fast path and migration fallback."""
+
+import json
+
+import pytest
+
+from src.models.project import PROJECT_SCHEMA_VERSION, WriterProject
+
+
+def test_current_version_file_takes_the_fast_path(make_project, project_file, tmp_path):
+    make_project().save_project(project_file)
+    assert json.loads((tmp_path / "project.json").read_text())["schema_version"] == PROJECT_SCHEMA_VERSION
+
+    project = WriterProject.load_project(project_file)
+
+    stats = project.get_load_stats()
+    assert stats["fast_path"]
+    assert stats["schema_version"] == PROJECT_SCHEMA_VERSION
+    assert project.manuscript.get_chapter("chapter2").content.startswith("Chapter 2")
+
+
+def test_unversioned_file_is_migrated_then_stamped(tmp_path, project_file):
+    (tmp_path / "project.json").write_text(json.dumps({"name": "", "characters": "not a list"}))
+
+    project = WriterProject.load_project(project_file)
+    assert not project.get_load_stats()["fast_path"]
+    assert project.name == "project"
+    assert project.characters == []
+
+    project.save_project(project_file)
+    assert WriterProject.load_project(project_file).get_load_stats()["fast_path"]
+
+
+def test_invalid_current_version_file_falls_back_to_repair(tmp_path, project_file, capsys):
+    (tmp_path / "project.json").write_text(json.dumps({
+        "name": "Damaged",
+        "schema_version": PROJECT_SCHEMA_VERSION,
+        "characters": "not a list",
+    }))
+
+    project = WriterProject.load_project(project_file)
+
+    assert not project.get_load_stats()["fast_path"]
+    assert project.characters == []
+    assert "failed validation" in capsys.readouterr().out
+
+
+def test_fast_load_errors_other_than_validation_propagate(make_project, project_file, monkeypatch):
+    make_project().save_project(project_file)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("validator bug")
+    monkeypatch.setattr(WriterProject, "_fast_load_sharded", broken)
+
+    with pytest.raises(RuntimeError):
+        WriterProject.load_project(project_file)
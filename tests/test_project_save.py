@@ -0,0 +1,52 @@
+"""Tests for dirty-tracked, incremental project saves."""
+
+from src.models.project import WriterProject
+
+
+def test_unchanged_project_saves_nothing(make_project, project_file):
+    project = make_project()
+    assert project.save_project(project_file)
+
+    assert len(project.prepare_save(project_file)) == 0
+    assert project.get_dirty_sections() == []
+
+
+def test_load_then_save_writes_nothing(make_project, project_file):
+    make_project().save_project(project_file)
+
+    for lazy in (False, True):
+        project = WriterProject.load_project(project_file, lazy=lazy)
+        assert len(project.prepare_save(project_file)) == 0
+        assert project.get_dirty_sections() == []
+
+
+def test_chapter_edit_rewrites_only_that_chapter(make_project, project_file, tmp_path):
+    make_project().save_project(project_file)
+    project = WriterProject.load_project(project_file)
+
+    project.manuscript.get_chapter("chapter2").content = "Rewritten."
+    plan = project.prepare_save(project_file)
+
+    written = {path.relative_to(tmp_path).as_posix() for path, _, _ in plan._writes}
+    assert written == {"chapters/chapter_002.md"}
+
+
+def test_section_edit_rewrites_its_shard_and_manifest(make_project, project_file, tmp_path):
+    make_project().save_project(project_file)
+    project = WriterProject.load_project(project_file)
+
+    project.story_planning.main_plot = "A new plot."
+    plan = project.prepare_save(project_file)
+
+    written = {path.relative_to(tmp_path).as_posix() for path, _, _ in plan._writes}
+    assert written == {"data/story_planning.json", "project.json"}
+
+
+def test_save_to_new_path_writes_everything(make_project, project_file, tmp_path):
+    project = make_project()
+    project.save_project(project_file)
+
+    copy_file = str(tmp_path / "copy" / "project.json")
+    assert project.save_project(copy_file)
+    assert WriterProject.load_project(copy_file).manuscript.get_chapter("chapter3").content == \
+        project.manuscript.get_chapter("chapter3").content
@@ -0,0 +1,123 @@
+"""Tests for project storage layouts and atomic file writes."""
+
+import importlib.util
+import json
+import sys
+
+import pytest
+
+from src.models.project import WriterProject
+from src.models.project_storage import (
+    JSON_FORMAT,
+    MSGPACK_FORMAT,
+    MSGPACK_ZSTD_FORMAT,
+    decode_data,
+    detect_format,
+    encode_data,
+    shard_file_path,
+)
+from src.models.worldbuilding_objects import Faction, FactionType
+
+
+def test_sharded_project_round_trips(make_project, project_file, tmp_path):
+    original = make_project()
+    original.story_planning.main_plot = "The plot."
+    original.save_project(project_file)
+
+    manifest = json.loads((tmp_path / "project.json").read_text())
+    assert manifest["format"] == "sharded"
+    assert (tmp_path / "data" / "story_planning.json").exists()
+
+    project = WriterProject.load_project(project_file)
+    assert project.storage_layout == "sharded"
+    assert project.story_planning.main_plot == "The plot."
+    assert project.manuscript.get_chapter("chapter1").content == \
+        original.manuscript.get_chapter("chapter1").content
+
+
+def test_legacy_single_file_keeps_its_layout(tmp_path, project_file):
+    legacy = {
+        "name": "Legacy",
+        "manuscript": {"chapters": [{"id": "c1", "number": 1, "title": "One", "content": "Text."}]},
+    }
+    (tmp_path / "project.json").write_text(json.dumps(legacy))
+
+    project = WriterProject.load_project(project_file)
+    assert project.storage_layout == "single"
+    project.save_project(project_file)
+
+    assert not (tmp_path / "data").exists()
+    saved = json.loads((tmp_path / "project.json").read_text())
+    assert "format" not in saved
+    assert WriterProject.load_project(project_file).manuscript.get_chapter("c1").content == "Text."
+
+
+def test_single_project_can_opt_in_to_sharded_layout(tmp_path, project_file):
+    (tmp_path / "project.json").write_text(json.dumps({"name": "Legacy"}))
+
+    project = WriterProject.load_project(project_file)
+    project.storage_layout = "sharded"
+    project.save_project(project_file)
+
+    assert json.loads((tmp_path / "project.json").read_text())["format"] == "sharded"
+    assert WriterProject.load_project(project_file).name == "Legacy"
+
+
+@pytest.mark.parametrize("layout", ["sharded", "single"])
+@pytest.mark.parametrize("storage_format", [MSGPACK_FORMAT, MSGPACK_ZSTD_FORMAT])
+def test_binary_formats_round_trip_losslessly(make_project, project_file, tmp_path, layout, storage_format):
+    pytest.importorskip("msgpack")
+    if storage_format == MSGPACK_ZSTD_FORMAT:
+        pytest.importorskip("zstandard")
+    original = make_project()
+    original.storage_layout = layout
+    original.storage_format = storage_format
+    original.worldbuilding.factions.append(
+        Faction(id="f1", name="Ünïcode Empire", faction_type=FactionType.NATION, allies=["f2"])
+    )
+    original.save_project(project_file)
+
+    if layout == "sharded":
+        assert (tmp_path / shard_file_path("worldbuilding.factions", storage_format)).exists()
+    else:
+        assert detect_format((tmp_path / "project.json").read_bytes()) == storage_format
+
+    project = WriterProject.load_project(project_file)
+    assert project.get_load_stats()["fast_path"]
+    assert project.model_dump(mode='json') == original.model_dump(mode='json')
+
+    # Exported back to plain JSON for diffing, the project loads unchanged
+    export_file = tmp_path / "export" / "project.json"
+    project.export_json(str(export_file))
+    assert detect_format(export_file.read_bytes()) == JSON_FORMAT
+    exported = WriterProject.load_project(str(export_file))
+    assert exported.worldbuilding.factions[0].name == "Ünïcode Empire"
+    assert exported.manuscript.get_chapter("chapter3").content == \
+        original.manuscript.get_chapter("chapter3").content
+
+
+def test_format_is_detected_from_leading_bytes():
+    data = {"name": "Project", "numbers": [1, 2, 3]}
+
+    assert detect_format(b"\xef\xbb\xbf  \n{\"name\": 1}") == JSON_FORMAT
+    assert detect_format(b"") == JSON_FORMAT
+    assert decode_data(encode_data(data, JSON_FORMAT)) == data
+    if importlib.util.find_spec("msgpack"):
+        assert detect_format(encode_data(data, MSGPACK_FORMAT)) == MSGPACK_FORMAT
+        assert decode_data(encode_data(data, MSGPACK_FORMAT)) == data
+        if importlib.util.find_spec("zstandard"):
+            assert detect_format(encode_data(data, MSGPACK_ZSTD_FORMAT)) == MSGPACK_ZSTD_FORMAT
+            assert decode_data(encode_data(data, MSGPACK_ZSTD_FORMAT)) == data
+
+
+@pytest.mark.parametrize("module, storage_format", [
+    ("msgpack", MSGPACK_FORMAT),
+    ("zstandard", MSGPACK_ZSTD_FORMAT),
+])
+def test_missing_optional_dependency_names_the_package(monkeypatch, module, storage_format):
+    if storage_format == MSGPACK_ZSTD_FORMAT:
+        pytest.importorskip("msgpack")
+    monkeypatch.setitem(sys.modules, module, None)
+
+    with pytest.raises(ImportError, match=f"pip install {module}"):
+        encode_data({"name": "Project"}, storage_format)
@@ -0,0 +1,53 @@
+"""Tests for splitting chapter prose into passage windows."""
+
+from src.ai.prose_chunker import chunk_prose
+
+
+def paragraphs(count: int, words: int = 40):
+    return [" ".join(f"p{n}w{i}" for i in range(words)) + "." for n in range(count)]
+
+
+def test_single_paragraph_windows_follow_paragraph_lines_and_offsets():
+    text = "First line\nof the first paragraph.\n\n\nSecond paragraph.\n   \nThird."
+
+    chunks = list(chunk_prose(text.split("\n"), min_chars=1, boundary_modulus=1, overlap_paragraphs=0))
+
+    assert [chunk.text for chunk in chunks] == [
+        "First line\nof the first paragraph.", "Second paragraph.", "Third."
+    ]
+    assert [(chunk.start_line, chunk.end_line) for chunk in chunks] == [(1, 2), (5, 5), (7, 7)]
+    for chunk in chunks:
+        assert text[chunk.start_offset:chunk.end_offset] == chunk.text
+
+
+def test_windows_end_once_they_reach_the_size_limit():
+    texts = paragraphs(12)
+    size = len(texts[0])
+
+    chunks = list(chunk_prose("\n\n".join(texts).split("\n"), min_chars=10_000,
+                              max_chars=3 * size, overlap_paragraphs=0))
+
+    assert [chunk.text.count("\n\n") + 1 for chunk in chunks] == [3, 3, 3, 3]
+    assert "\n\n".join(chunk.text for chunk in chunks) == "\n\n".join(texts)
+
+
+def test_windows_overlap_by_one_paragraph_except_at_scene_breaks():
+    texts = paragraphs(8)
+    lines = "\n\n".join(texts[:5] + ["* * *"] + texts[5:]).split("\n")
+
+    chunks = list(chunk_prose(lines, min_chars=10_000, max_chars=3 * len(texts[0])))
+    windows = [chunk.text.split("\n\n") for chunk in chunks]
+
+    # texts[4] is carried over, but the scene break after it starts afresh
+    assert windows == [texts[0:3], texts[2:5], texts[5:8]]
+
+
+def test_edits_only_change_nearby_windows():
+    texts = paragraphs(40, words=20)
+    before = list(chunk_prose("\n\n".join(texts).split("\n"), min_chars=300, max_chars=2000))
+    texts[35] = "An edited paragraph near the end."
+    after = list(chunk_prose("\n\n".join(texts).split("\n"), min_chars=300, max_chars=2000))
+
+    unchanged = [chunk.text for chunk in before if chunk.end_line < 60]
+    assert unchanged
+    assert unchanged == [chunk.text for chunk in after if chunk.end_line < 60]
@@ -0,0 +1,77 @@
+"""Tests for the RAGSystem lookup adapter."""
+
+import threading
+
+from src.ai.rag_system import RAGSystem
+from src.models.worldbuilding_objects import Place, PlaceType
+
+
+def wait_for_index(rag):
+    worker = rag.engine._worker
+    if worker is not None:
+        worker.join(timeout=10)
+
+
+def test_lookups_see_added_and_renamed_entities(make_project):
+    project = make_project()
+    rag = RAGSystem(project)
+    assert rag.search_places("harbor") == []
+    wait_for_index(rag)
+
+    place = Place(id="p1", name="Grey Harbor", place_type=PlaceType.CITY,
+                  description="A foggy port city.")
+    project.worldbuilding.places.append(place)
+    rag.mark_changed("places")
+
+    # Quick references read the project; searches follow the background sync
+    assert rag.get_quick_reference("place", "Grey Harbor") is not None
+    wait_for_index(rag)
+    assert [chunk.source_name for chunk in rag.search_places("harbor")] == ["Grey Harbor"]
+
+    place.name = "Silver Harbor"
+    rag.mark_changed("places")
+    rag.search_places("silver")
+    wait_for_index(rag)
+
+    assert [chunk.source_name for chunk in rag.search_places("silver")] == ["Silver Harbor"]
+    assert rag.search_places("grey") == []
+    assert rag.get_quick_reference("place", "Grey Harbor") is None
+    assert "Silver Harbor" in rag.get_quick_reference("place", "silver harbor")
+
+
+def test_changes_marked_on_a_shared_index_reach_the_adapter(make_project):
+    project = make_project()
+    rag = RAGSystem(project)
+    assert rag.get_quick_reference("place", "Grey Harbor") is None
+    wait_for_index(rag)
+
+    project.worldbuilding.places.append(
+        Place(id="p1", name="Grey Harbor", place_type=PlaceType.CITY)
+    )
+    # Marked by another user of the index, e.g. the manuscript editor
+    rag.engine.mark_changed("places")
+
+    assert rag.get_quick_reference("place", "Grey Harbor") is not None
+    wait_for_index(rag)
+    assert [chunk.source_name for chunk in rag.search_places("harbor")] == ["Grey Harbor"]
+
+
+def test_lookups_do_not_wait_for_a_running_sync(make_project):
+    project = make_project()
+    rag = RAGSystem(project)
+    rag.engine.rebuild_index()
+    project.worldbuilding.places.append(
+        Place(id="p1", name="Grey Harbor", place_type=PlaceType.CITY)
+    )
+    rag.mark_changed("places")
+
+    results = []
+    with rag.engine._build_lock:  # As while the editor's index worker runs
+        lookup = threading.Thread(target=lambda: results.append(rag.search_places("harbor")))
+        lookup.start()
+        lookup.join(timeout=5)
+        assert not lookup.is_alive()
+    assert results == [[]]  # Answered from the last completed index
+
+    wait_for_index(rag)
+    assert [chunk.source_name for chunk in rag.search_places("harbor")] == ["Grey Harbor"]
@@ -0,0 +1,78 @@
+"""Tests for the delta-compressed chapter revision store."""
+
+import json
+from datetime import datetime
+
+from src.models.project import WriterProject
+from src.models.revision_store import BASE_INTERVAL, RevisionStore, apply_delta, make_delta
+
+
+def _versions(count: int):
+    lines = [f"Line {i} of the chapter.\n" for i in range(50)]
+    versions = []
+    for n in range(count):
+        lines[n % len(lines)] = f"Line {n % len(lines)} revised in version {n}.\n"
+        if n % 3 == 0:
+            lines.insert(n % 7, f"Inserted in version {n}.\n")
+        versions.append("".join(lines))
+    return versions
+
+
+def test_delta_round_trips():
+    base, target = _versions(2)
+    assert apply_delta(base, make_delta(base, target)) == target
+    assert apply_delta(target, make_delta(target, "")) == ""
+    assert apply_delta("", make_delta("", target)) == target
+
+
+def test_every_revision_is_reconstructed(tmp_path):
+    store = RevisionStore(tmp_path / "revisions")
+    versions = _versions(BASE_INTERVAL * 2 + 5)
+    for number, content in enumerate(versions, 1):
+        store.append("c1", number, content, datetime.now())
+    store.save_index()
+
+    reopened = RevisionStore(tmp_path / "revisions")
+    for number, content in enumerate(versions, 1):
+        assert reopened.get_content("c1", number) == content
+    assert [r["revision_number"] for r in reopened.get_revisions("c1")] == list(range(1, len(versions) + 1))
+
+
+def test_small_edits_are_stored_as_deltas_with_periodic_bases(tmp_path):
+    store = RevisionStore(tmp_path / "revisions")
+    versions = _versions(BASE_INTERVAL * 2 + 5)
+    for number, content in enumerate(versions, 1):
+        store.append("c1", number, content, datetime.now())
+
+    kinds = [json.loads(line)["kind"] for line in (tmp_path / "revisions" / "c1.log").read_text().splitlines()]
+    assert kinds[0] == "base"
+    assert kinds.count("delta") > kinds.count("base")
+    # A fresh base at least every BASE_INTERVAL deltas
+    run = max(len(part) for part in "".join("d" if k == "delta" else "|" for k in kinds).split("|"))
+    assert run <= BASE_INTERVAL
+
+
+def test_truncated_trailing_record_is_ignored(tmp_path):
+    store = RevisionStore(tmp_path / "revisions")
+    store.append("c1", 1, "First.\n", datetime.now())
+    with open(tmp_path / "revisions" / "c1.log", "a", encoding="utf-8") as f:
+        f.write('{"n": 2, "kind": "ba')
+
+    assert RevisionStore(tmp_path / "revisions").get_content("c1", 1) == "First.\n"
+
+
+def test_project_revisions_move_to_the_store(make_project, project_file):
+    project = make_project()
+    chapter = project.manuscript.get_chapter("chapter1")
+    chapter.add_revision("first draft")
+    first = chapter.content
+    chapter.content = "Second draft."
+    chapter.add_revision("second draft")
+    project.save_project(project_file)
+
+    loaded = WriterProject.load_project(project_file)
+    chapter = loaded.manuscript.get_chapter("chapter1")
+    assert [r.notes for r in chapter.revisions] == ["first draft", "second draft"]
+    assert all(r.content == "" for r in chapter.revisions)
+    assert chapter.get_revision_content(1) == first
+    assert chapter.get_revision_content(2) == "Second draft."
@@ -0,0 +1,125 @@
+"""Tests for atomic, background-safe saves and the edit journal."""
+
+import copy
+import os
+
+import pytest
+
+from src.models import project_storage
+from src.models.edit_journal import EditJournal
+from src.models.project import WriterProject
+from src.models.project_storage import SavePlan, atomic_write_text
+
+
+def test_atomic_write_keeps_old_file_when_interrupted(tmp_path, monkeypatch):
+    target = tmp_path / "file.txt"
+    atomic_write_text(target, "old")
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(project_storage.os, "replace", fail)
+    with pytest.raises(OSError):
+        atomic_write_text(target, "new")
+
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == ["file.txt"]
+
+
+def test_commit_defers_bookkeeping_to_finish(tmp_path):
+    plan = SavePlan()
+    plan.add_text(tmp_path / "a.txt", "a")
+    done = []
+    plan.on_commit(lambda: done.append(True))
+
+    plan.commit()
+    assert (tmp_path / "a.txt").read_text() == "a"
+    assert done == []
+
+    plan.finish()
+    plan.finish()
+    assert done == [True]
+
+
+def test_failed_commit_leaves_project_unsaved(make_project, project_file, monkeypatch):
+    project = make_project()
+    project.save_project(project_file)
+    project.manuscript.get_chapter("chapter1").content = "Edited."
+    plan = project.prepare_save(project_file)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(project_storage, "atomic_write_text", fail)
+    with pytest.raises(OSError):
+        project.commit_save(plan)
+    project.finish_save(plan)
+
+    assert project.manuscript.get_chapter("chapter1").is_content_dirty()
+
+
+def test_revisions_are_written_by_the_commit(make_project, project_file, tmp_path):
+    project = make_project()
+    project.save_project(project_file)
+    chapter = project.manuscript.get_chapter("chapter1")
+    chapter.add_revision("draft")
+
+    plan = project.prepare_save(project_file)
+    assert not (tmp_path / "revisions" / "chapter1.log").exists()
+    assert chapter.revisions[0].content
+
+    project.commit_save(plan)
+    assert (tmp_path / "revisions" / "chapter1.log").exists()
+    project.finish_save(plan)
+    assert chapter.revisions[0].content == ""
+    assert chapter.get_revision_content(1) == "Chapter 1 begins.\n\nSomething happens in chapter 1."
+
+
+def test_journal_replays_unsaved_edits(make_project, project_file):
+    project = make_project()
+    project.save_project(project_file)
+    project.journal_chapter_edit("chapter2", "Typed before the crash.")
+
+    recovered = WriterProject.load_project(project_file)
+    assert recovered.get_recovered_chapter_ids() == ["chapter2"]
+    assert recovered.manuscript.get_chapter("chapter2").content == "Typed before the crash."
+
+    # The next save persists the edit and empties the journal
+    recovered.save_project(project_file)
+    assert not recovered.get_edit_journal().has_pending()
+    assert WriterProject.load_project(project_file).manuscript.get_chapter("chapter2").content == \
+        "Typed before the crash."
+
+
+def test_save_keeps_edits_journaled_after_prepare(make_project, project_file):
+    project = make_project()
+    project.save_project(project_file)
+    project.manuscript.get_chapter("chapter1").content = "Saved edit."
+    project.journal_chapter_edit("chapter1", "Saved edit.")
+
+    plan = project.prepare_save(project_file)
+    project.journal_chapter_edit("chapter1", "Typed during the save.")
+    project.commit_save(plan)
+    project.finish_save(plan)
+
+    assert project.get_edit_journal().get_pending_chapters() == {"chapter1": "Typed during the save."}
+
+
+def test_journal_ignores_truncated_record(tmp_path):
+    journal = EditJournal(tmp_path)
+    journal.record_chapter_content("c1", "Complete.")
+    with open(journal.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "kind": "chapter_content", "chapter_id": "c1", "cont')
+
+    assert EditJournal(tmp_path).get_pending_chapters() == {"c1": "Complete."}
+
+
+def test_loaded_project_can_be_deep_copied(make_project, project_file):
+    make_project().save_project(project_file)
+    project = WriterProject.load_project(project_file, lazy=True)
+    project.get_edit_journal()
+
+    copied = project.model_copy(deep=True)
+    assert copied.manuscript.get_chapter("chapter1").content == \
+        project.manuscript.get_chapter("chapter1").content
+    assert copy.deepcopy(project.get_edit_journal()) is project.get_edit_journal()
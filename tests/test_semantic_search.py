@@ -0,0 +1,319 @@
+"""Tests for the search indices behind SemanticSearchEngine."""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.ai.ann_index import IVFIndex
+from src.ai.semantic_search import (
+    BM25Index, DocumentChunk, EmbeddingIndex, SearchMethod, SearchResult, SemanticSearchEngine,
+    TFIDFIndex
+)
+
+
+DOCUMENTS = {
+    "empire": "The Empire rules the inner planets with an iron fleet.",
+    "rebels": "Rebels hide in the asteroid belt and raid the Empire fleet.",
+    "guild": "The merchant guild trades spice between the outer planets.",
+    "monks": "Monks of the silent order keep the old star charts.",
+}
+
+
+def chunk(doc_id: str, content: str, source_type: str = "faction") -> DocumentChunk:
+    return DocumentChunk(id=doc_id, content=content, source_type=source_type, source_name=doc_id)
+
+
+def brute_force_tfidf(documents, query):
+    """Cosine similarity of TF-IDF vectors computed from scratch."""
+    index = TFIDFIndex()
+    tfs = {doc_id: index._compute_tf(index._tokenize(text)) for doc_id, text in documents.items()}
+    n = len(documents)
+
+    def idf(term):
+        df = sum(1 for tf in tfs.values() if term in tf)
+        return math.log((n + 1) / (df + 1)) + 1 if df else 0.0
+
+    def vector(tf):
+        return {term: value * idf(term) for term, value in tf.items()}
+
+    query_vector = vector(index._compute_tf(index._tokenize(query)))
+    query_norm = math.sqrt(sum(v * v for v in query_vector.values()))
+    scores = {}
+    for doc_id, tf in tfs.items():
+        doc_vector = vector(tf)
+        dot = sum(weight * doc_vector.get(term, 0.0) for term, weight in query_vector.items())
+        norm = math.sqrt(sum(v * v for v in doc_vector.values()))
+        if dot > 0:
+            scores[doc_id] = dot / (query_norm * norm)
+    return scores
+
+
+def tfidf_scores(index, query):
+    return {found.id: score for found, score, _ in index.search(query, top_k=10)}
+
+
+def test_tfidf_scores_match_full_cosine():
+    index = TFIDFIndex()
+    for doc_id, text in DOCUMENTS.items():
+        index.add_document(chunk(doc_id, text))
+
+    for query in ("empire fleet", "outer planets spice", "star charts"):
+        expected = brute_force_tfidf(DOCUMENTS, query)
+        assert tfidf_scores(index, query) == pytest.approx(expected)
+
+
+def test_tfidf_search_returns_top_k_and_matched_terms():
+    index = TFIDFIndex()
+    for doc_id, text in DOCUMENTS.items():
+        index.add_document(chunk(doc_id, text))
+
+    results = index.search("empire fleet planets", top_k=2)
+    assert [found.id for found, _, _ in results] == ["empire", "rebels"]
+    assert results[0][2] == ["empire", "fleet", "planets"]
+    assert index.search("dragons", top_k=5) == []
+
+
+def test_tfidf_source_type_filter():
+    index = TFIDFIndex()
+    index.add_document(chunk("empire", DOCUMENTS["empire"]))
+    index.add_document(chunk("capital", "The Empire capital sits on a moon.", source_type="place"))
+
+    results = index.search("empire", source_types=["place"])
+    assert [found.id for found, _, _ in results] == ["capital"]
+
+
+def test_tfidf_incremental_updates_match_fresh_index():
+    index = TFIDFIndex()
+    for doc_id, text in DOCUMENTS.items():
+        index.add_document(chunk(doc_id, text))
+
+    # Edit one document, remove another and add a new one
+    final = dict(DOCUMENTS)
+    final["rebels"] = "Rebels seized the shipyards of the inner planets."
+    del final["monks"]
+    final["pirates"] = "Pirates raid merchant fleet convoys near the outer planets."
+    index.add_document(chunk("rebels", final["rebels"]))
+    index.remove_document("monks")
+    index.add_document(chunk("pirates", final["pirates"]))
+
+    fresh = TFIDFIndex()
+    for doc_id, text in final.items():
+        fresh.add_document(chunk(doc_id, text))
+
+    assert set(index.vocab) == set(fresh.vocab)
+    assert "charts" not in index.vocab
+    for query in ("inner planets", "merchant fleet", "raid"):
+        assert tfidf_scores(index, query) == pytest.approx(tfidf_scores(fresh, query))
+        assert tfidf_scores(index, query) == pytest.approx(brute_force_tfidf(final, query))
+
+
+def test_tfidf_idf_follows_document_frequency():
+    index = TFIDFIndex()
+    index.add_document(chunk("a", "empire fleet"))
+    index.add_document(chunk("b", "empire"))
+    common = index.idf("empire")
+    rare = index.idf("fleet")
+    assert rare > common
+
+    index.remove_document("a")
+    assert index.idf("fleet") == 0.0
+    assert index.idf("empire") == pytest.approx(math.log(2 / 2) + 1)
+
+
+def fixed_embeddings(vectors):
+    """Embedding function looking texts up in a table."""
+    return lambda text: vectors[text]
+
+
+def test_embedding_remove_moves_last_row_into_gap():
+    vectors = {
+        "a": [1.0, 0.0, 0.0],
+        "b": [0.0, 1.0, 0.0],
+        "c": [0.0, 0.0, 1.0],
+        "query c": [0.0, 0.1, 1.0],
+    }
+    index = EmbeddingIndex(embedding_fn=fixed_embeddings(vectors))
+    for doc_id in ("a", "b", "c"):
+        index.add_document(chunk(doc_id, doc_id))
+
+    index.remove_document("a")
+
+    assert index.embedded_count == 2
+    assert not index.has_embedding("a")
+    assert index.get_embedding("c") == pytest.approx([0.0, 0.0, 1.0])
+    assert index.get_embedding("b") == pytest.approx([0.0, 1.0, 0.0])
+    assert [found.id for found, _ in index.search("query c", top_k=1)] == ["c"]
+
+    # A re-added document gets a row again and the others stay intact
+    index.add_document(chunk("a", "a"))
+    assert index.embedded_count == 3
+    assert index.get_embedding("a") == pytest.approx([1.0, 0.0, 0.0])
+    assert index.get_embedding("c") == pytest.approx([0.0, 0.0, 1.0])
+
+
+def test_embedding_index_does_not_modify_added_chunks():
+    vectors = {"a": [1.0, 0.0], "b": [0.0, 1.0]}
+    index = EmbeddingIndex(embedding_fn=fixed_embeddings(vectors))
+    given = chunk("given", "given")
+    given.embedding = [3.0, 4.0]
+    computed = chunk("a", "a")
+
+    index.add_document(given)
+    index.add_document(computed)
+
+    assert given.embedding == [3.0, 4.0]
+    assert computed.embedding is None
+    assert index.get_embedding("given") == pytest.approx([0.6, 0.8])
+    assert index.get_embedding("a") == pytest.approx([1.0, 0.0])
+
+    engine = SemanticSearchEngine()
+    engine.set_embedding_function(fixed_embeddings(vectors))
+    engine.compute_embeddings = True
+    shared = chunk("b", "b")
+    engine.index_documents([shared])
+    assert shared.embedding is None
+    assert engine.embedding_index.get_embedding("b") == pytest.approx([0.0, 1.0])
+
+
+@pytest.mark.parametrize("quantization", [None, "float16", "int8"])
+def test_embedding_search_ranks_by_cosine(quantization):
+    vectors = {
+        "north": [0.0, 2.0],
+        "east": [3.0, 0.0],
+        "northeast": [1.0, 1.0],
+        "query": [0.2, 1.0],
+    }
+    index = EmbeddingIndex(embedding_fn=fixed_embeddings(vectors), quantization=quantization)
+    for doc_id in ("north", "east", "northeast"):
+        index.add_document(chunk(doc_id, doc_id))
+
+    results = index.search("query", top_k=3)
+    assert [found.id for found, _ in results] == ["north", "northeast"]
+    assert results[0][1] == pytest.approx(1.0 / math.sqrt(1.04), abs=0.01)
+
+
+def test_stats_do_not_train_the_ann_index():
+    engine = SemanticSearchEngine(ann_index=IVFIndex(min_train_rows=8))
+    rng = np.random.default_rng(0)
+    vectors = {f"doc{i}": rng.standard_normal(4).tolist() for i in range(16)}
+    vectors["query"] = vectors["doc3"]
+    engine.set_embedding_function(fixed_embeddings(vectors))
+    engine.index_documents([chunk(f"doc{i}", f"doc{i}") for i in range(16)], compute_embedding=True)
+
+    assert engine.get_stats()["ann_lists"] == 0
+    assert not engine.embedding_index.ann_index.trained
+
+    results = engine.search("query", SearchMethod.EMBEDDING, top_k=1)
+    assert [result.chunk.id for result in results] == ["doc3"]
+    assert engine.embedding_index.ann_index.trained
+    assert engine.get_stats()["ann_lists"] == engine.embedding_index.ann_index.n_lists
+
+
+def entity_chunk(doc_id: str, name: str, description: str, source_type: str = "faction") -> DocumentChunk:
+    found = chunk(doc_id, f"{name}. {description}", source_type)
+    found.metadata["fields"] = {"name": name, "description": description}
+    return found
+
+
+def test_bm25_exact_name_outranks_long_mention():
+    index = BM25Index()
+    index.add_document(entity_chunk("ember", "Ember Court", "A small council of fire mages."))
+    index.add_document(entity_chunk(
+        "culture", "Highland Culture",
+        "Highland clans trade with the Ember Court, tell stories of the Ember Court, "
+        "sing songs about old wars, and keep elaborate harvest rituals through the long winter.",
+        source_type="culture"
+    ))
+
+    results = index.search("ember court")
+    assert [found.id for found, _, _ in results] == ["ember", "culture"]
+    assert all(0 < score <= 1 for _, score, _ in results)
+    assert results[0][2] == ["ember", "court"]
+
+
+def test_bm25_field_boosts_per_chunk():
+    index = BM25Index()
+    plain = entity_chunk("plain", "Iron Legion", "Soldiers.")
+    boosted = entity_chunk("boosted", "Iron Guard", "Soldiers.")
+    boosted.metadata["field_boosts"] = {"name": 10.0}
+    index.add_document(plain)
+    index.add_document(boosted)
+
+    assert [found.id for found, _, _ in index.search("iron")] == ["boosted", "plain"]
+
+
+def test_bm25_remove_updates_statistics():
+    index = BM25Index()
+    for doc_id, text in DOCUMENTS.items():
+        index.add_document(chunk(doc_id, text))
+    index.remove_document("rebels")
+    index.add_document(chunk("rebels", "Rebels gone quiet."))
+    index.remove_document("rebels")
+
+    fresh = BM25Index()
+    for doc_id, text in DOCUMENTS.items():
+        if doc_id != "rebels":
+            fresh.add_document(chunk(doc_id, text))
+
+    for query in ("empire fleet", "planets"):
+        expected = [(found.id, score) for found, score, _ in fresh.search(query)]
+        actual = [(found.id, score) for found, score, _ in index.search(query)]
+        assert [doc_id for doc_id, _ in actual] == [doc_id for doc_id, _ in expected]
+        assert [score for _, score in actual] == pytest.approx([score for _, score in expected])
+
+
+def ranked(*entries):
+    return [SearchResult(chunk=chunk(doc_id, doc_id), score=score, match_type=kind)
+            for doc_id, score, kind in entries]
+
+
+def test_fusion_calibrates_each_method_and_orders_by_the_fused_score():
+    engine = SemanticSearchEngine()
+    bm25 = ranked(("a", 0.45, "bm25"), ("b", 0.3, "bm25"), ("c", 0.1, "bm25"))
+    semantic = ranked(("b", 0.8, "semantic"), ("d", 0.6, "semantic"), ("a", 0.4, "semantic"))
+
+    fused = engine._fuse([bm25, semantic], top_k=4)
+
+    # Each list is scaled so its best score is 1, then averaged over both
+    assert [r.chunk.id for r in fused] == ["b", "a", "d", "c"]
+    assert [r.score for r in fused] == pytest.approx([
+        (0.3 / 0.45 + 1.0) / 2, (1.0 + 0.4 / 0.8) / 2, 0.6 / 0.8 / 2, 0.1 / 0.45 / 2
+    ])
+    assert [r.match_type for r in fused] == ["hybrid", "hybrid", "semantic", "bm25"]
+
+
+def test_fused_results_are_ordered_by_the_score_they_report():
+    engine = SemanticSearchEngine()
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        lists = [
+            ranked(*sorted(((f"doc{i}", float(rng.random()), kind) for i in rng.choice(30, 12, replace=False)),
+                           key=lambda entry: -entry[1]))
+            for kind in ("bm25", "semantic")
+        ]
+        scores = [r.score for r in engine._fuse(lists, top_k=10)]
+        assert scores == sorted(scores, reverse=True)
+        assert all(0.0 < score <= 1.0 for score in scores)
+
+
+def test_fusion_with_one_list_keeps_its_order_and_relative_scores():
+    engine = SemanticSearchEngine()
+    bm25 = ranked(("a", 0.9, "bm25"), ("b", 0.3, "bm25"))
+
+    fused = engine._fuse([bm25, []], top_k=5)
+
+    assert [r.chunk.id for r in fused] == ["a", "b"]
+    assert [r.score for r in fused] == pytest.approx([1.0, 0.3 / 0.9])
+
+
+def test_hybrid_search_scores_are_not_flat():
+    engine = SemanticSearchEngine()
+    for doc_id, text in DOCUMENTS.items():
+        engine.index_document(chunk(doc_id, text))
+
+    results = engine.search("empire fleet", SearchMethod.HYBRID)
+    bm25 = engine.search("empire fleet", SearchMethod.BM25)
+    assert [r.chunk.id for r in results] == [r.chunk.id for r in bm25]
+    assert [r.score for r in results] == pytest.approx([r.score / bm25[0].score for r in bm25])
+    assert len({round(r.score, 6) for r in results}) > 1